@@ -0,0 +1,8 @@
+"""
+Entry point for "python -m aoc2022". See aoc2022.runner.
+"""
+import sys
+
+from aoc2022 import runner
+
+sys.exit(runner.main())
@@ -0,0 +1,129 @@
+"""
+Runs stars from asyncio code without blocking the event loop.
+
+Each star's input is read in a thread (asyncio.to_thread()), whether it is a file or a stream, and the star is then
+solved on what was read in an executor. So while one star is being solved, the next one's input is already loading.
+Every star gets its own timeout: a star that takes too long is reported as a TimeoutError, like any other failing star,
+rather than holding up the rest. Cancelling the caller cancels every star that has not started yet.
+Since the solver only sees what was read, answers are not remembered (see aoc2022.memo).
+
+Stars are best solved in a concurrent.futures.ProcessPoolExecutor. The solvers are pure Python, so in threads they would
+compete with the event loop for the GIL, and only one star runs at a time in a process (see runner.run_star()).
+
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+        results = await aio.solve_all([(11, 2, None), (12, 2, "inputs/day12.txt")], pool, timeout=10)
+"""
+import asyncio
+import concurrent.futures
+import io
+import time
+from typing import Iterable, Optional
+
+from aoc2022 import runner, utils
+
+# A day, star and input to solve (see solve()).
+Job = tuple[int, runner.Star, Optional[utils.Source]]
+
+
+def _read(source: utils.Source) -> bytes:
+    """
+    Args:
+        source (utils.Source): A file path, standard input or an open file.
+
+    Returns:
+        bytes: Everything in it, encoded as UTF-8 if it was read as text.
+    """
+    if utils.is_path(source):
+        with open(source, "rb") as file:
+            return file.read()
+    data = utils.stream(source).read()
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+async def load(day: int, source: Optional[utils.Source] = None) -> bytes:
+    """
+    Reads a star's input in a thread, so the event loop can carry on meanwhile. It is read as bytes, so that it can be
+    handed to another process and binary inputs (see aoc2022.binary) are still recognised.
+
+    Args:
+        day (int): Day number.
+        source (Optional[utils.Source], optional): Where to read the input from. Defaults to the day's fixture.
+
+    Returns:
+        bytes: The whole of the input.
+    """
+    return await asyncio.to_thread(_read, runner.INPUT.format(day=day) if source is None else source)
+
+
+def _solve(day: int, star: runner.Star, source: bytes) -> runner.StarResult:
+    """
+    Solves a star on an input read by load(). Runs in the executor.
+
+    Args:
+        day (int): Day number.
+        star (runner.Star): Star number (1 or 2), or runner.BOTH.
+        source (bytes): The whole of the input.
+
+    Returns:
+        runner.StarResult: The answer and timings.
+    """
+    return runner.run_star(day, star, io.BytesIO(source))
+
+
+async def solve(
+    day: int,
+    star: runner.Star,
+    source: Optional[utils.Source] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    timeout: Optional[float] = None,
+) -> runner.StarResult:
+    """
+    Reads a star's input in a thread and solves it in an executor.
+
+    A star that times out stops being waited for, but an executor cannot interrupt a star once it has started, so it
+    keeps its worker busy until it finishes.
+
+    Args:
+        day (int): Day number.
+        star (runner.Star): Star number (1 or 2), or runner.BOTH.
+        source (Optional[utils.Source], optional): Where to read the input from. Defaults to the day's fixture.
+        executor (Optional[concurrent.futures.Executor], optional): Where to solve the star. Defaults to the event
+            loop's default executor (a thread pool).
+        timeout (Optional[float], optional): Seconds to wait for the input and answer. Defaults to waiting for as long
+            as it takes.
+
+    Returns:
+        runner.StarResult: The answer and timings. If the input could not be read, the star raised, or it timed out, the
+            error is recorded instead of an answer.
+    """
+    start = time.perf_counter()
+
+    async def load_and_solve() -> runner.StarResult:
+        loaded = await load(day, source)
+        return await asyncio.get_running_loop().run_in_executor(executor, _solve, day, star, loaded)
+
+    try:
+        return await asyncio.wait_for(load_and_solve(), timeout)
+    except TimeoutError:
+        error = f"TimeoutError: no answer after {timeout} s"
+    except OSError as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return runner.StarResult(day, star, None, time.perf_counter() - start, 0.0, 0.0, error)
+
+
+async def solve_all(
+    jobs: Iterable[Job], executor: Optional[concurrent.futures.Executor] = None, timeout: Optional[float] = None
+) -> list[runner.StarResult]:
+    """
+    Solves many stars concurrently, each with its own timeout (see solve()).
+
+    Args:
+        jobs (Iterable[Job]): The day, star and input (None for the day's fixture) of each star.
+        executor (Optional[concurrent.futures.Executor], optional): Where to solve the stars. Defaults to the event
+            loop's default executor (a thread pool).
+        timeout (Optional[float], optional): Seconds to wait for each star. Defaults to waiting for as long as it takes.
+
+    Returns:
+        list[runner.StarResult]: The result of each star, in the order of the jobs.
+    """
+    return list(await asyncio.gather(*(solve(day, star, source, executor, timeout) for day, star, source in jobs)))
@@ -0,0 +1,136 @@
+"""
+Solves one day against many input files, spread across a process pool, writing one JSON line per input.
+
+Each worker imports the day once and then solves every input it is handed, so the import and interpreter start-up are
+paid once per worker rather than once per file. Inputs are handed out in chunks (--chunksize) to cut down on the
+round trips between the pool and its workers; larger chunks suit many small inputs. Lines are written in the order
+the inputs were given, as soon as each one (and every one before it) is done.
+
+Usage:
+    python -m aoc2022.batch DAY INPUT [INPUT ...] [--stars STAR ...] [--workers N] [--chunksize N] [--output FILE]
+
+Each INPUT is a file, a directory (every file directly inside it) or a glob pattern such as "inputs/day1-*.txt".
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import glob
+import importlib
+import json
+import os
+import sys
+from typing import Iterable, Iterator, Optional
+
+from aoc2022 import runner
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[str]:
+    """
+    Expands directories and glob patterns into the files they contain. Anything else is taken to be a file, so a
+    missing one is reported as an error for that input rather than silently skipped.
+
+    Args:
+        patterns (Iterable[str]): Files, directories and glob patterns.
+
+    Returns:
+        list[str]: Paths of the input files, in the order given (and sorted within each directory or pattern).
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(entry.path for entry in os.scandir(pattern) if entry.is_file()))
+        elif glob.escape(pattern) != pattern:
+            paths.extend(sorted(path for path in glob.glob(pattern) if os.path.isfile(path)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def solve(day: int, stars: tuple[runner.Star, ...], path: str) -> dict:
+    """
+    Solves the requested stars of a day for one input.
+
+    Args:
+        day (int): Day number.
+        stars (tuple[runner.Star, ...]): Stars to run (see runner.run_star()).
+        path (str): Path of the input.
+
+    Returns:
+        dict: The input's path, and the result of each star (see runner.StarResult).
+    """
+    return {"input": path, "results": [dataclasses.asdict(runner.run_star(day, star, path)) for star in stars]}
+
+
+def run(
+    day: int, paths: Iterable[str], stars: Iterable[runner.Star] = (1, 2), workers: int = 1, chunksize: int = 1
+) -> Iterator[dict]:
+    """
+    Solves a day for every input, spreading the inputs across a process pool if there is more than one worker.
+
+    Args:
+        day (int): Day number.
+        paths (Iterable[str]): Paths of the inputs.
+        stars (Iterable[runner.Star], optional): Stars to run for each input. Defaults to (1, 2).
+        workers (int, optional): Number of worker processes. Defaults to 1, which runs everything in this process.
+        chunksize (int, optional): Number of inputs handed to a worker at a time. Defaults to 1.
+
+    Yields:
+        Iterator[dict]: The results for each input (see solve()), in the order of the inputs.
+    """
+    solve_input = functools.partial(solve, day, tuple(stars))
+    if workers <= 1:
+        yield from map(solve_input, paths)
+        return
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=importlib.import_module, initargs=(f"aoc2022.day{day}",)
+    ) as pool:
+        yield from pool.map(solve_input, paths, chunksize=chunksize)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m aoc2022.batch", description="Solve one day against many inputs across a process pool."
+    )
+    parser.add_argument("day", type=int, choices=runner.discover_days(), help="Day number")
+    parser.add_argument("inputs", nargs="+", metavar="INPUT", help="Input files, directories or glob patterns")
+    parser.add_argument("--stars", nargs="+", type=runner.parse_star, choices=list(runner.STARS), default=[1, 2])
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=1, help="Number of inputs handed to a worker at a time")
+    parser.add_argument("--output", help="File to write the JSON lines to (default: standard output)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Solves the day for every input, writing a JSON line for each one as it completes.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status; 1 if any star raised an error for any input.
+    """
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    failed = False
+    with open(args.output, "w", encoding="utf-8") if args.output else contextlib.nullcontext(sys.stdout) as output:
+        for solved in run(args.day, paths, args.stars, args.workers, args.chunksize):
+            failed = failed or any(result["error"] is not None for result in solved["results"])
+            output.write(json.dumps(solved) + "\n")
+            output.flush()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
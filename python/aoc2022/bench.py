@@ -0,0 +1,323 @@
+"""
+Benchmarks every star (and a few of the functions underneath them) on generated inputs of increasing size, and
+compares the results against a saved baseline.
+
+Usage:
+    python -m aoc2022.bench run [--days N ...] [--cases PATTERN] [--repeat N] [--scale X] [--output FILE]
+                                [--baseline FILE] [--threshold X]
+    python -m aoc2022.bench compare BASELINE CURRENT [--threshold X]
+"""
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import fnmatch
+import gc
+import importlib
+import io
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Iterator, Optional
+
+from aoc2022 import day7, day8, day12, day13, generators, runner
+
+# Sizes (as understood by each day's generator) that every case for that day is measured at.
+LADDERS = {
+    1: (1_000, 10_000, 100_000),
+    2: (1_000, 10_000, 100_000),
+    3: (1_000, 10_000, 100_000),
+    4: (1_000, 10_000, 100_000),
+    5: (1_000, 10_000, 100_000),
+    6: (1_000, 10_000, 100_000),
+    7: (100, 1_000, 10_000),
+    8: (25, 50, 100),
+    9: (100, 1_000, 10_000),
+    10: (1_000, 10_000, 100_000),
+    11: (4, 8, 16),
+    12: (27, 54, 108),
+    13: (100, 1_000, 10_000),
+}
+
+# A report maps each case name to the measurements of that case, keyed by input size (as a string, for JSON).
+Report = dict[str, dict[str, dict[str, float]]]
+
+
+@dataclasses.dataclass
+class Case:
+    """
+    Something to benchmark. setup() turns the path of a generated input into the arguments for func(), and only func()
+    is timed.
+    """
+
+    name: str
+    day: int
+    setup: Callable[[str], tuple]
+    func: Callable[..., object]
+
+
+@dataclasses.dataclass
+class Regression:
+    """
+    A case that got slower than the baseline allows.
+    """
+
+    name: str
+    size: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """
+        Returns:
+            float: How many times slower the current median is than the baseline median.
+        """
+        return self.current / self.baseline
+
+
+def _star_cases() -> Iterator[Case]:
+    """
+    Yields:
+        Iterator[Case]: A case for each star of each day, timing the whole star including parsing.
+    """
+    for day in runner.discover_days():
+        module = importlib.import_module(f"aoc2022.day{day}")
+        for name in runner.STARS.values():
+            yield Case(f"day{day}.{name}", day, lambda path: (path,), getattr(module, name))
+
+
+def _read_heightmap(path: str) -> tuple:
+    """
+    Args:
+        path (str): Path of a day 12 input.
+
+    Returns:
+        tuple: Arguments for day12.find_path() to walk from S to E.
+    """
+    grid = day12.read_heightmap(path)
+    return (grid, *day12.find_start_and_end(grid))
+
+
+CASES = [
+    *_star_cases(),
+    Case(
+        "day7.Directory.total_size_report",
+        7,
+        lambda path: (day7.create_filesystem(path),),
+        day7.Directory.total_size_report,
+    ),
+    Case("day8.Forest.count_visible_trees", 8, lambda path: (day8.Forest(path),), day8.Forest.count_visible_trees),
+    Case(
+        "day8.Forest.find_highest_scenic_score",
+        8,
+        lambda path: (day8.Forest(path),),
+        day8.Forest.find_highest_scenic_score,
+    ),
+    Case("day12.find_path", 12, _read_heightmap, day12.find_path),
+    Case("day13.merge_sort", 13, lambda path: (day13.read_packets_without_pairs(path),), day13.merge_sort),
+]
+
+
+def measure(case: Case, path: str, repeat: int) -> dict[str, float]:
+    """
+    Times a case on one input several times. Like timeit, garbage collection is switched off while the case runs, so
+    that collector pauses (which grow with the size of the heap) do not blur how the case itself scales. Anything the
+    case prints is discarded.
+
+    Args:
+        case (Case): The case to time.
+        path (str): Path of the input.
+        repeat (int): Number of times to run it.
+
+    Returns:
+        dict[str, float]: The median and fastest time in seconds, and the number of runs.
+    """
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    for _ in range(repeat):
+        args = case.setup(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                case.func(*args)
+                timings.append(time.perf_counter() - start)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    return {"median": statistics.median(timings), "min": min(timings), "runs": repeat}
+
+
+def run(cases: list[Case], repeat: int = 5, scale: float = 1.0) -> Iterator[tuple[str, int, dict[str, float]]]:
+    """
+    Measures each case at every size of its day's ladder. Inputs are generated once per day and size, and shared by
+    all the cases of that day.
+
+    Args:
+        cases (list[Case]): Cases to measure.
+        repeat (int, optional): Number of runs per case and size; the median is reported. Defaults to 5.
+        scale (float, optional): Multiplier applied to every size in the ladders. Defaults to 1.0.
+
+    Yields:
+        Iterator[tuple[str, int, dict[str, float]]]: Case name, input size, and measurements, as each is taken.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs = {}
+        for case in cases:
+            for size in (max(1, int(size * scale)) for size in LADDERS[case.day]):
+                if (case.day, size) not in inputs:
+                    inputs[(case.day, size)] = str(pathlib.Path(workdir) / f"day{case.day}-{size}.txt")
+                    generators.write(case.day, size, inputs[(case.day, size)])
+                yield case.name, size, measure(case, inputs[(case.day, size)], repeat)
+
+
+def make_report(measurements: Iterator[tuple[str, int, dict[str, float]]]) -> Report:
+    """
+    Args:
+        measurements (Iterator[tuple[str, int, dict[str, float]]]): Measurements as produced by run().
+
+    Returns:
+        Report: The measurements grouped by case and size.
+    """
+    report = {}
+    for name, size, measurement in measurements:
+        report.setdefault(name, {})[str(size)] = measurement
+    return report
+
+
+def save(report: Report, path: str, repeat: int):
+    """
+    Writes a report to a JSON file, along with details of the machine it was measured on.
+
+    Args:
+        report (Report): The report to save.
+        path (str): Path of the JSON file.
+        repeat (int): Number of runs behind each median.
+    """
+    meta = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "repeat": repeat,
+    }
+    pathlib.Path(path).write_text(json.dumps({"meta": meta, "results": report}, indent=2) + "\n", "utf-8")
+
+
+def load(path: str) -> Report:
+    """
+    Args:
+        path (str): Path of a JSON file written by save().
+
+    Returns:
+        Report: The report stored in it.
+    """
+    return json.loads(pathlib.Path(path).read_text("utf-8"))["results"]
+
+
+def compare(baseline: Report, current: Report, threshold: float = 0.25) -> list[Regression]:
+    """
+    Compares the medians of every case and size present in both reports.
+
+    Args:
+        baseline (Report): The report to compare against.
+        current (Report): The new report.
+        threshold (float, optional): Allowed slowdown, as a fraction of the baseline. Defaults to 0.25 (25% slower).
+
+    Returns:
+        list[Regression]: Every case and size whose median is slower than the threshold allows.
+    """
+    regressions = []
+    for name, sizes in current.items():
+        for size, measurement in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            if before and measurement["median"] > before["median"] * (1 + threshold):
+                regressions.append(Regression(name, size, before["median"], measurement["median"]))
+    return regressions
+
+
+def report_regressions(regressions: list[Regression]) -> int:
+    """
+    Prints any regressions.
+
+    Args:
+        regressions (list[Regression]): Regressions found by compare().
+
+    Returns:
+        int: Exit status; 1 if there were any regressions.
+    """
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name} @ {regression.size}: {regression.baseline * 1000:.2f} ms -> "
+            f"{regression.current * 1000:.2f} ms ({regression.ratio:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022.bench", description="Benchmark the solutions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--days", nargs="+", type=int, help="Only benchmark these days")
+    run_parser.add_argument("--cases", default="*", help="Only benchmark cases whose name matches this glob")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Runs per case and size")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for every input size")
+    run_parser.add_argument("--output", help="Save the results to this JSON file")
+    run_parser.add_argument("--baseline", help="Compare the results against this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved results")
+    compare_parser.add_argument("baseline", help="JSON file to compare against")
+    compare_parser.add_argument("current", help="JSON file with the new results")
+
+    for command in (run_parser, compare_parser):
+        command.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%% slower)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the benchmarks or compares saved results.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status; 1 if any regressions were found.
+    """
+    args = parse_args(argv)
+    if args.command == "compare":
+        return report_regressions(compare(load(args.baseline), load(args.current), args.threshold))
+
+    cases = [
+        case
+        for case in CASES
+        if (not args.days or case.day in args.days) and fnmatch.fnmatchcase(case.name, args.cases)
+    ]
+    measurements = []
+    for name, size, measurement in run(cases, args.repeat, args.scale):
+        print(f"{name:<40} {size:>8} {measurement['median'] * 1000:>12.3f} ms")
+        measurements.append((name, size, measurement))
+    report = make_report(measurements)
+    if args.output:
+        save(report, args.output, args.repeat)
+    if args.baseline:
+        return report_regressions(compare(load(args.baseline), report, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
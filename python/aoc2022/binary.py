@@ -0,0 +1,177 @@
+"""
+A pre-parsed binary form of the puzzle inputs, for the days whose text takes the longest to parse. Converting a large
+input once lets every later run skip the text parsing: the binary file is memory-mapped and its numbers, grids or
+tokens are copied straight into the structures the solver uses.
+
+A binary input starts with a header (MAGIC, then the day number and format VERSION as little-endian unsigned shorts),
+followed by the day's own payload. Days that can be converted define to_binary(source) -> bytes, which builds the
+payload from a text input, and their parsers accept either form; is_binary() tells them which they were given.
+Numbers in payloads are little-endian.
+
+Binary inputs are best given as paths, which are memory-mapped. Binary streams (an open file in binary mode, or
+standard input) work too, but are read into memory whole. A binary input cannot be read from a text stream.
+
+Usage: python -m aoc2022.binary DAY INPUT OUTPUT
+"""
+import argparse
+import array
+import contextlib
+import importlib
+import mmap
+import os
+import pathlib
+import struct
+import sys
+from typing import Iterable, Iterator, Optional
+
+from aoc2022 import runner, utils
+
+MAGIC = b"AOC2022\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sHH")
+# Typecode of the unsigned 32-bit integers used in payloads.
+UINT32 = "I"
+
+
+def is_binary(source: utils.Source) -> bool:
+    """
+    Looks for MAGIC at the start of the input, without consuming any of it. A stream that can neither be peeked at
+    (see io.BufferedReader.peek()) nor rewound is assumed to be text.
+
+    Args:
+        source (utils.Source): Where puzzle input is read from.
+
+    Raises:
+        ValueError: If the source is a text stream of a binary input.
+
+    Returns:
+        bool: Whether the source is a binary input.
+    """
+    if utils.is_path(source):
+        with open(source, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    stream = utils.stream(source)
+    if hasattr(stream, "peek"):
+        return stream.peek(len(MAGIC))[: len(MAGIC)] == MAGIC
+    if not stream.seekable():
+        return False
+    start = stream.tell()
+    head = stream.read(len(MAGIC))
+    stream.seek(start)
+    if head == MAGIC.decode("ascii"):
+        raise ValueError("A binary input must be given as a path or a binary stream, not a text stream")
+    return head == MAGIC
+
+
+@contextlib.contextmanager
+def payload(source: utils.Source, day: int) -> Iterator[memoryview]:
+    """
+    Maps a binary input into memory, or reads it if it is a stream. The view is only valid inside the block, so copy
+    anything that outlives it.
+
+    Args:
+        source (utils.Source): The binary input: a path, or a stream in binary mode.
+        day (int): Day number the input must be for.
+
+    Raises:
+        ValueError: If the source is not a binary input for the day, or was written in another format version.
+
+    Yields:
+        Iterator[memoryview]: The day's payload, after the header.
+    """
+    with contextlib.ExitStack() as stack:
+        if utils.is_path(source):
+            file = stack.enter_context(open(source, "rb"))
+            buffer = stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        elif isinstance(buffer := utils.stream(source).read(), str):
+            raise ValueError("A binary input must be given as a path or a binary stream, not a text stream")
+        name = source if utils.is_path(source) else "The stream"
+        magic, found_day, version = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{name} is not a binary input")
+        if (found_day, version) != (day, VERSION):
+            raise ValueError(f"{name} is a version {version} binary input for day {found_day}, not day {day}")
+        with memoryview(buffer)[HEADER.size :] as view:
+            yield view
+
+
+def pack_uint32(values: Iterable[int]) -> bytes:
+    """
+    Args:
+        values (Iterable[int]): Numbers from 0 to 2**32 - 1.
+
+    Returns:
+        bytes: The numbers, packed as little-endian unsigned 32-bit integers.
+    """
+    packed = array.array(UINT32, values)
+    if sys.byteorder == "big":  # pragma: no cover
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_uint32(data: memoryview | bytes) -> array.array:
+    """
+    Args:
+        data (memoryview | bytes): Numbers packed by pack_uint32().
+
+    Returns:
+        array.array: A copy of the numbers.
+    """
+    unpacked = array.array(UINT32)
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":  # pragma: no cover
+        unpacked.byteswap()
+    return unpacked
+
+
+def convertible_days() -> list[int]:
+    """
+    Returns:
+        list[int]: The days whose inputs can be converted.
+    """
+    return [day for day in runner.discover_days() if hasattr(importlib.import_module(f"aoc2022.day{day}"), "to_binary")]
+
+
+def convert(day: int, source: utils.Source, destination: str | os.PathLike):
+    """
+    Converts a text input into a binary input.
+
+    Args:
+        day (int): Day number.
+        source (utils.Source): The text input.
+        destination (str | os.PathLike): Path of the binary input to write.
+    """
+    data = importlib.import_module(f"aoc2022.day{day}").to_binary(source)
+    pathlib.Path(destination).write_bytes(HEADER.pack(MAGIC, day, VERSION) + data)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022.binary", description="Convert inputs to binary.")
+    parser.add_argument("day", type=int, choices=convertible_days(), help="Day number")
+    parser.add_argument("input", help=f"Text input to convert, or {utils.STDIN} for standard input")
+    parser.add_argument("output", help="Binary input to write")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Converts a text input into a binary input.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    convert(args.day, args.input, args.output)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,212 @@
+"""
+On-disk cache of parsed puzzle inputs.
+
+Parsers opt in with the @parser(version=N) decorator. The cache is only used when the AOC2022_CACHE_DIR environment
+variable names a directory (the runner's --cache-dir option sets it). Entries are keyed on the parser, its version, and
+a hash of the input file's contents, so editing either the input or the parser (and bumping its version) misses the
+cache. Once the entries exceed AOC2022_CACHE_SIZE bytes (256 MiB by default), the least recently used are evicted.
+
+Long-running processes (such as aoc2022.server) can also keep entries in memory, by setting AOC2022_CACHE_MEMORY to
+the most bytes to keep. This works with or without a cache directory. Entries are kept pickled, so each hit still
+returns a fresh copy that the caller is free to modify.
+"""
+import collections
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+import zlib
+from typing import Callable, Optional, TypeVar
+
+from aoc2022 import utils
+
+CACHE_DIR_ENV = "AOC2022_CACHE_DIR"
+CACHE_SIZE_ENV = "AOC2022_CACHE_SIZE"
+DEFAULT_CACHE_SIZE = 256 << 20
+SUFFIX = ".cache"
+CACHE_MEMORY_ENV = "AOC2022_CACHE_MEMORY"
+
+# Pickled entries kept in memory, least recently used first.
+_MEMORY: collections.OrderedDict[str, bytes] = collections.OrderedDict()
+
+Parsed = TypeVar("Parsed")
+
+
+def file_digest(path: str) -> str:
+    """
+    Args:
+        path (str): Path of the file to hash.
+
+    Returns:
+        str: A hash of the file's contents, as 32 hexadecimal digits.
+    """
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def cache_dir() -> Optional[pathlib.Path]:
+    """
+    Returns:
+        Optional[pathlib.Path]: The cache directory, or None if caching is turned off.
+    """
+    directory = os.environ.get(CACHE_DIR_ENV)
+    return pathlib.Path(directory) if directory else None
+
+
+def evict(directory: pathlib.Path, limit: int, suffix: str = SUFFIX):
+    """
+    Deletes the least recently used entries until the entries in the directory total no more than <limit> bytes.
+    Reading an entry refreshes its modification time, so that is what "least recently used" goes by.
+
+    Args:
+        directory (pathlib.Path): The cache directory.
+        limit (int): Maximum total size of the entries, in bytes.
+        suffix (str, optional): File name suffix of the entries. Defaults to SUFFIX.
+    """
+    entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry) for entry in directory.glob(f"*{suffix}"))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in entries:
+        if total <= limit:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+
+
+def memory_limit() -> int:
+    """
+    Returns:
+        int: The most bytes of entries to keep in memory; 0 if entries are not kept in memory.
+    """
+    return int(os.environ.get(CACHE_MEMORY_ENV) or 0)
+
+
+def clear_memory():
+    """
+    Forgets every entry kept in memory.
+    """
+    _MEMORY.clear()
+
+
+def _remember(key: str, data: bytes, limit: int):
+    """
+    Keeps a pickled entry in memory, forgetting the least recently used entries to stay within the limit.
+
+    Args:
+        key (str): The entry's key.
+        data (bytes): The pickled structure.
+        limit (int): Maximum total size of the entries kept in memory, in bytes.
+    """
+    _MEMORY[key] = data
+    _MEMORY.move_to_end(key)
+    total = sum(len(kept) for kept in _MEMORY.values())
+    while total > limit:
+        total -= len(_MEMORY.popitem(last=False)[1])
+
+
+def _load(entry: pathlib.Path) -> Optional[bytes]:
+    """
+    Args:
+        entry (pathlib.Path): Path of a cache entry.
+
+    Returns:
+        Optional[bytes]: The pickled structure stored in the entry, or None if there is no readable entry.
+    """
+    try:
+        data = zlib.decompress(entry.read_bytes())
+    except (FileNotFoundError, zlib.error):
+        return None
+    os.utime(entry)
+    return data
+
+
+def _unpickle(data: bytes) -> tuple[bool, object]:
+    """
+    Args:
+        data (bytes): A pickled structure.
+
+    Returns:
+        tuple[bool, object]: Whether it could be unpickled, and if so, the structure.
+    """
+    try:
+        return True, pickle.loads(data)
+    except (pickle.UnpicklingError, EOFError):
+        return False, None
+
+
+def _pickle(value: object) -> Optional[bytes]:
+    """
+    Args:
+        value (object): A parsed structure.
+
+    Returns:
+        Optional[bytes]: The structure pickled, or None for structures that cannot be pickled (or are nested too
+            deeply to), which are simply not cached.
+    """
+    try:
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return None
+
+
+def _store(entry: pathlib.Path, data: bytes):
+    """
+    Writes a cache entry. It is written to a temporary file first, so other processes never see half an entry.
+
+    Args:
+        entry (pathlib.Path): Path of the cache entry.
+        data (bytes): The pickled structure to store.
+    """
+    handle, temporary = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+    with os.fdopen(handle, "wb") as file:
+        file.write(zlib.compress(data, 1))
+    os.replace(temporary, entry)
+
+
+def parser(version: int) -> Callable[[Callable[..., Parsed]], Callable[..., Parsed]]:
+    """
+    Decorates a function that parses the input given as its only argument, caching what it returns. Only inputs read
+    from a file path are cached; standard input and open files are parsed every time, since they cannot be hashed
+    without reading them.
+
+    Args:
+        version (int): Version of the parser. Bump it whenever the parser's output changes.
+
+    Returns:
+        Callable[[Callable[..., Parsed]], Callable[..., Parsed]]: The decorator.
+    """
+
+    def decorate(func: Callable[..., Parsed]) -> Callable[..., Parsed]:
+        @functools.wraps(func)
+        def wrapper(source: utils.Source, *args, **kwargs) -> Parsed:
+            directory, limit = cache_dir(), memory_limit()
+            if (directory is None and not limit) or args or kwargs or not utils.is_path(source):
+                return func(source, *args, **kwargs)
+            key = f"{func.__module__}.{func.__qualname__}.v{version}.{file_digest(source)}"
+            if limit and key in _MEMORY:
+                _MEMORY.move_to_end(key)
+                found, value = _unpickle(_MEMORY[key])
+            elif directory is not None and (data := _load(directory / f"{key}{SUFFIX}")) is not None:
+                found, value = _unpickle(data)
+                if found and limit:
+                    _remember(key, data, limit)
+            else:
+                found, value = False, None
+            if found:
+                return value
+
+            value = func(source)
+            if (data := _pickle(value)) is None:
+                return value
+            if limit:
+                _remember(key, data, limit)
+            if directory is not None:
+                directory.mkdir(parents=True, exist_ok=True)
+                _store(directory / f"{key}{SUFFIX}", data)
+                evict(directory, int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE)))
+            return value
+
+        return wrapper
+
+    return decorate
@@ -1,50 +1,391 @@
 """
 Day 1: Calorie Counting
+
+Calorie files are read with NumPy when it is installed, which parses and adds up a block of lines at a time instead of
+one line at a time. Without it, the same answers come from plain Python: files are scanned a byte at a time through a
+memory map, adding up each Elf's digits as they are read, so no object is made for any line. That is slower than
+parsing line by line (about 1.6 times on CPython), but a huge file costs no more memory than a small one.
 """
-from aoc2022 import utils
+import functools
+import heapq
+import itertools
+import mmap
+import os
+import time
+from typing import Iterable, Iterator
+
+from aoc2022 import cache, sketch, utils
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is installed for the tests (see requirements.txt).
+    numpy = None  # pylint: disable=invalid-name
+
+# Number of Elves whose calories the second star adds up.
+TOP = 3
 
 
-def sum_calories(path: str) -> list[int]:
+def elf_calories(source: utils.Source) -> Iterator[int]:
     """
-    Sums up the amount of calories each Elf is carrying. Add up numbers in consecutive lines; each Elf's calories are
-    separated by a blank line.
+    Sums up the amount of calories each Elf is carrying, as the input is read. Add up numbers in consecutive lines;
+    each Elf's calories are separated by a blank line.
 
     Args:
-        path (str): Path to a text file of calorie data.
+        source (utils.Source): A text file of calorie data.
 
-    Returns:
-        list[int]: A list of each Elf's total calories in order.
+    Yields:
+        Iterator[int]: Each Elf's total calories in order.
     """
-    data = utils.lines(path)
-    calories = [0]
-    for line in data:
+    if numpy is not None:
+        for totals in _numpy_elf_calories(source):
+            yield from totals.tolist()
+        return
+    # Empty files cannot be mapped, and neither can pipes.
+    if utils.is_path(source) and os.path.isfile(source) and os.path.getsize(source):
+        yield from _scan_elf_calories(source)
+        return
+    total = 0
+    for line in utils.lines(source):
         if line == "":
-            calories.append(0)
+            yield total
+            total = 0
         else:
-            calories[-1] += int(line)
-    return calories
+            total += int(line)
+    yield total
+
+
+@cache.parser(version=1)
+def sum_calories(source: utils.Source) -> list[int]:
+    """
+    Args:
+        source (utils.Source): A text file of calorie data.
+
+    Returns:
+        list[int]: A list of each Elf's total calories in order (see elf_calories()).
+    """
+    return list(elf_calories(source))
+
+
+def _scan_elf_calories(path: str | os.PathLike) -> Iterator[int]:
+    """
+    The plain Python backend of elf_calories() for files. A memory map of the file is read a block of CHUNK_SIZE bytes
+    at a time (see aoc2022.utils), and each byte is either a digit, added to the number being read, or a line ending.
+    A newline that ends a number adds it to the Elf's total, and one that ends a blank line ends the Elf.
+
+    Args:
+        path (str | os.PathLike): A non-empty text file of calorie data.
+
+    Yields:
+        Iterator[int]: Each Elf's total calories in order.
+    """
+    number = total = 0
+    blank = True
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        for block in iter(functools.partial(buffer.read, utils.CHUNK_SIZE), b""):
+            for byte in block:
+                # Digits are by far the most common bytes, so they are checked for first. The only others are line
+                # endings: \n, and \r (13), which is skipped.
+                if byte > 13:
+                    number = number * 10 + byte - 48
+                    blank = False
+                elif byte == 10:
+                    if blank:
+                        yield total
+                        total = 0
+                    else:
+                        total += number
+                        number = 0
+                        blank = True
+    yield total + number
+
+
+def _numpy_elf_calories(source: utils.Source) -> Iterator["numpy.ndarray"]:
+    """
+    The NumPy backend of elf_calories(). Each block of lines (see utils.blocks()) is parsed at once: every line's
+    number is built up a decimal place at a time, from the units, and the Elves' totals are the sums of their numbers,
+    found with numpy.add.reduceat(). The last Elf of a block may carry on into the next.
+
+    Args:
+        source (utils.Source): A text file of calorie data.
+
+    Yields:
+        Iterator[numpy.ndarray]: The totals of the Elves whose calories have all been read, in order.
+    """
+    carry = 0
+    for block in utils.blocks(source):
+        if not block.endswith(b"\n"):
+            block += b"\n"
+        data = numpy.frombuffer(block, numpy.uint8)
+        ends = numpy.flatnonzero(data == ord("\n"))
+        starts = numpy.concatenate(([0], ends[:-1] + 1))
+        # Where each line's number stops, before the line ending (which may be \r\n).
+        stops = ends - ((ends > starts) & (data[ends - 1] == ord("\r")))
+        lengths = stops - starts
+        numbers = numpy.zeros(len(starts), numpy.int64)
+        for place in range(int(lengths.max())):
+            digits = data[stops - 1 - place].astype(numpy.int64) - ord("0")
+            numbers += numpy.where(lengths > place, digits, 0) * 10**place
+        # Each blank line starts a new Elf. If the block ends with one, its last Elf is complete.
+        firsts = numpy.concatenate(([0], numpy.flatnonzero(stops == starts) + 1))
+        complete = firsts[-1] == len(starts)
+        totals = numpy.add.reduceat(numbers, firsts[:-1] if complete else firsts)
+        totals[0] += carry
+        carry = 0 if complete else int(totals[-1])
+        yield totals if complete else totals[:-1]
+    yield numpy.array([carry], dtype=numpy.int64)
+
+
+def top_k_calories(source: utils.Source, k: int) -> list[int]:
+    """
+    Finds the calories carried by the k Elves carrying the most, keeping only the k largest totals so far in a heap
+    while the input is read. Memory is O(k) and time O(n log k), however many Elves there are.
+
+    Args:
+        source (utils.Source): A text file of calorie data.
+        k (int): Number of Elves.
+
+    Returns:
+        list[int]: The k largest totals, largest first.
+    """
+    if numpy is not None:
+        top = []
+        for totals in _numpy_elf_calories(source):
+            if 0 < k < len(totals):
+                totals = numpy.partition(totals, len(totals) - k)[-k:]
+            top = heapq.nlargest(k, itertools.chain(top, totals.tolist()))
+        return top
+    return heapq.nlargest(k, elf_calories(source))
+
+
+def top_calories(source: utils.Source, workers: int = 1) -> list[int]:
+    """
+    Finds the calories carried by the Elves carrying the most. With more than one worker, the input is split between
+    Elves (at blank lines) and each part is searched in a separate process (see utils.map_reduce()).
+
+    Args:
+        source (utils.Source): A text file of calorie data.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+
+    Returns:
+        list[int]: The TOP largest totals, largest first.
+    """
+    if workers > 1:
+        with utils.phase("map_reduce"):
+            return utils.map_reduce(source, top_calories, _merge_top_calories, workers, separator=b"\n\n")
+    # The totals are reduced as they are parsed, and reading the input is most of the work.
+    with utils.phase("parse"):
+        return top_k_calories(source, TOP)
+
+
+def calorie_distribution(
+    source: utils.Source, workers: int = 1, relative_accuracy: float = sketch.DEFAULT_ACCURACY
+) -> sketch.QuantileSketch:
+    """
+    Summarises how many calories the Elves carry, as the input is read, in a quantile sketch: the number of Elves and
+    any percentile of their totals, in constant memory however many Elves there are. With more than one worker, each
+    part of the input is summarised in a separate process and the parts' sketches are merged (see utils.map_reduce()).
+
+    Args:
+        source (utils.Source): A text file of calorie data.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        relative_accuracy (float, optional): Accuracy of the percentiles (see sketch.QuantileSketch). Defaults to
+            sketch.DEFAULT_ACCURACY.
+
+    Returns:
+        sketch.QuantileSketch: The distribution of the Elves' totals.
+    """
+    summarise = functools.partial(_summarise_calories, relative_accuracy=relative_accuracy)
+    return utils.map_reduce(source, summarise, _merge_calorie_distributions, workers, separator=b"\n\n")
+
+
+def _summarise_calories(source: utils.Source, relative_accuracy: float) -> tuple[sketch.QuantileSketch, int]:
+    """
+    Args:
+        source (utils.Source): A text file of calorie data, or part of one.
+        relative_accuracy (float): Accuracy of the percentiles (see sketch.QuantileSketch).
+
+    Returns:
+        tuple[sketch.QuantileSketch, int]: The distribution of every Elf's totals but the last, and the last Elf's
+            total, which is left to _merge_calorie_distributions().
+    """
+    distribution = sketch.QuantileSketch(relative_accuracy)
+    totals = elf_calories(source)
+    last = next(totals)
+    for total in totals:
+        distribution.add(last)
+        last = total
+    return distribution, last
+
+
+def _merge_calorie_distributions(partials: Iterable[tuple[sketch.QuantileSketch, int]]) -> sketch.QuantileSketch:
+    """
+    Args:
+        partials (Iterable[tuple[sketch.QuantileSketch, int]]): The summary of each part of the input (see
+            _summarise_calories()), in order.
+
+    Returns:
+        sketch.QuantileSketch: The distribution of the whole input.
+    """
+    partials = list(partials)
+    # Every part but the last ends with a blank line, which elf_calories() takes to start an Elf with no calories. That
+    # Elf really starts in the next part, so only the last part's last Elf is counted.
+    distribution = sketch.merge_all(distribution for distribution, _ in partials)
+    distribution.add(partials[-1][1])
+    return distribution
 
 
-def first_star() -> int:
+class Leaderboard:
+    """
+    The Elves carrying the most calories in a calorie log that is still being written to. Each poll() reads only what
+    was appended since the last one, and remembers where it stopped and how far through the last Elf it was, so the
+    leaders are kept up to date for the cost of the new lines alone.
+
+    A line is only read once its newline has been written. If the log shrinks (e.g. it was truncated or replaced), it is
+    read again from the start.
+    """
+
+    path: str | os.PathLike
+    k: int
+    _offset: int
+    _total: int
+    _top: list[int]
+
+    def __init__(self, path: str | os.PathLike, k: int = TOP):
+        """
+        Args:
+            path (str | os.PathLike): Path of the calorie log.
+            k (int, optional): Number of leaders to keep. Defaults to TOP.
+        """
+        self.path = path
+        self.k = k
+        self._reset()
+
+    def _reset(self):
+        """
+        Forgets everything read so far.
+        """
+        # Bytes of whole lines read so far, the calories of the Elf still being read, and a min-heap of the k largest
+        # totals of the Elves before it.
+        self._offset = self._total = 0
+        self._top = []
+
+    def poll(self) -> int:
+        """
+        Reads any lines appended since the last poll.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        if os.path.getsize(self.path) < self._offset:
+            self._reset()
+        start = self._offset
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            for block in utils.blocks(file):
+                if not block.endswith(b"\n"):
+                    # The last line is still being written.
+                    break
+                for line in block.splitlines():
+                    if line:
+                        self._total += int(line)
+                    else:
+                        self._add(self._total)
+                        self._total = 0
+                self._offset += len(block)
+        return self._offset - start
+
+    def _add(self, total: int):
+        """
+        Args:
+            total (int): The calories of an Elf that has been read completely.
+        """
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, total)
+        elif self.k:
+            heapq.heappushpop(self._top, total)
+
+    def leaders(self) -> list[int]:
+        """
+        Returns:
+            list[int]: The k largest totals so far, largest first, counting the Elf still being read as it stands.
+        """
+        return heapq.nlargest(self.k, itertools.chain(self._top, (self._total,)))
+
+
+def follow(path: str | os.PathLike, k: int = TOP, interval: float = 1.0) -> Iterator[list[int]]:
+    """
+    Polls a calorie log for appended lines (see Leaderboard) for as long as the caller keeps asking.
+
+    Args:
+        path (str | os.PathLike): Path of the calorie log.
+        k (int, optional): Number of leaders. Defaults to TOP.
+        interval (float, optional): Seconds between polls. Defaults to 1.0.
+
+    Yields:
+        Iterator[list[int]]: The leaders (see Leaderboard.leaders()): once for what is already in the log, then each
+            time a poll reads more of it.
+    """
+    leaderboard = Leaderboard(path, k)
+    leaderboard.poll()
+    yield leaderboard.leaders()
+    while True:
+        time.sleep(interval)
+        if leaderboard.poll():
+            yield leaderboard.leaders()
+
+
+def _merge_top_calories(partials: Iterable[list[int]]) -> list[int]:
+    """
+    Args:
+        partials (Iterable[list[int]]): The largest totals of each part of the input.
+
+    Returns:
+        list[int]: The TOP largest totals overall, largest first.
+    """
+    return heapq.nlargest(TOP, itertools.chain.from_iterable(partials))
+
+
+def first_star(source: utils.Source = "fixtures/day1.txt", workers: int = 1) -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day1.txt".
+        workers (int, optional): Number of worker processes (see top_calories()). Defaults to 1.
+
     Returns:
         int: The number of calories carried by the Elf that carried the most.
     """
-    calories = sum_calories("fixtures/day1.txt")
-    return max(calories)
+    return top_calories(source, workers)[0]
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day1.txt", workers: int = 1) -> int:
     """
     Seecond star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day1.txt".
+        workers (int, optional): Number of worker processes (see top_calories()). Defaults to 1.
+
     Returns:
         int: The total number of calories carried by the top three Elves.
     """
-    calories = sum_calories("fixtures/day1.txt")
-    return sum(sorted(calories, reverse=True)[:3])
+    return sum(top_calories(source, workers))
+
+
+def solve_both(source: utils.Source = "fixtures/day1.txt", workers: int = 1) -> tuple[int, int]:
+    """
+    Both star solutions, from a single parse of the input.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day1.txt".
+        workers (int, optional): Number of worker processes (see top_calories()). Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    top = top_calories(source, workers)
+    return top[0], sum(top)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -8,6 +8,9 @@ from aoc2022 import utils
 
 State = Tuple[int, int]
 
+# The cycles during which the first star takes the signal strength.
+SNAPSHOT_CYCLES = (20, 60, 100, 140, 180, 220)
+
 
 @dataclasses.dataclass
 class CPU:
@@ -62,14 +65,14 @@ class InterfaceHandler:
     cpu: CPU
     instructions: list[Callable[[Optional[int]], None]]
 
-    def __init__(self, path: str):
+    def __init__(self, source: utils.Source):
         self.cpu = CPU()
         self.instructions = []
-        self._parse_instructions(path)
+        self._parse_instructions(source)
 
-    def _parse_instructions(self, path: str):
+    def _parse_instructions(self, source: utils.Source):
         # Parse instructions and prepare execution.
-        for line in utils.lines(path):
+        for line in utils.lines(source):
             if line == "noop":
                 self.instructions.append(self.cpu.noop())
             if line.startswith("addx"):
@@ -86,8 +89,8 @@ class SnapshotCycler(InterfaceHandler):
 
     snapshot_cycles: list[int]
 
-    def __init__(self, path: str, snapshot_cycles: Optional[list[int]] = None):
-        super().__init__(path)
+    def __init__(self, source: utils.Source, snapshot_cycles: Optional[list[int]] = None):
+        super().__init__(source)
         self.snapshot_cycles = snapshot_cycles or []
 
     def run(self) -> State:
@@ -115,59 +118,113 @@ class CRT(InterfaceHandler):
 
     screen: list[str]
 
-    def __init__(self, path: str):
-        super().__init__(path)
+    def __init__(self, source: utils.Source):
+        super().__init__(source)
         self.screen = [["." for _ in range(40)] for _ in range(6)]
 
+    def __str__(self) -> str:
+        return "\n".join("".join(row) for row in self.screen)
+
     def run(self):
         """
         Runs through the instructions, painting a pixel on the screen whenever the current column number of the
-        electron beam is equal to or one away from the X register.
+        electron beam is equal to or one away from the X register. Cycles after the beam has finished the last row
+        are not drawn.
         """
         for instruction in self.instructions:
             for cycle, reg_x in instruction:
-                row = (cycle - 1) // 40
-                col = cycle - 1 - (row * 40)
-                sprite = (reg_x - 1, reg_x, reg_x + 1)
-                if col in sprite:
-                    self.screen[row][col] = "#"
+                if not self.paint(cycle, reg_x):
+                    return
+
+    def paint(self, cycle: int, reg_x: int) -> bool:
+        """
+        Paints the pixel under the electron beam during the given cycle, if the sprite covers it.
+
+        Args:
+            cycle (int): The cycle counter.
+            reg_x (int): The X register during that cycle.
+
+        Returns:
+            bool: False if the beam has already finished the last row, so there was nothing to paint.
+        """
+        row = (cycle - 1) // 40
+        if row >= len(self.screen):
+            return False
+        col = cycle - 1 - (row * 40)
+        sprite = (reg_x - 1, reg_x, reg_x + 1)
+        if col in sprite:
+            self.screen[row][col] = "#"
+        return True
 
     def draw_screen(self):
         """
         Draws the screen according to the contents of self.screen.
         """
-        for row in self.screen:
-            print("".join(row))
+        print(self)
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day10.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day10.txt".
+
     Returns:
         int: The product of the combined "signal strengths" taken at specific snapshot intervals.
     """
-    input_output = SnapshotCycler("fixtures/day10.txt", [20, 60, 100, 140, 180, 220])
-    signal_strengths = list(input_output.run())
+    with utils.phase("parse"):
+        input_output = SnapshotCycler(source, list(SNAPSHOT_CYCLES))
+    with utils.phase("simulate"):
+        signal_strengths = list(input_output.run())
     return sum((x[0] * x[1] for x in signal_strengths))
 
 
-def second_star() -> CRT:
+def second_star(source: utils.Source = "fixtures/day10.txt") -> CRT:
     """
     Second star solution.
     This particular part relies on printing a "picture" onto the terminal. The larger message in this output *is* the
     part 2 answer. For purposes of testing, this function returns the CRT object itself to make assertions against
     its internal "screen" state.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day10.txt".
+
     Returns:
         CRT: The CRT object.
     """
-    crt = CRT("fixtures/day10.txt")
-    crt.run()
+    with utils.phase("parse"):
+        crt = CRT(source)
+    with utils.phase("simulate"):
+        crt.run()
     crt.draw_screen()
     return crt
 
 
+def solve_both(source: utils.Source = "fixtures/day10.txt") -> tuple[int, CRT]:
+    """
+    Both star solutions, from a single run of the program. The CRT paints its screen while the signal strengths are
+    read off the same cycles.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day10.txt".
+
+    Returns:
+        tuple[int, CRT]: The first star answer, and the CRT object for the second star (see second_star()).
+    """
+    with utils.phase("parse"):
+        crt = CRT(source)
+    signal_strength = 0
+    with utils.phase("simulate"):
+        for instruction in crt.instructions:
+            for cycle, reg_x in instruction:
+                if cycle in SNAPSHOT_CYCLES:
+                    signal_strength += cycle * reg_x
+                crt.paint(cycle, reg_x)
+    crt.draw_screen()
+    return signal_strength, crt
+
+
 if __name__ == "__main__":  # pragma: no cover
     print(first_star())
     print(second_star())
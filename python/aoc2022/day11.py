@@ -2,13 +2,14 @@
 Day 11: Monkey in the Middle
 """
 import collections
+import copy
 import dataclasses
 import operator
 import re
 from functools import partial, reduce
 from typing import Callable
 
-from aoc2022 import utils
+from aoc2022 import cache, utils
 
 Throw = collections.namedtuple("Throw", "recipient,worry_level")
 
@@ -130,17 +131,18 @@ class Monkey:
         return items_to_throw
 
 
-def make_monkeys(path: str) -> list[Monkey]:
+@cache.parser(version=1)
+def make_monkeys(source: utils.Source) -> list[Monkey]:
     """
     Parses a text file of instructions and creates monkeys out of that.
 
     Args:
-        path (str): Path to the text file.
+        source (utils.Source): The text file.
 
     Returns:
         list[Monkey]: A list of monkeys created from the instructions.
     """
-    lines = list(utils.lines(path))
+    lines = list(utils.lines(source))
     index = 0
     instruction_list = [""]
     for line in lines:
@@ -179,6 +181,8 @@ def calculate_monkey_business(monkeys: list[Monkey]) -> int:
         int: The amount of "monkey business" between the top two.
     """
     inspections = sorted([monkey.inspections_done for monkey in monkeys], reverse=True)
+    if (counts := utils.operations()) is not None:
+        counts.update(items_inspected=sum(inspections))
     return inspections[0] * inspections[1]
 
 
@@ -196,32 +200,68 @@ def reduce_to_lcm(monkeys: list[Monkey], lcm: int):
             monkey.items[index] = item % lcm
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day11.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day11.txt".
+
     Returns:
         int: The amount of monkey business after 20 rounds.
     """
-    monkeys = make_monkeys("fixtures/day11.txt")
-    for _ in range(20):
-        play_round(monkeys, False)
-    return calculate_monkey_business(monkeys)
+    with utils.phase("parse"):
+        monkeys = make_monkeys(source)
+    with utils.phase("simulate"):
+        for _ in range(20):
+            play_round(monkeys, False)
+    with utils.phase("reduce"):
+        return calculate_monkey_business(monkeys)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day11.txt") -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day11.txt".
+
     Returns:
         int: The amount of monkey business after 10,000 rounds, without automatically dividing worry levels by 3.
     """
-    monkeys = make_monkeys("fixtures/day11.txt")
+    with utils.phase("parse"):
+        monkeys = make_monkeys(source)
+    lcm = reduce(operator.mul, [monkey.test_divisible for monkey in monkeys])
+    with utils.phase("simulate"):
+        for _ in range(10000):
+            play_round(monkeys, True)
+            reduce_to_lcm(monkeys, lcm)
+    with utils.phase("reduce"):
+        return calculate_monkey_business(monkeys)
+
+
+def solve_both(source: utils.Source = "fixtures/day11.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single parse of the monkeys. Each star plays with its own copy of them.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day11.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        monkeys = make_monkeys(source)
+        second_monkeys = copy.deepcopy(monkeys)
     lcm = reduce(operator.mul, [monkey.test_divisible for monkey in monkeys])
-    for _ in range(10000):
-        play_round(monkeys, True)
-        reduce_to_lcm(monkeys, lcm)
-    return calculate_monkey_business(monkeys)
+    with utils.phase("simulate"):
+        for _ in range(20):
+            play_round(monkeys, False)
+        for _ in range(10000):
+            play_round(second_monkeys, True)
+            reduce_to_lcm(second_monkeys, lcm)
+    with utils.phase("reduce"):
+        return calculate_monkey_business(monkeys), calculate_monkey_business(second_monkeys)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -6,7 +6,14 @@ from collections import deque
 from string import ascii_lowercase
 from typing import List, Optional, Self, Tuple
 
-from aoc2022.utils import DIRS, lines
+from aoc2022.utils import Grid, Source, lines, operations, phase, phased
+
+# Characters of the heightmap, from lowest to highest. The grid stores each cell as its position in this string.
+HEIGHTS = f"S{ascii_lowercase}E"
+TABLE = bytes.maketrans(HEIGHTS.encode(), bytes(range(len(HEIGHTS))))
+START, LOWEST, END = HEIGHTS.index("S"), HEIGHTS.index("a"), HEIGHTS.index("E")
+# The border of the grid is far too high to climb onto.
+WALL = 255
 
 
 @dataclasses.dataclass
@@ -46,87 +53,132 @@ class Node:
         return path + self.prev.path
 
 
-def find_path(grid: List[str], start: Tuple[int, int], end: Tuple[int, int]) -> Node:
+def read_heightmap(source: Source) -> Grid:
+    """
+    Args:
+        source (Source): The puzzle input (see aoc2022.utils.Source).
+
+    Returns:
+        Grid: The heights of the heightmap (see HEIGHTS), bordered by WALL.
+    """
+    return Grid(lines(source, binary=True), TABLE, WALL)
+
+
+@phased("search")
+def find_path(grid: Grid, start: int, end: int) -> Optional[Node]:
     """
     Breadth-first search for a valid path through the grid. Checks adjacent directions for valid directions, which
-    in this case means any path of equal to or no greater than one "character" larger than the previous.
+    in this case means any path of equal to or no greater than one "character" larger than the previous. The border
+    of the grid is never valid, so there are no bounds to check.
+
+    The search only records which cell each cell was first reached from; the path's Nodes are built once the end is
+    found.
 
     Args:
-        grid (List[str]): The grid to search through, as a list of strings.
-        start (Tuple[int, int]): Starting coordinates.
-        end (Tuple[int, int]): Ending coordinates.
+        grid (Grid): The heightmap (see read_heightmap()).
+        start (int): Index of the starting cell.
+        end (int): Index of the ending cell.
 
     Returns:
-        Node: The node representing the final step in the path.
+        Optional[Node]: The node representing the final step in the path, or None if there is no path.
     """
-    heights = f"S{ascii_lowercase}E"
-    queue = deque()
-    seen = set()
-    queue.append(Node(start[0], start[1], None))
-    grid_height = len(grid)
-    grid_length = len(grid[0])
+    cells = grid.cells
+    # The index of the cell each cell was reached from; -1 for the cells not reached yet.
+    previous = [-1] * len(cells)
+    previous[start] = start
+    queue = deque([start])
     while queue:
         current = queue.popleft()
-        if current.location in seen:
-            continue
-        seen.add(current.location)
-        if current.location == end:
-            return current
-        char1 = grid[current.row][current.col]
-        height1 = heights.index(char1)
-        for d_y, d_x in DIRS:
-            proposed = Node(current.col + d_x, current.row + d_y, current)
-            valid = 0 <= proposed.row < grid_height and 0 <= proposed.col < grid_length
-            if not valid:
-                continue
-            char2 = grid[proposed.row][proposed.col]
-            height2 = heights.index(char2)
-            if height2 <= height1 + 1:
+        if current == end:
+            _count_search(previous, -1, queue)
+            return _path_to(grid, previous, end)
+        highest = cells[current] + 1
+        for offset in grid.offsets:
+            proposed = current + offset
+            if previous[proposed] == -1 and cells[proposed] <= highest:
+                previous[proposed] = current
                 queue.append(proposed)
+    _count_search(previous, -1, queue)
+    return None
 
 
-def first_star() -> int:
+def _count_search(reached: list, unreached: object, queue: deque):
     """
-    First star solution.
+    Reports the work a breadth-first search did, if operations are being counted (see utils.operations()). Every cell
+    it reached was enqueued once, and every one of those no longer in the queue was expanded.
+
+    Args:
+        reached (list): The search's record of each cell, by index.
+        unreached (object): The record of the cells it did not reach.
+        queue (deque): The cells still waiting to be expanded.
+    """
+    if (counts := operations()) is not None:
+        enqueued = len(reached) - reached.count(unreached)
+        counts.update(nodes_enqueued=enqueued, nodes_expanded=enqueued - len(queue))
+
+
+def _path_to(grid: Grid, previous: list[int], end: int) -> Node:
+    """
+    Args:
+        grid (Grid): The heightmap.
+        previous (list[int]): The index of the cell each cell was reached from, where the start was reached from
+            itself.
+        end (int): Index of the ending cell.
 
     Returns:
-        int: The length of the shortest path from S to E.
+        Node: The node representing the end, linked back through the path to the start.
     """
-    grid = list(lines("fixtures/day12.txt"))
-    start, end = None, None
-    for row_index, row in enumerate(grid):
-        for col_index, char in enumerate(row):
-            if char == "S":
-                start = (col_index, row_index)
-            if char == "E":
-                end = (col_index, row_index)
-    end_node = find_path(grid, start, end)
-    return len(end_node.path) - 1
+    indices = [end]
+    while previous[indices[-1]] != indices[-1]:
+        indices.append(previous[indices[-1]])
+    node = None
+    for index in reversed(indices):
+        node = Node(*grid.location(index), node)
+    return node
 
 
-def second_star() -> int:
+@phased("search")
+def distances_to(grid: Grid, end: int) -> list[Optional[int]]:
     """
-    Second star solution.
+    Breadth-first search backwards from the end, which finds the length of the shortest path to it from every cell
+    at once. Steps follow the same rule as find_path, only in reverse: a cell can step onto the current one if the
+    current one is no more than one "character" higher.
 
-    Here we sort of recreate a smaller version of our find_path function. In this case, we only want to find adjacent
-    'a' characters next to 'S'. Once we have all of our potential 'a' or 'S' starting points, run them all through the
-    pathfinding function and see which path winds up having the fewest steps.
+    Args:
+        grid (Grid): The heightmap (see read_heightmap()).
+        end (int): Index of the ending cell.
 
     Returns:
-        int: The number of steps in the path with the fewest steps.
+        list[Optional[int]]: The number of steps from each cell to the end, by index; None for the cells that cannot
+            reach it.
+    """
+    cells = grid.cells
+    distances = [None] * len(cells)
+    distances[end] = 0
+    queue = deque([end])
+    while queue:
+        current = queue.popleft()
+        lowest = cells[current] - 1
+        for offset in grid.offsets:
+            proposed = current + offset
+            if distances[proposed] is None and lowest <= cells[proposed] != WALL:
+                distances[proposed] = distances[current] + 1
+                queue.append(proposed)
+    _count_search(distances, None, queue)
+    return distances
+
+
+def find_starting_points(grid: Grid, start: int) -> set[int]:
+    """
+    From the starting point, branch out and find all the "a"'s connected to it through other "a"'s.
+
+    Args:
+        grid (Grid): The heightmap (see read_heightmap()).
+        start (int): Index of S.
+
+    Returns:
+        set[int]: Indices of S and every "a" connected to it.
     """
-    grid = list(lines("fixtures/day12.txt"))
-    grid_height = len(grid)
-    grid_width = len(grid[0])
-    start, end = None, None
-    for row_index, row in enumerate(grid):
-        for col_index, char in enumerate(row):
-            if char == "S":
-                start = (col_index, row_index)
-            if char == "E":
-                end = (col_index, row_index)
-
-    # From the starting node, branch out and find all the other "a"'s adjacent to it.
     queue = deque()
     seen = set()
     queue.append(start)
@@ -137,23 +189,84 @@ def second_star() -> int:
         if current in seen:
             continue
         seen.add(current)
-        for d_y, d_x in DIRS:
-            proposed = (current[0] + d_x, current[1] + d_y)
-            valid = 0 <= proposed[1] < grid_height and 0 <= proposed[0] < grid_width
-            if not valid:
-                continue
-            if grid[proposed[1]][proposed[0]] == "a":
+        for offset in grid.offsets:
+            proposed = current + offset
+            if grid.cells[proposed] == LOWEST:
                 queue.append(proposed)
                 starting_points.add(proposed)
+    return starting_points
+
 
-    # Run the find_path on all nodes.
-    winner = None
-    for starting_point in starting_points:
-        end_node = find_path(grid, starting_point, end)
-        if end_node:
-            if winner is None or len(end_node.path) < len(winner.path):
-                winner = end_node
-    return len(winner.path) - 1
+def find_start_and_end(grid: Grid) -> Tuple[int, int]:
+    """
+    Finds S and E in the grid.
+
+    Args:
+        grid (Grid): The heightmap (see read_heightmap()).
+
+    Returns:
+        Tuple[int, int]: Indices of S and E, respectively.
+    """
+    return grid.cells.index(START), grid.cells.index(END)
+
+
+def first_star(source: Source = "fixtures/day12.txt") -> int:
+    """
+    First star solution.
+
+    Args:
+        source (Source, optional): The puzzle input (see aoc2022.utils.Source). Defaults to "fixtures/day12.txt".
+
+    Returns:
+        int: The length of the shortest path from S to E.
+    """
+    with phase("parse"):
+        grid = read_heightmap(source)
+    start, end = find_start_and_end(grid)
+    end_node = find_path(grid, start, end)
+    return len(end_node.path) - 1
+
+
+def second_star(source: Source = "fixtures/day12.txt") -> int:
+    """
+    Second star solution.
+
+    Only the 'a' characters connected to 'S' (through other 'a' characters) are potential starting points. Rather than
+    searching from each of them in turn, one search backwards from 'E' finds the distance from all of them at once,
+    and the closest one wins.
+
+    Args:
+        source (Source, optional): The puzzle input (see aoc2022.utils.Source). Defaults to "fixtures/day12.txt".
+
+    Returns:
+        int: The number of steps in the path with the fewest steps.
+    """
+    with phase("parse"):
+        grid = read_heightmap(source)
+    start, end = find_start_and_end(grid)
+    with phase("build"):
+        starting_points = find_starting_points(grid, start)
+    distances = distances_to(grid, end)
+    return min(distances[point] for point in starting_points if distances[point] is not None)
+
+
+def solve_both(source: Source = "fixtures/day12.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single search backwards from 'E' (see distances_to()).
+
+    Args:
+        source (Source, optional): The puzzle input (see aoc2022.utils.Source). Defaults to "fixtures/day12.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with phase("parse"):
+        grid = read_heightmap(source)
+    start, end = find_start_and_end(grid)
+    with phase("build"):
+        starting_points = find_starting_points(grid, start)
+    distances = distances_to(grid, end)
+    return distances[start], min(distances[point] for point in starting_points if distances[point] is not None)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,26 +1,34 @@
 """
 Day 13: Distress Signal
 """
+import itertools
 import json
 from typing import List, Optional
 
-from aoc2022 import utils
+from aoc2022 import binary, cache, utils
 
 Packet = int | List[int | List[int]]
 
+# Tokens of the binary form of the input (see to_binary()). Any byte below LARGE is an integer of that value, and LARGE
+# is followed by a larger integer as 4 little-endian bytes.
+OPEN, CLOSE, NEXT_PAIR, LARGE = 0xFF, 0xFE, 0xFD, 0xFC
 
-def read_packets(path: str) -> List[List[Packet]]:
+
+@cache.parser(version=1)
+def read_packets(source: utils.Source) -> List[List[Packet]]:
     """
     Reads the input file and returns a list of signal packet pairings. Empty lines are a sign to start a new "chunk".
 
     Args:
-        path (str): Path of the file.
+        source (utils.Source): The text or binary (see to_binary()) file.
 
     Returns:
         List[Packet]: Pairs of packets.
     """
+    if binary.is_binary(source):
+        return _read_binary_packets(source)
     results = [[]]
-    for line in utils.lines(path):
+    for line in utils.lines(source):
         if not line:
             results.append([])
         else:
@@ -29,18 +37,86 @@ def read_packets(path: str) -> List[List[Packet]]:
     return results
 
 
-def read_packets_without_pairs(path: str) -> List[Packet]:
+@cache.parser(version=1)
+def read_packets_without_pairs(source: utils.Source) -> List[Packet]:
     """
     Reads the input file and returns a list of signal packet pairings. Empty lines are disregarded, as is the notion
     of putting packets in pairs.
 
     Args:
-        path (str): Path of the file.
+        source (utils.Source): The text or binary (see to_binary()) file.
 
     Returns:
         List[Packet]: _description_
     """
-    return [json.loads(line) for line in utils.lines(path) if line]
+    if binary.is_binary(source):
+        return [packet for pair in _read_binary_packets(source) for packet in pair]
+    return [json.loads(line) for line in utils.lines(source) if line]
+
+
+def _read_binary_packets(source: utils.Source) -> List[List[Packet]]:
+    """
+    Args:
+        source (utils.Source): A binary file of packets (see to_binary()).
+
+    Returns:
+        List[List[Packet]]: Pairs of packets.
+    """
+    with binary.payload(source, 13) as data:
+        tokens = iter(bytes(data))
+    pairs, lists = [[]], []
+    for token in tokens:
+        if token < LARGE:
+            lists[-1].append(token)
+        elif token == OPEN:
+            lists.append([])
+        elif token == CLOSE:
+            finished = lists.pop()
+            (lists[-1] if lists else pairs[-1]).append(finished)
+        elif token == NEXT_PAIR:
+            pairs.append([])
+        else:
+            lists[-1].append(int.from_bytes(bytes(itertools.islice(tokens, 4)), "little"))
+    return pairs
+
+
+def _to_tokens(packet: Packet, tokens: bytearray):
+    """
+    Appends the tokens of a packet (see to_binary()).
+
+    Args:
+        packet (Packet): The packet, or an integer within one.
+        tokens (bytearray): The tokens so far.
+    """
+    if isinstance(packet, int):
+        if packet < LARGE:
+            tokens.append(packet)
+        else:
+            tokens.append(LARGE)
+            tokens += packet.to_bytes(4, "little")
+        return
+    tokens.append(OPEN)
+    for item in packet:
+        _to_tokens(item, tokens)
+    tokens.append(CLOSE)
+
+
+def to_binary(source: utils.Source) -> bytes:
+    """
+    Args:
+        source (utils.Source): A text file of packets.
+
+    Returns:
+        bytes: The binary form of the input (see aoc2022.binary): a stream of one-byte tokens, with OPEN and CLOSE
+            around each list, NEXT_PAIR between pairs, and each integer as a byte of its own (or LARGE and 4 bytes).
+    """
+    tokens = bytearray()
+    for index, pair in enumerate(read_packets(source)):
+        if index:
+            tokens.append(NEXT_PAIR)
+        for packet in pair:
+            _to_tokens(packet, tokens)
+    return bytes(tokens)
 
 
 def in_order(left: Packet, right: Packet) -> Optional[bool]:
@@ -146,6 +222,8 @@ def merge(left: List[Packet], right: List[Packet]) -> List[Packet]:
         else:
             ordered.append(right[right_index])
             right_index += 1
+    if (counts := utils.operations()) is not None:
+        counts.update(comparisons=left_index + right_index)
     while left_index < len(left):
         ordered.append(left[left_index])
         left_index += 1
@@ -155,36 +233,73 @@ def merge(left: List[Packet], right: List[Packet]) -> List[Packet]:
     return ordered
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day13.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day13.txt".
+
     Returns:
         int: The sum of the (1-based) indicies of the pairs whose inputs are in order.
     """
-    packets = read_packets("fixtures/day13.txt")
+    with utils.phase("parse"):
+        packets = read_packets(source)
     summed_indicies = 0
-    for index, pair in enumerate(packets, start=1):
-        left, right = pair
-        if in_order(left, right):
-            summed_indicies += index
+    with utils.phase("reduce"):
+        for index, pair in enumerate(packets, start=1):
+            left, right = pair
+            if in_order(left, right):
+                summed_indicies += index
+    if (counts := utils.operations()) is not None:
+        counts.update(comparisons=len(packets))
     return summed_indicies
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day13.txt") -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day13.txt".
+
     Returns:
         int: The product of the 1-based indices of [[2]] and [[6]] after adding them to the packet list.
     """
-    packets = read_packets_without_pairs("fixtures/day13.txt")
+    with utils.phase("parse"):
+        packets = read_packets_without_pairs(source)
     packets.append([[2]])
     packets.append([[6]])
-    ordered = merge_sort(packets)
+    with utils.phase("sort"):
+        ordered = merge_sort(packets)
     return (ordered.index([[2]]) + 1) * (ordered.index([[6]]) + 1)
 
 
+def solve_both(source: utils.Source = "fixtures/day13.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single read of the packets.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day13.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        pairs = read_packets(source)
+    summed_indicies = 0
+    with utils.phase("reduce"):
+        for index, (left, right) in enumerate(pairs, start=1):
+            if in_order(left, right):
+                summed_indicies += index
+    if (counts := utils.operations()) is not None:
+        counts.update(comparisons=len(pairs))
+    packets = [packet for pair in pairs for packet in pair] + [[[2]], [[6]]]
+    with utils.phase("sort"):
+        ordered = merge_sort(packets)
+    return summed_indicies, (ordered.index([[2]]) + 1) * (ordered.index([[6]]) + 1)
+
+
 if __name__ == "__main__":  # pragma: no cover
     print(first_star())
     print(second_star())
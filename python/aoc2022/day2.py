@@ -1,6 +1,7 @@
 """
 Day 2: Rock Paper Scissors
 """
+import functools
 from typing import Callable
 
 from aoc2022 import utils
@@ -80,41 +81,74 @@ def second_column_means_outcome(opponent: str, outcome: str) -> int:
     return OUTCOMES[(opponent, your_throw)]
 
 
-def total_score(path: str, strategy: Callable[[str, str], int]) -> int:
+def total_score(source: utils.Source, strategy: Callable[[str, str], int], workers: int = 1) -> int:
     """
     Play a series of games according to a given strategy function.
 
     Args:
-        path (str): _description_
+        source (utils.Source): _description_
         strategy (Callable[[str, str], int]): _description_
+        workers (int, optional): Number of worker processes to split the games between (see utils.map_reduce()).
+            Defaults to 1.
 
     Returns:
         int: _description_
     """
+    if workers > 1:
+        return utils.map_reduce(source, functools.partial(total_score, strategy=strategy), sum, workers)
     total = 0
-    for line in utils.lines(path):
+    for line in utils.lines(source):
         total += strategy(*line.strip().split(" "))
     return total
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day2.txt", workers: int = 1) -> int:
     """
     First star solution. Uses the second_column_means_shape strategy guide.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day2.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Total score according to second_column_means_shape strategy.
     """
-    return total_score("fixtures/day2.txt", second_column_means_shape)
+    return total_score(source, second_column_means_shape, workers)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day2.txt", workers: int = 1) -> int:
     """
     Second star solution. Uses the second_column_means_outcome strategy guide.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day2.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Total score according to second_column_means_outcome strategy.
     """
-    return total_score("fixtures/day2.txt", second_column_means_outcome)
+    return total_score(source, second_column_means_outcome, workers)
+
+
+def solve_both(source: utils.Source = "fixtures/day2.txt", workers: int = 1) -> tuple[int, int]:
+    """
+    Both star solutions, scoring each game by both strategy guides in a single pass over the input.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day2.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    if workers > 1:
+        return utils.map_reduce(source, solve_both, utils.sum_columns, workers)
+    first, second = 0, 0
+    for line in utils.lines(source):
+        columns = line.strip().split(" ")
+        first += second_column_means_shape(*columns)
+        second += second_column_means_outcome(*columns)
+    return first, second
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -40,23 +40,27 @@ def get_priority(letter: str) -> int:
     return PRIORITIES.index(letter)
 
 
-def sum_rucksack(path: str) -> int:
+def sum_rucksack(source: utils.Source, workers: int = 1) -> int:
     """
     Given a text file with a set of rucksacks, determine the duplicate item type priorities from each of them, then
     return the sum of them all.
 
     Args:
-        path (str): The file containing rucksacks.
+        source (utils.Source): The file containing rucksacks.
+        workers (int, optional): Number of worker processes to split the rucksacks between (see utils.map_reduce()).
+            Defaults to 1.
 
     Returns:
         int: The total "duplicate item type" priorities of all the rucksacks in the file.
     """
-    items = [find_duplicate_item(rucksack) for rucksack in utils.lines(path)]
+    if workers > 1:
+        return utils.map_reduce(source, sum_rucksack, sum, workers)
+    items = [find_duplicate_item(rucksack) for rucksack in utils.lines(source)]
     priorities = [get_priority(item) for item in items]
     return sum(priorities)
 
 
-def priority_groups_of_three(path: str) -> int:
+def priority_groups_of_three(source: utils.Source, workers: int = 1) -> int:
     """
     Reading three lines at a time, find the one item type common among all three - their "common badge".
     (Techically, all lines are read; it only does a calculation on every third).
@@ -64,14 +68,18 @@ def priority_groups_of_three(path: str) -> int:
     Sum up the priorities of these common badges and return the result.
 
     Args:
-        path (str): The file containing rucksacks.
+        source (utils.Source): The file containing rucksacks.
+        workers (int, optional): Number of worker processes to split the groups between (see utils.map_reduce()).
+            Defaults to 1.
 
     Returns:
         int: The total of each set-of-threes' common badge item type priorities.
     """
+    if workers > 1:
+        return utils.map_reduce(source, priority_groups_of_three, sum, workers, group=3)
     sacks = [None, None, None]
     priority_total = 0
-    for index, line in enumerate(utils.lines(path)):
+    for index, line in enumerate(utils.lines(source)):
         mod = index % 3
         sacks[mod] = line.strip()
         if mod == 2:
@@ -80,24 +88,57 @@ def priority_groups_of_three(path: str) -> int:
     return priority_total
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day3.txt", workers: int = 1) -> int:
     """
     First star solution. Sum up all "duplicate item types" from the provided input.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day3.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Total of all "duplicate item type" priorities.
     """
-    return sum_rucksack("fixtures/day3.txt")
+    return sum_rucksack(source, workers)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day3.txt", workers: int = 1) -> int:
     """
     Second star solution. Sum up all sets-of-three common badge item type priorities.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day3.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Total of all the badge priorities.
     """
-    return priority_groups_of_three("fixtures/day3.txt")
+    return priority_groups_of_three(source, workers)
+
+
+def solve_both(source: utils.Source = "fixtures/day3.txt", workers: int = 1) -> tuple[int, int]:
+    """
+    Both star solutions, in a single pass over the input.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day3.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    if workers > 1:
+        return utils.map_reduce(source, solve_both, utils.sum_columns, workers, group=3)
+    sacks = [None, None, None]
+    duplicate_total, badge_total = 0, 0
+    for index, line in enumerate(utils.lines(source)):
+        duplicate_total += get_priority(find_duplicate_item(line))
+        mod = index % 3
+        sacks[mod] = line.strip()
+        if mod == 2:
+            common_badge = (set(sacks[0]) & set(sacks[1]) & set(sacks[2])).pop()
+            badge_total += get_priority(common_badge)
+    return duplicate_total, badge_total
 
 
 if __name__ == "__main__":  # pragma: no cover
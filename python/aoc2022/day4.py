@@ -1,10 +1,13 @@
 """
 Day 4: Camp Cleanup
 """
+import functools
 import re
-from typing import Callable
+from typing import Callable, Iterator
 
-from aoc2022 import utils
+from aoc2022 import binary, utils
+
+Assignments = tuple[int, int, int, int]
 
 
 def strategy_full_containment(p1_start: int, p1_end: int, p2_start: int, p2_end: int) -> bool:
@@ -44,43 +47,107 @@ def strategy_any_overlap(p1_start: int, p1_end: int, p2_start: int, p2_end: int)
     return bool(set(range(p1_start, p1_end + 1)) & set(range(p2_start, p2_end + 1)))
 
 
-def count_shifts(path: str, strategy: Callable[[int, int, int, int], bool]) -> int:
+def read_assignments(source: utils.Source) -> Iterator[Assignments]:
+    """
+    Reads the pairs of section assignments, from either a text or a binary input.
+
+    Args:
+        source (utils.Source): The file of shift assignments.
+
+    Yields:
+        Iterator[Assignments]: The start and end of the first and then the second Elf's sections, for each pair.
+    """
+    if binary.is_binary(source):
+        with binary.payload(source, 4) as data:
+            numbers = binary.unpack_uint32(data)
+        # Four references to the same iterator, so each tuple takes the next four numbers.
+        yield from zip(*[iter(numbers)] * 4)
+        return
+    for line in utils.lines(source):
+        yield tuple(int(match) for match in re.findall(r"\d+", line))
+
+
+def to_binary(source: utils.Source) -> bytes:
+    """
+    Args:
+        source (utils.Source): A text file of shift assignments.
+
+    Returns:
+        bytes: The binary form of the input (see aoc2022.binary): the four numbers of each pair, as unsigned 32-bit
+            integers.
+    """
+    return binary.pack_uint32(int(number) for number in re.findall(r"\d+", utils.read_text(source)))
+
+
+def count_shifts(source: utils.Source, strategy: Callable[[int, int, int, int], bool], workers: int = 1) -> int:
     """
     Given a text file and a strategy function, return the number of lines that satisfy that strategy function.
 
     Args:
-        path (str): Path to the file of shift assignments.
+        source (utils.Source): The file of shift assignments.
         strategy (Callable[[int, int, int, int], bool]): A strategy function.
+        workers (int, optional): Number of worker processes to split the lines between (see utils.map_reduce()).
+            Defaults to 1.
 
     Returns:
         int: Number of lines that pass the strategy function.
     """
+    # Binary inputs are not made of lines, so cannot be split between workers.
+    if workers > 1 and not binary.is_binary(source):
+        return utils.map_reduce(source, functools.partial(count_shifts, strategy=strategy), sum, workers)
     count = 0
-    for line in utils.lines(path):
-        p1_start, p1_end, p2_start, p2_end = (int(match) for match in re.findall(r"\d+", line))
+    for p1_start, p1_end, p2_start, p2_end in read_assignments(source):
         if strategy(p1_start, p1_end, p2_start, p2_end):
             count += 1
     return count
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day4.txt", workers: int = 1) -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day4.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Number of assignment pairs with fully contained shift assignments.
     """
-    return count_shifts("fixtures/day4.txt", strategy_full_containment)
+    return count_shifts(source, strategy_full_containment, workers)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day4.txt", workers: int = 1) -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day4.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
     Returns:
         int: Number of assignment pairs with any overlap at all.
     """
-    return count_shifts("fixtures/day4.txt", strategy_any_overlap)
+    return count_shifts(source, strategy_any_overlap, workers)
+
+
+def solve_both(source: utils.Source = "fixtures/day4.txt", workers: int = 1) -> tuple[int, int]:
+    """
+    Both star solutions, checking each pair of assignments against both strategies in a single pass over the input.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day4.txt".
+        workers (int, optional): Number of worker processes (see utils.map_reduce()). Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    if workers > 1 and not binary.is_binary(source):
+        return utils.map_reduce(source, solve_both, utils.sum_columns, workers)
+    contained, overlapping = 0, 0
+    for shifts in read_assignments(source):
+        contained += strategy_full_containment(*shifts)
+        overlapping += strategy_any_overlap(*shifts)
+    return contained, overlapping
 
 
 if __name__ == "__main__":  # pragma: no cover
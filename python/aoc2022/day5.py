@@ -3,8 +3,114 @@ Day 5: Supply Stacks
 """
 import re
 from collections import defaultdict
+from typing import Optional
 
-from aoc2022 import utils
+from aoc2022 import binary, cache, utils
+
+Move = tuple[int, int, int]
+Manifest = tuple[dict[int, list[str]], list[Move]]
+
+
+@cache.parser(version=1)
+def read_manifest(source: utils.Source) -> Manifest:
+    """
+    Reads the starting stacks of crates and the instruction sequence to move them.
+
+    The first part are the crates. As we encounter the letters, take the index of those letters and insert them as
+    the first element of a list. The first element represents the bottom of the stack, so as more letters are added
+    for that stack, the first letter winds up being the last element representing the top. For instance:
+
+         [D]
+    [N]  [C]
+    [Z]  [M]  [P]
+     1    2    3
+
+    Results in lists of ["Z", "N"], ["M", "C", "D"], and ["P"] respectively.
+
+    As soon as we reach a line starting with " 1", the indices of the characters on each line are translated into
+    their 1-indexed form as stack numbers. So the final form of the crates becomes:
+    {
+        1: ["Z", "N"],
+        2: ["M", "C", "D"]
+        3: ["P"]
+    }
+
+    Then the file consists of commands in the form of "move X from Y to Z". Those are commands to move X number of
+    boxes from stack number Y onto stack Z, so each is stored as the tuple (X, Y, Z).
+
+    Args:
+        source (utils.Source): The text or binary (see to_binary()) file of crates and instructions.
+
+    Returns:
+        tuple[dict[int, list[str]], list[Move]]: The stacks of crates by stack number, and the instructions.
+    """
+    if binary.is_binary(source):
+        return _read_binary_manifest(source)
+    examining_crates = True
+    crates = {}
+    instructions = []
+
+    temp_crates = defaultdict(list)
+    for line in utils.lines(source):
+        if examining_crates:
+            if line.startswith(" 1"):
+                # Time to exit "examining crates mode". Eventually we'll convert the indexes to stack numbers.
+                examining_crates = False
+                stack_indices = line
+            else:
+                for index, char in enumerate(line):
+                    if char.isalpha():
+                        temp_crates[index].insert(0, char)
+        elif line.startswith("move"):
+            match_groups = re.match(r"move (\d+) from (\d+) to (\d+)", line).groups()
+            instructions.append(tuple(int(group) for group in match_groups))
+
+    # Construct crates using the actual stack numbers. The keys in temp_crates represent the n-th character of the
+    # stack indices line where the actual stack number is.
+    for index, stack in temp_crates.items():
+        stack_number = stack_indices[index]
+        crates[int(stack_number)] = stack
+    return crates, instructions
+
+
+def _read_binary_manifest(source: utils.Source) -> Manifest:
+    """
+    Args:
+        source (utils.Source): A binary file of crates and instructions (see to_binary()).
+
+    Returns:
+        Manifest: The stacks of crates by stack number, and the instructions.
+    """
+    with binary.payload(source, 5) as data:
+        (count,) = binary.unpack_uint32(data[:4])
+        table = binary.unpack_uint32(data[4 : 4 + 8 * count])
+        letters_start = 4 + 8 * count
+        moves_start = letters_start + sum(table[1::2])
+        letters = bytes(data[letters_start:moves_start]).decode("ascii")
+        numbers = binary.unpack_uint32(data[moves_start:])
+    crates, start = {}, 0
+    for number, length in zip(table[::2], table[1::2]):
+        crates[number] = list(letters[start : start + length])
+        start += length
+    # Three references to the same iterator, so each tuple takes the next three numbers.
+    return crates, list(zip(*[iter(numbers)] * 3))
+
+
+def to_binary(source: utils.Source) -> bytes:
+    """
+    Args:
+        source (utils.Source): A text file of crates and instructions.
+
+    Returns:
+        bytes: The binary form of the input (see aoc2022.binary), as unsigned 32-bit integers unless noted: the number
+            of stacks; the number and height of each stack; the letters of every crate (one byte each), bottom to top,
+            stack by stack; then the three numbers of each instruction.
+    """
+    crates, instructions = read_manifest(source)
+    table = [value for number, stack in crates.items() for value in (number, len(stack))]
+    letters = "".join("".join(stack) for stack in crates.values()).encode("ascii")
+    moves = binary.pack_uint32(number for move in instructions for number in move)
+    return binary.pack_uint32([len(crates), *table]) + letters + moves
 
 
 class CrateMover9000:
@@ -15,64 +121,30 @@ class CrateMover9000:
     crates: dict = None
     instructions: list = None
 
-    def __init__(self, path: str):
+    def __init__(self, source: utils.Source, manifest: Optional[Manifest] = None):
         """
-        Initialize the crates and the instruction sequence to move them.
-
-        The first part are the crates. As we encounter the letters, take the index of those letters and insert them as
-        the first element of a list. The first element represents the bottom of the stack, so as more letters are added
-        for that stack, the first letter winds up being the last element representing the top. For instance:
-
-             [D]
-        [N]  [C]
-        [Z]  [M]  [P]
-         1    2    3
-
-        Results in lists of ["Z", "N"], ["M", "C", "D"], and ["P"] respectively.
-
-        As soon as we reach a line starting with " 1", the indices of the characters on each line are translated into
-        their 1-indexed form as stack numbers. So the final form of the crates becomes:
-        {
-            1: ["Z", "N"],
-            2: ["M", "C", "D"]
-            3: ["P"]
-        }
-
-        Then the file consists of commands in the form of "move X from Y to Z". We'll store those for now and deal with
-        them eventually, but ultimately those are commands to move X number of boxes from stack number Y onto stack Z.
+        Initialize the crates and the instruction sequence to move them (see read_manifest()), then run the
+        instructions.
 
         Args:
-            path (str): _description_
+            source (utils.Source): The file of crates and instructions.
+            manifest (Optional[Manifest], optional): The crates and instructions, if they have already been read from
+                the source. The stacks are copied, so the same manifest can be run by more than one CrateMover.
+                Defaults to reading them from the source.
         """
-        examining_crates = True
-        self.crates = {}
-        self.instructions = []
-
-        temp_crates = defaultdict(list)
-        for line in utils.lines(path):
-            if examining_crates:
-                if line.startswith(" 1"):
-                    # Time to exit "examining crates mode". Eventually we'll convert the indexes to stack numbers.
-                    examining_crates = False
-                    stack_indices = line
-                else:
-                    for index, char in enumerate(line):
-                        if char.isalpha():
-                            temp_crates[index].insert(0, char)
-            elif line.startswith("move"):
-                self.instructions.append(line)
-
-        # Construct self.crates using the actual stack numbers. The keys in temp_crates represent the n-th character of
-        # the stack indices line where the actual stack number is.
-        for index, crates in temp_crates.items():
-            stack_number = stack_indices[index]
-            self.crates[int(stack_number)] = crates
+        if manifest is None:
+            with utils.phase("parse"):
+                self.crates, self.instructions = read_manifest(source)
+        else:
+            crates, self.instructions = manifest
+            self.crates = {number: list(stack) for number, stack in crates.items()}
 
         # Now we run the instructions.
-        for command in self.instructions:
-            match_groups = re.match(r"move (\d+) from (\d+) to (\d+)", command).groups()
-            times, source, target = [int(group) for group in match_groups]
-            self.move_crates(times, source, target)
+        with utils.phase("simulate"):
+            for times, origin, target in self.instructions:
+                self.move_crates(times, origin, target)
+        if (counts := utils.operations()) is not None:
+            counts.update(crates_moved=sum(times for times, _, _ in self.instructions))
 
     def move_crates(self, times: int, source: int, target: int):
         """
@@ -113,28 +185,51 @@ class CrateMover9001(CrateMover9000):
         self.crates[target].extend(being_moved)
 
 
-def first_star() -> str:
+def first_star(source: utils.Source = "fixtures/day5.txt") -> str:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day5.txt".
+
     Returns:
         str: The letters on top of each stack after processing the moving commands with the CrateMover 9000.
     """
-    crates = CrateMover9000("fixtures/day5.txt")
+    crates = CrateMover9000(source)
     return "".join(crates.get_top_crates())
 
 
-def second_star() -> str:
+def second_star(source: utils.Source = "fixtures/day5.txt") -> str:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day5.txt".
+
     Returns:
         str: The letters on top of each stack after processing the moving commands with the CrateMover 9001.
     """
-    crates = CrateMover9001("fixtures/day5.txt")
+    crates = CrateMover9001(source)
     return "".join(crates.get_top_crates())
 
 
+def solve_both(source: utils.Source = "fixtures/day5.txt") -> tuple[str, str]:
+    """
+    Both star solutions, running both CrateMovers on a single read of the manifest.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day5.txt".
+
+    Returns:
+        tuple[str, str]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        manifest = read_manifest(source)
+    first = CrateMover9000(source, manifest)
+    second = CrateMover9001(source, manifest)
+    return "".join(first.get_top_crates()), "".join(second.get_top_crates())
+
+
 if __name__ == "__main__":  # pragma: no cover
     print(first_star())
     print(second_star())
@@ -1,7 +1,7 @@
 """
 Day 6: Tuning Trouble
 """
-import pathlib
+from aoc2022 import utils
 
 
 def find_start_marker(lookup: str, packet_size: int) -> int:
@@ -24,24 +24,49 @@ def find_start_marker(lookup: str, packet_size: int) -> int:
     return None
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day6.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day6.txt".
+
     Returns:
         int: <DESCRIPTION>
     """
-    return find_start_marker(pathlib.Path("fixtures/day6.txt").read_text("utf-8"), 4)
+    with utils.phase("parse"):
+        signal = utils.read_text(source)
+    return find_start_marker(signal, 4)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day6.txt") -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day6.txt".
+
     Returns:
         int: <DESCRIPTION>
     """
-    return find_start_marker(pathlib.Path("fixtures/day6.txt").read_text("utf-8"), 14)
+    with utils.phase("parse"):
+        signal = utils.read_text(source)
+    return find_start_marker(signal, 14)
+
+
+def solve_both(source: utils.Source = "fixtures/day6.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single read of the input.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day6.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        signal = utils.read_text(source)
+    return find_start_marker(signal, 4), find_start_marker(signal, 14)
 
 
 if __name__ == "__main__":  # pragma: no cover
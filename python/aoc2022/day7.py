@@ -3,7 +3,7 @@ Day 7: No Space Left On Device
 """
 from typing import Optional, Self
 
-from aoc2022 import utils
+from aoc2022 import cache, utils
 
 
 class File:
@@ -92,23 +92,26 @@ class Directory:
             for entity in current.contents:
                 if isinstance(entity, Directory):
                     dirs.append(entity)
+        if (counts := utils.operations()) is not None:
+            counts.update(directories_visited=len(report))
         return report
 
 
-def create_filesystem(path: str) -> Directory:
+@cache.parser(version=1)
+def create_filesystem(source: utils.Source) -> Directory:
     """
     Reads in a text file of commands, then returns a file system according to the files and directories built from
     those commands.
 
     Args:
-        path (str): Text file containing directory traversal and observation commands.
+        source (utils.Source): Text file containing directory traversal and observation commands.
 
     Returns:
         Directory: The root file system built from the observations.
     """
     filesystem = Directory("/")
     cwd = None
-    for line in utils.lines(path):
+    for line in utils.lines(source):
         if line.startswith("$ cd"):
             path = line.split()[2]
             if path == "/":
@@ -131,27 +134,26 @@ def create_filesystem(path: str) -> Directory:
     return filesystem
 
 
-def first_star() -> int:
+def sum_small_folders(report: dict[str, int]) -> int:
     """
-    First star solution.
+    Args:
+        report (dict[str, int]): The recursive size of every folder (see Directory.total_size_report()).
 
     Returns:
         int: The sum of all folders' sizes whose recursive size is <= 100k.
     """
-    filesystem = create_filesystem("fixtures/day7.txt")
-    folders_100k_or_less = {folder: size for folder, size in filesystem.total_size_report().items() if size <= 100000}
+    folders_100k_or_less = {folder: size for folder, size in report.items() if size <= 100000}
     return sum(folders_100k_or_less.values())
 
 
-def second_star() -> int:
+def folder_to_delete(report: dict[str, int]) -> int:
     """
-    Second star solution.
+    Args:
+        report (dict[str, int]): The recursive size of every folder (see Directory.total_size_report()).
 
     Returns:
-        int: The size of the one folder that can be deleted that frees up enough space for the update.
+        int: The size of the smallest folder that can be deleted to free up enough space for the update.
     """
-    filesystem = create_filesystem("fixtures/day7.txt")
-    report = filesystem.total_size_report()
     space_available = 70_000_000 - report["/"]
     update_needs = 30_000_000 - space_available
     candidate_size = report["/"]
@@ -161,6 +163,57 @@ def second_star() -> int:
     return candidate_size
 
 
+def first_star(source: utils.Source = "fixtures/day7.txt") -> int:
+    """
+    First star solution.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day7.txt".
+
+    Returns:
+        int: The sum of all folders' sizes whose recursive size is <= 100k.
+    """
+    with utils.phase("parse"):
+        filesystem = create_filesystem(source)
+    with utils.phase("reduce"):
+        report = filesystem.total_size_report()
+    return sum_small_folders(report)
+
+
+def second_star(source: utils.Source = "fixtures/day7.txt") -> int:
+    """
+    Second star solution.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day7.txt".
+
+    Returns:
+        int: The size of the one folder that can be deleted that frees up enough space for the update.
+    """
+    with utils.phase("parse"):
+        filesystem = create_filesystem(source)
+    with utils.phase("reduce"):
+        report = filesystem.total_size_report()
+    return folder_to_delete(report)
+
+
+def solve_both(source: utils.Source = "fixtures/day7.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single size report of the filesystem.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day7.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        filesystem = create_filesystem(source)
+    with utils.phase("reduce"):
+        report = filesystem.total_size_report()
+    return sum_small_folders(report), folder_to_delete(report)
+
+
 if __name__ == "__main__":  # pragma: no cover
     print(first_star())
     print(second_star())
@@ -1,73 +1,159 @@
 """
 Day 8: Treetop Tree House
 """
-from aoc2022 import utils
+import array
+import concurrent.futures
+import functools
+import itertools
+from typing import Iterable, Iterator, MutableSequence, Sequence
 
+from aoc2022 import binary, cache, shm, utils
 
-class Forest:
+# Tree heights are single digits. The border of the grid is marked with a value no tree can have.
+TALLEST = 9
+HEIGHTS = bytes.maketrans(b"0123456789", bytes(range(TALLEST + 1)))
+EDGE = 255
+
+
+@cache.parser(version=2)
+def read_trees(source: utils.Source) -> utils.Grid:
     """
-    A forest represents a grid of trees. Each tree is an integer from 0-9 representing its height (or perhaps 0
-    indicates the absense of a tree).
+    Args:
+        source (utils.Source): A text or binary (see to_binary()) file of tree heights.
+
+    Returns:
+        utils.Grid: The tree heights, bordered by EDGE.
     """
+    if binary.is_binary(source):
+        with binary.payload(source, 8) as data:
+            width, height = binary.unpack_uint32(data[:8])
+            rows = [bytes(data[start : start + width]) for start in range(8, 8 + width * height, width)]
+        return utils.Grid(rows, padding=EDGE)
+    return utils.Grid(utils.lines(source, binary=True), HEIGHTS, EDGE)
 
-    _trees: list[list[int]]
-    _height: int
-    _width: int
 
-    def __init__(self, path: str):
-        self._trees = []
-        for line in utils.lines(path):
-            self._trees.append([int(char) for char in line])
+def to_binary(source: utils.Source) -> bytes:
+    """
+    Args:
+        source (utils.Source): A text file of tree heights.
 
-        # Cache width and height so we don't constantly recalculate them
-        self._width = len(self._trees[0])
-        self._height = len(self._trees)
+    Returns:
+        bytes: The binary form of the input (see aoc2022.binary): the width and height of the forest as unsigned
+            32-bit integers, then the height of each tree as a byte, row by row.
+    """
+    rows = [line.translate(HEIGHTS) for line in utils.lines(source, binary=True)]
+    return binary.pack_uint32((len(rows[0]), len(rows))) + b"".join(rows)
 
-    def _tree_visible(self, tree_x: int, tree_y: int) -> bool:
-        """
-        A tree is always visible if it is at the edge of the grid. Otherwise, a tree is considered visible if, for any
-        of the four directions of the trees' line of sight, there is no tree of equal or greater height looking off in
-        that direction.
 
-        Args:
-            tree_x (int): The tree's x-coordinate.
-            tree_y (int): The tree's y-coordinate.
+def scenic_score(trees: utils.Grid, index: int) -> int:
+    """
+    A tree's scenic score is the product of the number of trees visible from it in each of the four directions.
 
-        Returns:
-            bool: Whether the tree is considered visible.
-        """
-        # Is the tree at the edge?
-        if tree_x == 0 or tree_y == 0 or tree_x == self._width - 1 or tree_y == self._height - 1:
-            return True
+    Args:
+        trees (utils.Grid): The tree heights (see read_trees()).
+        index (int): Index of the tree in the grid.
+
+    Returns:
+        int: The tree's scenic score.
+    """
+    cells = trees.cells
+    this_tree = cells[index]
+    score = 1
+    for offset in trees.offsets:
+        # Walk away from the tree until the view is blocked or the edge is reached. A tree on the edge sees no trees at
+        # all in one direction, so its score is 0.
+        visible, neighbour = 0, index + offset
+        while cells[neighbour] != EDGE:
+            visible += 1
+            if cells[neighbour] >= this_tree:
+                break
+            neighbour += offset
+        score *= visible
+    return score
+
+
+def _lines_of_sight(trees: utils.Grid, rows: range, columns: range) -> Iterator[tuple[Sequence[int], Sequence[int]]]:
+    """
+    Some rows and columns of the forest, in both directions. Walking along one of them, each tree is seen from the edge
+    the walk started at.
+
+    Args:
+        trees (utils.Grid): The tree heights (see read_trees()).
+        rows (range): Numbers of the rows to walk along.
+        columns (range): Numbers of the columns to walk along.
+
+    Yields:
+        Iterator[tuple[Sequence[int], Sequence[int]]]: The heights of the trees along the line, and their indices in
+            the grid.
+    """
+    for y in rows:
+        heights, start = trees.row(y), trees.index(0, y)
+        indices = range(start, start + trees.width)
+        yield heights, indices
+        yield heights[::-1], indices[::-1]
+    for x in columns:
+        heights, start = trees.column(x), trees.index(x, 0)
+        indices = range(start, start + trees.height * trees.stride, trees.stride)
+        yield heights, indices
+        yield heights[::-1], indices[::-1]
+
+
+def _multiply_viewing_distances(lines: Iterable[tuple[Sequence[int], Sequence[int]]], scores: MutableSequence[int]):
+    """
+    Walks along each line of sight once, remembering where the last tree of each height was, and multiplies each
+    tree's score by how far it can see back along the line: the distance to the nearest tree at least as tall as it,
+    or to the edge.
+
+    Args:
+        lines (Iterable[tuple[Sequence[int], Sequence[int]]]): Lines of sight (see _lines_of_sight()).
+        scores (MutableSequence[int]): Scores so far, by index in the grid.
+    """
+    for heights, indices in lines:
+        # Where the last tree of each height was, as its position along the line (the edge counts as position 0).
+        last_seen = [0] * (TALLEST + 1)
+        for position, (height, index) in enumerate(zip(heights, indices)):
+            scores[index] *= position - max(last_seen[height:])
+            last_seen[height] = position
+
+
+def _multiply_viewing_distances_in_band(trees: shm.GridHandle, scores: shm.Handle, rows: range, columns: range):
+    """
+    Runs in a worker process, on a forest and scores shared by find_highest_scenic_score(). Workers given different
+    rows, or different columns, update different scores, so they can run at the same time.
+
+    Args:
+        trees (shm.GridHandle): The shared tree heights.
+        scores (shm.Handle): The shared scores so far, by index in the grid.
+        rows (range): Numbers of the rows to walk along.
+        columns (range): Numbers of the columns to walk along.
+    """
+    with shm.attach_grid(trees) as grid, shm.attach(scores) as shared_scores:
+        _multiply_viewing_distances(_lines_of_sight(grid, rows, columns), shared_scores)
 
-        # Check left and right
-        # Technically, left needs to be checked in reverse order, but since the condition must hold true for ALL trees,
-        # it doesn't really matter in the end.
-        row = self._trees[tree_y]
-        value = row[tree_x]
-        left = row[:tree_x]
-        right = row[tree_x + 1 :]
 
-        if all((tree < value for tree in left)):
-            return True
+def _bands(count: int, parts: int) -> list[range]:
+    """
+    Args:
+        count (int): Number of rows or columns.
+        parts (int): Most bands to split them into.
 
-        if all((tree < value for tree in right)):
-            return True
+    Returns:
+        list[range]: Consecutive bands of rows or columns, covering them all.
+    """
+    size = -(-count // parts)
+    return [range(start, min(start + size, count)) for start in range(0, count, size)]
 
-        # Check above and below
-        # Again, above needs to be checked in reverse order, but since the condition must hold true for ALL trees, it
-        # doesn't really matter in the end.
-        col = [row[tree_x] for row in self._trees]
-        above = col[:tree_y]
-        below = col[tree_y + 1 :]
 
-        if all((tree < value for tree in above)):
-            return True
+class Forest:
+    """
+    A forest represents a grid of trees. Each tree is an integer from 0-9 representing its height (or perhaps 0
+    indicates the absense of a tree).
+    """
 
-        if all((tree < value for tree in below)):
-            return True
+    _trees: utils.Grid
 
-        return False
+    def __init__(self, source: utils.Source):
+        self._trees = read_trees(source)
 
     def tree_scenic_score(self, tree_x: int, tree_y: int) -> int:
         """
@@ -81,92 +167,111 @@ class Forest:
         Returns:
             int: The product of how many trees are visible across all four directions.
         """
-        # Is the tree at the edge?
-        if tree_x == 0 or tree_y == 0 or tree_x == self._width - 1 or tree_y == self._height - 1:
-            return 0
-
-        # Extract variables (mainly left/right/above/below)
-        row = self._trees[tree_y]
-        this_tree = row[tree_x]
-        left = row[:tree_x]
-        right = row[tree_x + 1 :]
-        col = [row[tree_x] for row in self._trees]
-        above = col[:tree_y]
-        below = col[tree_y + 1 :]
-
-        # Declare loop enumeration variables to satisfy Pylint
-        # Because we already know the tree is not at an edge, we know there are spaces in all four directions.
-        left_score: int
-        right_score: int
-        above_score: int
-        below_score: int
-
-        # Looking left - the [::-1] ensures we start right and look leftward
-        for left_score, tree in enumerate(left[::-1], start=1):
-            if tree >= this_tree:
-                break
-
-        # Looking right
-        for right_score, tree in enumerate(right, start=1):
-            if tree >= this_tree:
-                break
-
-        # Looking above - the [::-1] ensures we start above and look upward
-        for above_score, tree in enumerate(above[::-1], start=1):
-            if tree >= this_tree:
-                break
-
-        # Looking below
-        for below_score, tree in enumerate(below, start=1):
-            if tree >= this_tree:
-                break
-
-        return left_score * right_score * above_score * below_score
+        return scenic_score(self._trees, self._trees.index(tree_x, tree_y))
 
     def count_visible_trees(self) -> int:
         """
+        A tree is visible if, in any of the four directions, every tree between it and the edge is shorter than it
+        (so trees on the edge are always visible). Rather than looking outward from every tree, this walks inward
+        from the edge along every row and column, and each tree taller than all before it is visible from that edge.
+
         Returns:
-            int: The number of trees in the forest that are considered visible (see _tree_visible()).
-        """
-        visible = 0
-        for tree_y, row in enumerate(self._trees):
-            for tree_x, _ in enumerate(row):
-                if self._tree_visible(tree_x, tree_y):
-                    visible += 1
-        return visible
-
-    def find_highest_scenic_score(self) -> int:
+            int: The number of trees in the forest that are considered visible.
         """
-        Returns:
-            int: The highest scenic score among all trees in the forest (see tree_scenic_score()).
+        trees = self._trees
+        visible = bytearray(len(trees.cells))
+        for heights, indices in _lines_of_sight(trees, range(trees.height), range(trees.width)):
+            tallest = -1
+            for height, index in zip(heights, indices):
+                if height > tallest:
+                    visible[index] = 1
+                    tallest = height
+                    if tallest == TALLEST:
+                        break
+        return visible.count(1)
+
+    def find_highest_scenic_score(self, workers: int = 1) -> int:
         """
-        highest = self.tree_scenic_score(0, 0)
-        for tree_y, row in enumerate(self._trees):
-            for tree_x, _ in enumerate(row):
-                highest = max(highest, self.tree_scenic_score(tree_x, tree_y))
-        return highest
+        Finds every tree's scenic score (see tree_scenic_score()) by walking along every row and column once in each
+        direction, remembering where the last tree of each height was. How far a tree can see back along the line is
+        the distance to the nearest tree at least as tall as it, or to the edge.
+
+        With more than one worker, the forest and the scores are shared with a process pool (see aoc2022.shm). The
+        workers first walk along bands of rows, then along bands of columns, each multiplying the scores of its own
+        trees.
 
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 1.
 
-def first_star() -> int:
+        Returns:
+            int: The highest scenic score among all trees in the forest.
+        """
+        trees = self._trees
+        if workers <= 1:
+            scores = [1] * len(trees.cells)
+            _multiply_viewing_distances(_lines_of_sight(trees, range(trees.height), range(trees.width)), scores)
+            return max(scores[index] for index in trees.indices())
+        with (
+            shm.share_grid(trees) as shared_trees,
+            shm.share(array.array("Q", [1]) * len(trees.cells)) as shared_scores,
+            concurrent.futures.ProcessPoolExecutor(workers) as pool,
+        ):
+            work = functools.partial(_multiply_viewing_distances_in_band, shared_trees.handle, shared_scores.handle)
+            # A band of rows crosses every band of columns, so every row is walked along before any column is.
+            list(pool.map(work, _bands(trees.height, workers * 4), itertools.repeat(range(0))))
+            list(pool.map(work, itertools.repeat(range(0)), _bands(trees.width, workers * 4)))
+            with shm.attach(shared_scores.handle) as scores:
+                return max(scores[index] for index in trees.indices())
+
+
+def first_star(source: utils.Source = "fixtures/day8.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day8.txt".
+
     Returns:
         int: Number of visible trees from the provided input.
     """
-    forest = Forest("fixtures/day8.txt")
-    return forest.count_visible_trees()
+    with utils.phase("parse"):
+        forest = Forest(source)
+    with utils.phase("reduce"):
+        return forest.count_visible_trees()
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day8.txt", workers: int = 1) -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day8.txt".
+        workers (int, optional): Number of worker processes (see Forest.find_highest_scenic_score()). Defaults to 1.
+
     Returns:
         int: Highest "scenic score" tree from the provided input.
     """
-    forest = Forest("fixtures/day8.txt")
-    return forest.find_highest_scenic_score()
+    with utils.phase("parse"):
+        forest = Forest(source)
+    with utils.phase("reduce"):
+        return forest.find_highest_scenic_score(workers)
+
+
+def solve_both(source: utils.Source = "fixtures/day8.txt", workers: int = 1) -> tuple[int, int]:
+    """
+    Both star solutions, from a single Forest.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day8.txt".
+        workers (int, optional): Number of worker processes (see Forest.find_highest_scenic_score()). Defaults to 1.
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("parse"):
+        forest = Forest(source)
+    with utils.phase("reduce"):
+        return forest.count_visible_trees(), forest.find_highest_scenic_score(workers)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -6,55 +6,37 @@ from typing import Collection, Tuple
 
 from aoc2022 import utils
 
-LEFT = (-1, 0)
-RIGHT = (1, 0)
-UP = (0, -1)
-DOWN = (0, 1)
-UP_LEFT = (-1, -1)
-UP_RIGHT = (1, -1)
-DOWN_LEFT = (-1, 1)
-DOWN_RIGHT = (1, 1)
-CARDINALS = (LEFT, RIGHT, UP, DOWN)
-DIAGONALS = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)
-ALL_DIRECTIONS = CARDINALS + DIAGONALS
+LEFT = utils.pack(-1, 0)
+RIGHT = utils.pack(1, 0)
+UP = utils.pack(0, -1)
+DOWN = utils.pack(0, 1)
+MOTIONS = {"U": UP, "D": DOWN, "L": LEFT, "R": RIGHT}
 
 Coordinates = Tuple[int, int]
 
 
-def _add(coords1: Coordinates, coords2: Coordinates) -> Coordinates:
+def _sign(number: int) -> int:
     """
-    Adds two two-element tuples by adding their positional values together.
-    For example: (1, 2) + (2, 3) = (3, 5).
-
     Args:
-        coords1 (Coordinates): One addend.
-        coords2 (Coordinates): The other addend.
+        number (int): Any number.
 
     Returns:
-        Coordinates: The result of adding each element.
+        int: 1 if it is positive, -1 if it is negative, and 0 if it is 0.
     """
-    return (coords1[0] + coords2[0], coords1[1] + coords2[1])
-
+    return (number > 0) - (number < 0)
 
-def _abs_diff(coords1: Coordinates, coords2: Coordinates) -> Coordinates:
-    """
-    Takes the difference of two two-element tuples and reduces the result to an absolute value descriptor.
-    For either element:
-        If c1 >  c2 -> 1.
-        If c1 == c2 -> 0.
-        If c1 <  c2 -> -1.
 
-    Args:
-        coords1 (Coordinates): One operand.
-        coords2 (Coordinates): The other operand.
-
-    Returns:
-        Coordinates: The absolute value diff of each element.
-    """
-    raw_diff = (coords1[0] - coords2[0], coords1[1] - coords2[1])
-    abs1 = -1 if raw_diff[0] < 0 else 0 if raw_diff[0] == 0 else 1
-    abs2 = -1 if raw_diff[1] < 0 else 0 if raw_diff[1] == 0 else 1
-    return (abs1, abs2)
+# Positions and directions are packed into single ints (see utils.pack()), so moving a knot is one addition and no
+# tuples are created along the way.
+#
+# How a tail moves, keyed by where its parent is relative to it (packed). A tail touching its parent, even diagonally,
+# stays where it is. Otherwise it takes one step towards the parent: straight if they share a row or column, and
+# diagonally if not. A parent can never get more than two steps away in either direction.
+FOLLOW = {
+    utils.pack(d_x, d_y): 0 if max(abs(d_x), abs(d_y)) <= 1 else utils.pack(_sign(d_x), _sign(d_y))
+    for d_x in range(-2, 3)
+    for d_y in range(-2, 3)
+}
 
 
 @dataclasses.dataclass
@@ -63,12 +45,12 @@ class Knot:
     Base class for all things that act like a Knot.
     """
 
-    _position: Coordinates = (0, 0)
+    _position: int = 0
 
-    def get_position(self) -> Coordinates:
+    def get_position(self) -> int:
         """
         Returns:
-            Coordinates: This knot's current position.
+            int: This knot's current position, packed.
         """
         return self._position
 
@@ -79,16 +61,16 @@ class Head(Knot):
     Head represents the head knot of the rope.
     """
 
-    _position: Coordinates = (0, 0)
+    _position: int = 0
 
-    def move(self, direction: Coordinates):
+    def move(self, direction: int):
         """
         Moves this head in the given direction.
 
         Args:
-            direction (Coordinates): The direction to move.
+            direction (int): The direction to move, packed.
         """
-        self._position = _add(self._position, direction)
+        self._position += direction
 
 
 @dataclasses.dataclass
@@ -99,46 +81,39 @@ class Tail(Knot):
     """
 
     _parent: Knot = None
-    _visited: set(Coordinates) = None
-    _position: Coordinates = (0, 0)
+    _visited: set[int] = None
+    _position: int = 0
+    _moves: int = 0
 
     def __init__(self, parent: Knot):
         super().__init__()
         self._parent = parent
-        self._visited = {(0, 0)}
-
-    def _move(self):
-        parent_position = self._parent.get_position()
-
-        # Is this tail touching its parent?
-        for cmp_direction in ALL_DIRECTIONS:
-            if _add(self._position, cmp_direction) == parent_position:
-                return
-
-        # If not, are they two steps away in a straight direction? If so, move tail one step that direction.
-        for cmp_direction in CARDINALS:
-            if _add(_add(self._position, cmp_direction), cmp_direction) == parent_position:
-                self._position = _add(self._position, cmp_direction)
-                return
-
-        # Otherwise, move tail one step diagonally to keep up.
-        best_direction = _abs_diff(parent_position, self._position)
-        self._position = _add(self._position, best_direction)
+        self._visited = {self._position}
 
     def move(self):
         """
-        Moves this tail according to where it's currently located relative to its parent, then logs its location
-        afterwards.
+        Moves this tail according to where it's currently located relative to its parent (see FOLLOW), then logs its
+        location afterwards.
         """
-        self._move()
-        self._visited.add(self._position)
+        step = FOLLOW[self._parent.get_position() - self._position]
+        if step:
+            self._position += step
+            self._visited.add(self._position)
+            self._moves += 1
+
+    def get_moves(self) -> int:
+        """
+        Returns:
+            int: The number of times this tail has actually moved.
+        """
+        return self._moves
 
     def get_visitations(self) -> Collection[Coordinates]:
         """
         Returns:
             Collection[Coordinates]: A set of all coordinates this tail has touched.
         """
-        return self._visited
+        return utils.unpack_all(self._visited)
 
 
 class RopeGrid:
@@ -150,24 +125,26 @@ class RopeGrid:
     _turns: int
     _tails: list(Coordinates)
 
-    def __init__(self, path: str, tails: int = 1):
+    def __init__(self, source: utils.Source, tails: int = 1):
         self._head = Head()
         self._turns = 0
         self._num_tails = tails
         self._tails = []
-        for line in utils.lines(path):
+        for line in utils.lines(source):
             direction, times = line.split()
-            direction = {"U": UP, "D": DOWN, "L": LEFT, "R": RIGHT}[direction]
+            direction = MOTIONS[direction]
             times = int(times)
             for _ in range(times):
                 self.move(direction)
+        if (counts := utils.operations()) is not None:
+            counts.update(knot_moves=sum(tail.get_moves() for tail in self._tails))
 
-    def move(self, direction: Coordinates):
+    def move(self, direction: int):
         """
         Move the head in the provided direction. The tail will follow according to the rules of its movement.
 
         Args:
-            direction (Coordinates): The direction to move the head.
+            direction (int): The direction to move the head, packed.
         """
         # First, move head in direction.
         self._head.move(direction)
@@ -194,30 +171,54 @@ class RopeGrid:
         return self._tails[tail_number].get_visitations()
 
 
-def first_star() -> int:
+def first_star(source: utils.Source = "fixtures/day9.txt") -> int:
     """
     First star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day9.txt".
+
     Returns:
         int: The number of unique grid spaces the tail has visited.
     """
-    grid = RopeGrid("fixtures/day9.txt")
+    with utils.phase("simulate"):
+        grid = RopeGrid(source)
     tail_visitations = grid.get_tail_visitations()
     return len(tail_visitations)
 
 
-def second_star() -> int:
+def second_star(source: utils.Source = "fixtures/day9.txt") -> int:
     """
     Second star solution.
 
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day9.txt".
+
     Returns:
         int: The number of unique grid spaces the ninth tail has visited.
     """
-    grid = RopeGrid("fixtures/day9.txt", 9)
+    with utils.phase("simulate"):
+        grid = RopeGrid(source, 9)
     tail_visitations = grid.get_tail_visitations(8)
     return len(tail_visitations)
 
 
+def solve_both(source: utils.Source = "fixtures/day9.txt") -> tuple[int, int]:
+    """
+    Both star solutions, from a single simulation of a ten-knot rope. The first tail of a longer rope moves exactly
+    like the tail of a two-knot rope, since each knot only follows the one ahead of it.
+
+    Args:
+        source (utils.Source, optional): The puzzle input (see utils.Source). Defaults to "fixtures/day9.txt".
+
+    Returns:
+        tuple[int, int]: The first and second star answers.
+    """
+    with utils.phase("simulate"):
+        grid = RopeGrid(source, 9)
+    return len(grid.get_tail_visitations(0)), len(grid.get_tail_visitations(8))
+
+
 if __name__ == "__main__":  # pragma: no cover
     print(first_star())
     print(second_star())
@@ -0,0 +1,396 @@
+"""
+Synthetic puzzle input generators. Each generator produces a valid input for its day at any requested size, so the
+solutions can be exercised well beyond the size of the real fixtures.
+
+Usage: python -m aoc2022.generators DAY SIZE [--seed SEED] [--output PATH]
+"""
+import argparse
+import json
+import random
+import string
+import sys
+from typing import Callable, Iterator, Optional
+
+LETTERS = string.ascii_lowercase + string.ascii_uppercase
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23)
+
+
+def elves(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 1: calorie lists for <size> Elves, separated by blank lines.
+
+    Args:
+        size (int): Number of Elves.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for elf in range(size):
+        if elf:
+            yield ""
+        for _ in range(rng.randint(1, 15)):
+            yield str(rng.randint(1000, 60000))
+
+
+def strategy_guide(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 2: a strategy guide of <size> rounds.
+
+    Args:
+        size (int): Number of rounds.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for _ in range(size):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+
+
+def rucksacks(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 3: <size> rucksacks, rounded up to a multiple of three. Each rucksack has exactly one item type in both of its
+    compartments, and each group of three shares exactly one badge item type.
+
+    Every group shuffles the 52 item types into a badge plus three disjoint pools of 17, one per rucksack. A rucksack
+    puts one item type from its pool in both compartments, the badge in its first compartment, and otherwise fills
+    each compartment from its own half of the rest of its pool.
+
+    Args:
+        size (int): Number of rucksacks.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    letters = list(LETTERS)
+    for _ in range(-(-size // 3)):
+        rng.shuffle(letters)
+        badge = letters[0]
+        for pool in (letters[1:18], letters[18:35], letters[35:52]):
+            shared, left_only, right_only = pool[0], pool[1:9], pool[9:]
+            half = rng.randint(4, 16)
+            left = [shared, badge] + rng.choices(left_only, k=half - 2)
+            right = [shared] + rng.choices(right_only, k=half - 1)
+            rng.shuffle(left)
+            rng.shuffle(right)
+            yield "".join(left + right)
+
+
+def section_assignments(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 4: <size> pairs of section assignments.
+
+    Args:
+        size (int): Number of pairs.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for _ in range(size):
+        p1_start, p2_start = rng.randint(1, 99), rng.randint(1, 99)
+        yield f"{p1_start}-{rng.randint(p1_start, 99)},{p2_start}-{rng.randint(p2_start, 99)}"
+
+
+def crate_stacks(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 5: nine stacks of crates followed by <size> moves. The moves are simulated as they are generated so that no
+    move takes more crates than its source stack holds, and no stack is ever emptied.
+
+    Args:
+        size (int): Number of moves.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    stacks = [rng.choices(string.ascii_uppercase, k=rng.randint(1, 8)) for _ in range(9)]
+    for row in range(max(len(stack) for stack in stacks) - 1, -1, -1):
+        yield " ".join(f"[{stack[row]}]" if row < len(stack) else "   " for stack in stacks)
+    yield " " + "   ".join(str(number) for number in range(1, 10)) + " "
+    yield ""
+    heights = [len(stack) for stack in stacks]
+    for _ in range(size):
+        source = rng.choice([index for index, height in enumerate(heights) if height > 1])
+        target = rng.choice([index for index in range(9) if index != source])
+        times = rng.randint(1, min(heights[source] - 1, 30))
+        heights[source] -= times
+        heights[target] += times
+        yield f"move {times} from {source + 1} to {target + 1}"
+
+
+def datastream(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 6: a datastream whose markers both start right after the first <size> characters. Those characters are drawn
+    from "a" and "b" and end with a repeat of the first marker character, so no window before the markers can hold
+    four (let alone fourteen) different characters.
+
+    Args:
+        size (int): Number of characters before the markers (at least one).
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: The single line of the input.
+    """
+    marker = "".join(rng.sample(string.ascii_lowercase[2:], 14))
+    yield "".join(rng.choices("ab", k=size - 1)) + marker[0] + marker
+
+
+def terminal_output(size: int, rng: random.Random, max_depth: int = 32) -> Iterator[str]:
+    """
+    Day 7: a terminal session exploring a filesystem of <size> directories. Half of the directories are created inside
+    the most recently created one, which produces long chains of nested directories down to <max_depth>.
+
+    Args:
+        size (int): Number of directories, including the root.
+        rng (random.Random): Source of randomness.
+        max_depth (int, optional): Deepest allowed nesting. Defaults to 32.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    children = [[] for _ in range(size)]
+    depths = [0]
+    for directory in range(1, size):
+        parent = directory - 1
+        if rng.random() < 0.5 or depths[parent] >= max_depth:
+            parent = rng.randrange(directory)
+            while depths[parent] >= max_depth:
+                parent = rng.randrange(directory)
+        children[parent].append(directory)
+        depths.append(depths[parent] + 1)
+
+    # Walk the tree depth-first without recursion, since the chains can be arbitrarily deep.
+    stack = [(False, 0)]
+    while stack:
+        leaving, directory = stack.pop()
+        if leaving:
+            yield "$ cd .."
+            continue
+        yield f"$ cd {f'd{directory}' if directory else '/'}"
+        yield "$ ls"
+        for child in children[directory]:
+            yield f"dir d{child}"
+        for file in range(rng.randint(1, 4)):
+            yield f"{rng.randint(1000, 300000)} f{file}.{rng.choice(('txt', 'dat', 'log'))}"
+        if directory:
+            stack.append((True, directory))
+        stack.extend((False, child) for child in reversed(children[directory]))
+
+
+def forest(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 8: a <size> by <size> grid of tree heights.
+
+    Args:
+        size (int): Width and height of the forest.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for _ in range(size):
+        yield "".join(rng.choices(string.digits, k=size))
+
+
+def rope_motions(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 9: <size> motions of the head of the rope.
+
+    Args:
+        size (int): Number of motions.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for _ in range(size):
+        yield f"{rng.choice('UDLR')} {rng.randint(1, 19)}"
+
+
+def cpu_program(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 10: a program of <size> instructions.
+
+    Args:
+        size (int): Number of instructions.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for _ in range(size):
+        yield "noop" if rng.random() < 0.3 else f"addx {rng.randint(-20, 20)}"
+
+
+def monkey_notes(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 11: notes on <size> monkeys. Only additions and multiplications by constants are generated; squaring makes
+    worry levels grow exponentially during the first star, which would time the big integers rather than the solution.
+
+    Args:
+        size (int): Number of monkeys (at least two).
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    size = max(size, 2)
+    for monkey in range(size):
+        others = [other for other in range(size) if other != monkey]
+        if monkey:
+            yield ""
+        yield f"Monkey {monkey}:"
+        yield f"  Starting items: {', '.join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))}"
+        yield f"  Operation: new = old {rng.choice(('*', '+'))} {rng.randint(2, 19)}"
+        yield f"  Test: divisible by {PRIMES[monkey % len(PRIMES)]}"
+        yield f"    If true: throw to monkey {rng.choice(others)}"
+        yield f"    If false: throw to monkey {rng.choice(others)}"
+
+
+def heightmap(size: int, rng: random.Random, height: Optional[int] = None) -> Iterator[str]:
+    """
+    Day 12: a heightmap <size> columns wide (at least 27) and <height> rows tall. Elevation ramps from "a" in the first
+    column to "z" in the last two, so stepping right never climbs more than one level; random cells are then sunk into
+    pits. The row holding S and E (which sits one level above "z") is left untouched, which guarantees a path from S
+    to E.
+
+    Args:
+        size (int): Width of the heightmap.
+        rng (random.Random): Source of randomness.
+        height (Optional[int], optional): Height of the heightmap. Defaults to <size>.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    width = max(size, 27)
+    height = height or width
+    ramp = [string.ascii_lowercase[col * 25 // (width - 2)] for col in range(width - 1)] + ["z"]
+    path_row = rng.randrange(height)
+    for row in range(height):
+        if row == path_row:
+            yield "S" + "".join(ramp[1:-1]) + "E"
+            continue
+        yield "".join(
+            string.ascii_lowercase[rng.randint(0, ord(char) - ord("a"))] if rng.random() < 0.3 else char
+            for char in ramp
+        )
+
+
+def _packet(rng: random.Random, depth: int) -> list:
+    """
+    Args:
+        rng (random.Random): Source of randomness.
+        depth (int): How many more levels of lists may be nested inside this one.
+
+    Returns:
+        list: A random packet.
+    """
+    return [
+        _packet(rng, depth - 1) if depth and rng.random() < 0.3 else rng.randint(0, 10)
+        for _ in range(rng.randint(0, 5))
+    ]
+
+
+def packet_pairs(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 13: <size> pairs of packets.
+
+    Args:
+        size (int): Number of pairs.
+        rng (random.Random): Source of randomness.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    for pair in range(size):
+        if pair:
+            yield ""
+        yield json.dumps(_packet(rng, 4), separators=(",", ":"))
+        yield json.dumps(_packet(rng, 4), separators=(",", ":"))
+
+
+GENERATORS: dict[int, Callable[[int, random.Random], Iterator[str]]] = {
+    1: elves,
+    2: strategy_guide,
+    3: rucksacks,
+    4: section_assignments,
+    5: crate_stacks,
+    6: datastream,
+    7: terminal_output,
+    8: forest,
+    9: rope_motions,
+    10: cpu_program,
+    11: monkey_notes,
+    12: heightmap,
+    13: packet_pairs,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> Iterator[str]:
+    """
+    Generates the lines of an input for the given day. The same day, size and seed always produce the same input.
+
+    Args:
+        day (int): Day number.
+        size (int): Size of the input; its meaning depends on the day (see the individual generators).
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Yields:
+        Iterator[str]: Lines of the input.
+    """
+    yield from GENERATORS[day](size, random.Random(seed))
+
+
+def write(day: int, size: int, path: str, seed: int = 0):
+    """
+    Writes a generated input for the given day to a file.
+
+    Args:
+        day (int): Day number.
+        size (int): Size of the input (see generate()).
+        path (str): Path of the file to write.
+        seed (int, optional): Random seed. Defaults to 0.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for line in generate(day, size, seed):
+            file.write(line + "\n")
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022.generators", description="Generate puzzle inputs.")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS), help="Day number")
+    parser.add_argument("size", type=int, help="Size of the input (its meaning depends on the day)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", help="File to write (default: standard output)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Writes a generated input to a file or standard output.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    if args.output:
+        write(args.day, args.size, args.output, args.seed)
+    else:
+        for line in generate(args.day, args.size, args.seed):
+            sys.stdout.write(line + "\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
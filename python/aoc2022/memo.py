@@ -0,0 +1,248 @@
+"""
+Remembers the answer of each star, so that re-running a day whose code and input have not changed is just a lookup.
+
+Answers are only remembered when the AOC2022_MEMO_DIR environment variable names a directory (the runner's --memo
+option sets it). Each entry is a small JSON file keyed on the day, the star, a hash of the input file's contents, and a
+hash of the source of the day's module along with every aoc2022 module it uses, directly or not, so changing any of
+them misses. Once the entries exceed AOC2022_MEMO_SIZE bytes (4 MiB by default), the least recently used are evicted.
+
+Usage:
+    python -m aoc2022.memo [--dir DIR] list
+    python -m aoc2022.memo [--dir DIR] clear [--days N ...]
+"""
+import argparse
+import dataclasses
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import types
+from typing import Iterable, Iterator, Optional, Self
+
+from aoc2022 import cache
+
+MEMO_DIR_ENV = "AOC2022_MEMO_DIR"
+MEMO_SIZE_ENV = "AOC2022_MEMO_SIZE"
+DEFAULT_MEMO_SIZE = 4 << 20
+SUFFIX = ".json"
+
+
+def memo_dir() -> Optional[pathlib.Path]:
+    """
+    Returns:
+        Optional[pathlib.Path]: The memo directory, or None if answers are not being remembered.
+    """
+    directory = os.environ.get(MEMO_DIR_ENV)
+    return pathlib.Path(directory) if directory else None
+
+
+def source_digest(module: types.ModuleType) -> str:
+    """
+    Hashes the source of a module together with every other aoc2022 module it imports, or imports anything from,
+    directly or through other aoc2022 modules, since a change to e.g. aoc2022.utils (or anything it uses) can change a
+    day's answer just as well.
+
+    Args:
+        module (types.ModuleType): A day module.
+
+    Returns:
+        str: A hash of the sources, as 32 hexadecimal digits.
+    """
+    names, pending = set(), [module.__name__]
+    while pending:
+        name = pending.pop()
+        if name in names:
+            continue
+        names.add(name)
+        for value in vars(sys.modules[name]).values():
+            used = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            if isinstance(used, str) and used.startswith(f"{__package__}."):
+                pending.append(used)
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(names):
+        digest.update(f"{name}\0{cache.file_digest(inspect.getfile(sys.modules[name]))}\0".encode())
+    return digest.hexdigest()
+
+
+@dataclasses.dataclass(frozen=True)
+class Key:
+    """
+    What an answer is remembered by: the star, the source of its day (as hashed by source_digest()), and its input,
+    with a hash of the input's contents.
+    """
+
+    day: int
+    star: int | str
+    source: str
+    path: str
+    contents: str
+
+    @classmethod
+    def for_input(cls, day: int, star: int | str, source: str, path: str | os.PathLike) -> Self:
+        """
+        Hashes the input once, so that looking an answer up and remembering it afterwards file it under the same
+        contents, even if the input changes in between.
+
+        Args:
+            day (int): Day number.
+            star (int | str): Star number (1 or 2), or "both".
+            source (str): Hash of the day's source (see source_digest()).
+            path (str | os.PathLike): Path of the input.
+
+        Raises:
+            OSError: If the input cannot be read.
+
+        Returns:
+            Self: The key.
+        """
+        return cls(day, star, source, str(path), cache.file_digest(path))
+
+    def entry(self, directory: pathlib.Path) -> pathlib.Path:
+        """
+        Args:
+            directory (pathlib.Path): The memo directory.
+
+        Returns:
+            pathlib.Path: Path of the entry for this key.
+        """
+        return directory / f"day{self.day}.star{self.star}.{self.source}.{self.contents}{SUFFIX}"
+
+
+def lookup(key: Key) -> Optional[dict]:
+    """
+    Args:
+        key (Key): The star, source and input to look up.
+
+    Returns:
+        Optional[dict]: The remembered entry (see record()), or None if there is none or answers are not being
+            remembered.
+    """
+    directory = memo_dir()
+    if directory is None:
+        return None
+    entry = key.entry(directory)
+    try:
+        remembered = json.loads(entry.read_text("utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    os.utime(entry)
+    return remembered
+
+
+def record(key: Key, answer: int | str | list | None, wall: float):
+    """
+    Remembers an answer, if answers are being remembered. The entry is written to a temporary file first, so other
+    processes never see half an entry.
+
+    Args:
+        key (Key): The star, source and input the answer is for.
+        answer (int | str | list | None): The star's answer (both answers, when solving both stars at once).
+        wall (float): How long the star took to find it, in seconds.
+    """
+    directory = memo_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    remembered = {
+        "day": key.day,
+        "star": key.star,
+        "answer": answer,
+        "input": key.path,
+        "wall": wall,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        json.dump(remembered, file)
+    os.replace(temporary, key.entry(directory))
+    cache.evict(directory, int(os.environ.get(MEMO_SIZE_ENV, DEFAULT_MEMO_SIZE)), SUFFIX)
+
+
+def entries(directory: pathlib.Path) -> Iterator[tuple[pathlib.Path, dict]]:
+    """
+    Args:
+        directory (pathlib.Path): The memo directory.
+
+    Yields:
+        Iterator[tuple[pathlib.Path, dict]]: The path and contents of every readable entry, by day and star.
+    """
+    found = []
+    for entry in directory.glob(f"day*{SUFFIX}"):
+        try:
+            found.append((entry, json.loads(entry.read_text("utf-8"))))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    yield from sorted(found, key=lambda item: (item[1]["day"], str(item[1]["star"])))
+
+
+def clear(directory: pathlib.Path, days: Optional[Iterable[int]] = None) -> int:
+    """
+    Forgets remembered answers.
+
+    Args:
+        directory (pathlib.Path): The memo directory.
+        days (Optional[Iterable[int]], optional): Only forget the answers for these days. Defaults to every day.
+
+    Returns:
+        int: Number of entries deleted.
+    """
+    patterns = [f"day{day}.*{SUFFIX}" for day in days] if days else [f"*{SUFFIX}"]
+    deleted = 0
+    for pattern in patterns:
+        for entry in directory.glob(pattern):
+            entry.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022.memo", description="Inspect or clear remembered answers.")
+    parser.add_argument(
+        "--dir", default=os.environ.get(MEMO_DIR_ENV), help=f"Memo directory (default: ${MEMO_DIR_ENV})"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List the remembered answers")
+    clear_parser = commands.add_parser("clear", help="Forget remembered answers")
+    clear_parser.add_argument("--days", nargs="+", type=int, help="Only forget the answers for these days")
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error(f"no memo directory; pass --dir or set {MEMO_DIR_ENV}")
+    return args
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Lists or clears the remembered answers.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    directory = pathlib.Path(args.dir)
+    if args.command == "clear":
+        print(f"Deleted {clear(directory, args.days) if directory.is_dir() else 0} entries")
+        return
+    print(f"{'day':>4} {'star':>4} {'wall ms':>10}  {'last used':<19}  answer")
+    for entry, remembered in entries(directory) if directory.is_dir() else ():
+        last_used = datetime.datetime.fromtimestamp(entry.stat().st_mtime).isoformat(sep=" ", timespec="seconds")
+        answer = str(remembered["answer"]).replace("\n", "\\n")
+        print(
+            f"{remembered['day']:>4} {remembered['star']:>4} {remembered['wall'] * 1000:>10.2f}  {last_used}  {answer}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
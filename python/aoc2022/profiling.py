@@ -0,0 +1,129 @@
+"""
+Profiles stars with cProfile.
+
+Profiling is only done when the AOC2022_PROFILE_DIR environment variable names a directory (the runner's --profile
+option sets it). Each profiled block writes two files there: <name>.prof, which pstats, snakeviz and the like can read,
+and <name>.collapsed, with one "frame;frame;frame microseconds" line per call stack, which flamegraph.pl and speedscope
+can draw.
+
+cProfile only records which function called which, not whole call stacks, so the collapsed stacks are reconstructed:
+the time a function spends when called from a given caller is shared out between that caller's own stacks in
+proportion to the time each of them spends in the caller. That is a good approximation unless a function behaves very
+differently depending on how its caller was reached.
+"""
+import contextlib
+import cProfile
+import os
+import pathlib
+import pstats
+from typing import Iterator, Optional
+
+PROFILE_DIR_ENV = "AOC2022_PROFILE_DIR"
+
+# Stacks taking less than this many seconds are left out of the collapsed output.
+MIN_STACK_TIME = 1e-6
+
+# A function as pstats identifies it: (file name, line number, function name).
+Function = tuple[str, int, str]
+
+
+def profile_dir() -> Optional[pathlib.Path]:
+    """
+    Returns:
+        Optional[pathlib.Path]: The directory to write profiles to, or None if profiling is turned off.
+    """
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    return pathlib.Path(directory) if directory else None
+
+
+def frame_label(function: Function) -> str:
+    """
+    Args:
+        function (Function): A function as pstats identifies it.
+
+    Returns:
+        str: A short name for the function, safe to use as a frame of a collapsed stack.
+    """
+    filename, line, name = function
+    label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+def collapse(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Reconstructs call stacks from a profile (see the module docstring).
+
+    Args:
+        stats (pstats.Stats): The profile.
+
+    Returns:
+        dict[str, float]: Seconds spent in each call stack, keyed by its frames joined with semicolons, outermost
+            first.
+    """
+    profile = stats.stats
+    callees: dict[Function, dict[Function, float]] = {function: {} for function in profile}
+    for function, (*_, callers) in profile.items():
+        for caller, (*_, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+
+    # Each stack to visit is (its functions, the fraction of the last one's time that is spent on this stack). Calls
+    # from outside the profiled block have no recorded caller, so whatever time a function spends that none of its
+    # callers (other than itself) account for starts a stack of its own.
+    pending = []
+    for function, (*_, total_time, callers) in profile.items():
+        called = sum(cumulative for caller, (*_, cumulative) in callers.items() if caller != function)
+        if total_time and total_time - called >= MIN_STACK_TIME:
+            pending.append(((function,), (total_time - called) / total_time))
+
+    stacks: dict[str, float] = {}
+    while pending:
+        stack, share = pending.pop()
+        function = stack[-1]
+        own_time = profile[function][2]
+        if own_time * share >= MIN_STACK_TIME:
+            key = ";".join(frame_label(frame) for frame in stack)
+            stacks[key] = stacks.get(key, 0.0) + own_time * share
+        for callee, cumulative in callees[function].items():
+            callee_total = profile[callee][3]
+            # Recursion is already accounted for in the outermost call's times.
+            if callee in stack or not callee_total or cumulative * share < MIN_STACK_TIME:
+                continue
+            pending.append(((*stack, callee), share * cumulative / callee_total))
+    return stacks
+
+
+def write_collapsed(stats: pstats.Stats, path: pathlib.Path):
+    """
+    Writes the call stacks of a profile in the "collapsed" format read by flamegraph.pl.
+
+    Args:
+        stats (pstats.Stats): The profile.
+        path (pathlib.Path): Path of the file to write.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for stack, seconds in sorted(collapse(stats).items()):
+            if (microseconds := round(seconds * 1_000_000)) > 0:
+                file.write(f"{stack} {microseconds}\n")
+
+
+@contextlib.contextmanager
+def profiled(name: str) -> Iterator[None]:
+    """
+    Profiles the block if profiling is turned on, writing <name>.prof and <name>.collapsed to the profile directory.
+
+    Args:
+        name (str): Name for the profile files, e.g. "day11.star2".
+    """
+    directory = profile_dir()
+    if directory is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{name}.prof")
+        write_collapsed(pstats.Stats(profiler), directory / f"{name}.collapsed")
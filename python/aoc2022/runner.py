@@ -0,0 +1,390 @@
+"""
+Runs any selection of days and stars, timing each one. Used by "python -m aoc2022".
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import importlib
+import io
+import json
+import os
+import pkgutil
+import re
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Iterable, Iterator, Optional
+
+import aoc2022
+from aoc2022 import cache, memo, profiling, utils
+
+DAY_MODULE = re.compile(r"day(\d+)$")
+# Running "both" solves both stars at once, from a single parse of the input.
+BOTH = "both"
+STARS = {1: "first_star", 2: "second_star", BOTH: "solve_both"}
+INPUT = "fixtures/day{day}.txt"
+TABLE_HEADER = f"{'day':>4} {'star':>4} {'wall ms':>10} {'parse ms':>10} {'solve ms':>10}  answer"
+
+# Set (by the --memory option) to trace the memory each star allocates.
+MEMORY_ENV = "AOC2022_MEMORY"
+# Set (by the --stats option) to count the operations each star reports (see utils.operations()).
+STATS_ENV = "AOC2022_STATS"
+# Number of source lines reported as allocating the most memory.
+TOP_LINES = 5
+MIB = 1 << 20
+
+# run_star() redirects standard output and records phases for the whole process, so stars that share a process (e.g.
+# the server's threads, or the asyncio runner's) are solved one at a time.
+_SOLVING = threading.Lock()
+
+Star = int | str
+Answer = int | str | None | list
+
+
+# One attribute per field of the output.
+@dataclasses.dataclass
+class StarResult:  # pylint: disable=too-many-instance-attributes
+    """
+    The outcome of running a single star, along with how long it took.
+    """
+
+    day: int
+    star: Star
+    answer: Answer
+    wall: float
+    parse: float
+    solve: float
+    error: Optional[str] = None
+    memoized: bool = False
+    phases: dict[str, dict[str, float]] = dataclasses.field(default_factory=dict)
+    memory: Optional[dict] = None
+    stats: Optional[dict[str, int]] = None
+
+    def to_row(self) -> str:
+        """
+        Returns:
+            str: This result as one line of the results table.
+        """
+        if self.error:
+            answer = f"ERROR {self.error}"
+        elif isinstance(self.answer, list):
+            answer = ", ".join(_render(part) for part in self.answer)
+        else:
+            answer = _render(self.answer)
+        if self.memoized:
+            answer += " (memoized)"
+        if self.memory:
+            answer += f" [peak {self.memory['peak'] / MIB:.1f} MiB, max RSS {self.memory['max_rss'] / MIB:.1f} MiB]"
+        if self.stats:
+            answer += " {" + ", ".join(f"{name}={count}" for name, count in self.stats.items()) + "}"
+        timings = " ".join(f"{seconds * 1000:>10.2f}" for seconds in (self.wall, self.parse, self.solve))
+        return f"{self.day:>4} {self.star:>4} {timings}  {answer}"
+
+
+def _render(answer: Answer) -> str:
+    """
+    Args:
+        answer (Answer): A single star's answer.
+
+    Returns:
+        str: The answer as it appears in the results table, where multi-line output is summarised.
+    """
+    if isinstance(answer, str) and "\n" in answer:
+        return f"<{len(answer.splitlines())}-line output>"
+    return str(answer)
+
+
+def discover_days() -> list[int]:
+    """
+    Finds every "dayN" module in the aoc2022 package.
+
+    Returns:
+        list[int]: The day numbers, in ascending order.
+    """
+    found = (DAY_MODULE.match(module.name) for module in pkgutil.iter_modules(aoc2022.__path__))
+    return sorted(int(match.group(1)) for match in found if match)
+
+
+def _to_answer(value: object) -> Answer:
+    """
+    Answers are usually numbers or strings, but some days (e.g. day 10's CRT) return an object that renders the answer.
+    Solving both stars at once returns a tuple of both answers.
+
+    Args:
+        value (object): Whatever the star returned.
+
+    Returns:
+        Answer: A JSON-friendly form of the answer.
+    """
+    if value is None or isinstance(value, (int, str)):
+        return value
+    if isinstance(value, tuple):
+        return [_to_answer(part) for part in value]
+    return str(value)
+
+
+def max_rss() -> int:
+    """
+    Returns:
+        int: The most physical memory this process has used at any one time so far, in bytes.
+    """
+    max_rss_units = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports this in kibibytes, macOS in bytes.
+    return max_rss_units if sys.platform == "darwin" else max_rss_units * 1024
+
+
+@contextlib.contextmanager
+def _tracing_memory() -> Iterator[Optional[utils.MemoryUsage]]:
+    """
+    Traces memory for the duration of the block, if the --memory option was given.
+
+    Yields:
+        Optional[utils.MemoryUsage]: The memory allocated during the block, with a snapshot from the end of its
+            hungriest phase; or None if memory is not being traced.
+    """
+    if not os.environ.get(MEMORY_ENV):
+        yield None
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        with utils.measuring_memory(snapshot=True) as usage:
+            yield usage
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+@contextlib.contextmanager
+def _counting_operations() -> Iterator[Optional[collections.Counter]]:
+    """
+    Counts the operations the star reports for the duration of the block, if the --stats option was given.
+
+    Yields:
+        Iterator[Optional[collections.Counter]]: The number of each operation, or None if they are not being counted.
+    """
+    if not os.environ.get(STATS_ENV):
+        yield None
+        return
+    with utils.counting_operations() as counts:
+        yield counts
+
+
+def _memory_report(usage: utils.MemoryUsage) -> dict:
+    """
+    Args:
+        usage (utils.MemoryUsage): The memory a star allocated.
+
+    Returns:
+        dict: Its peak allocation and the process's high-water RSS (both in bytes), and the source lines that had
+            allocated the most memory at the end of the star's hungriest phase.
+    """
+    top = []
+    if usage.snapshot is not None:
+        snapshot = usage.snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+            ]
+        )
+        for statistic in snapshot.statistics("lineno")[:TOP_LINES]:
+            frame = statistic.traceback[0]
+            line = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            top.append({"line": line, "size": statistic.size, "count": statistic.count})
+    return {"peak": usage.allocated, "max_rss": max_rss(), "top": top}
+
+
+def run_star(day: int, star: Star, source: Optional[utils.Source] = None) -> StarResult:
+    """
+    Runs one star of one day on its puzzle input, recording its wall time and the wall and CPU time of each phase it
+    marks (see utils.phase()). If turned on, it also profiles the star (see aoc2022.profiling), traces the memory it
+    and each of its phases allocate, and counts the operations it reports (see utils.operations()). Anything the
+    star prints is discarded so it cannot interleave with the runner's own output, and only one star runs at a time in
+    a process, whichever thread it is run from. If answers are being remembered (see aoc2022.memo) and neither the
+    day's code nor its input has changed, the remembered answer is returned instead, and the timings are those of the
+    lookup.
+
+    Args:
+        day (int): Day number.
+        star (Star): Star number (1 or 2), or BOTH to solve both stars from a single parse of the input.
+        source (Optional[utils.Source], optional): Puzzle input to run it on. Defaults to the day's fixture. Answers
+            are only remembered for inputs read from a file path that can be read.
+
+    Returns:
+        StarResult: The answer and timings. If the star raised, the error is recorded instead of an answer.
+    """
+    with _SOLVING:
+        module = importlib.import_module(f"aoc2022.day{day}")
+        solution, source = getattr(module, STARS[star]), INPUT.format(day=day) if source is None else source
+        start = time.perf_counter()
+        # Hashing the input reads it, so an input that cannot be read fails here first. The star is run anyway, to
+        # report the error like any other, and its answer is not remembered.
+        try:
+            key = (
+                memo.Key.for_input(day, star, memo.source_digest(module), source)
+                if memo.memo_dir() and utils.is_path(source)
+                else None
+            )
+        except OSError:
+            key = None
+        if key and (remembered := memo.lookup(key)):
+            wall = time.perf_counter() - start
+            return StarResult(day, star, remembered["answer"], wall, 0.0, wall, memoized=True)
+
+        answer, error = None, None
+        with (
+            utils.recording_phases() as phases,
+            contextlib.redirect_stdout(io.StringIO()),
+            _tracing_memory() as usage,
+            _counting_operations() as counts,
+        ):
+            start = time.perf_counter()
+            try:
+                with profiling.profiled(f"day{day}.star{star}"):
+                    answer = _to_answer(solution(source))
+            # One failing star should be reported alongside the others rather than abort the whole run.
+            except Exception as exc:  # pylint: disable=broad-except
+                error = f"{type(exc).__name__}: {exc}"
+            wall = time.perf_counter() - start
+        parse = phases["parse"].wall if "parse" in phases else 0.0
+        if key and error is None:
+            memo.record(key, answer, wall)
+        phase_times = {
+            name: {"wall": times.wall, "cpu": times.cpu, "calls": times.calls} for name, times in phases.items()
+        }
+        stats = None if counts is None else dict(sorted(counts.items()))
+        if usage is None:
+            return StarResult(day, star, answer, wall, parse, wall - parse, error, phases=phase_times, stats=stats)
+        for name, times in phases.items():
+            phase_times[name]["peak"] = times.peak
+        memory = _memory_report(usage)
+        return StarResult(
+            day, star, answer, wall, parse, wall - parse, error, phases=phase_times, memory=memory, stats=stats
+        )
+
+
+def run(
+    days: Iterable[int], stars: Iterable[Star], workers: int = 1, source: Optional[str] = None
+) -> Iterator[StarResult]:
+    """
+    Runs every requested star of every requested day. With more than one worker, the stars are spread across a process
+    pool and yielded in the order they finish.
+
+    Args:
+        days (Iterable[int]): Day numbers to run.
+        stars (Iterable[Star]): Stars to run for each day (see run_star()).
+        workers (int, optional): Number of worker processes. Defaults to 1, which runs everything in this process.
+        source (Optional[str], optional): Path of the puzzle input, or utils.STDIN. Defaults to each day's fixture.
+
+    Yields:
+        Iterator[StarResult]: The result of each star as it completes.
+    """
+    jobs = [(day, star) for day in days for star in stars]
+    # Worker processes cannot read this process's standard input.
+    if workers <= 1 or source == utils.STDIN:
+        for day, star in jobs:
+            yield run_star(day, star, source)
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_star, day, star, source) for day, star in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def parse_star(value: str) -> Star:
+    """
+    Args:
+        value (str): A star as given on the command line.
+
+    Returns:
+        Star: The star number, or BOTH.
+    """
+    return BOTH if value == BOTH else int(value)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022", description="Run and time Advent of Code solutions.")
+    parser.add_argument("days", nargs="*", type=int, help="Day numbers to run (default: every day)")
+    parser.add_argument(
+        "--stars",
+        nargs="+",
+        type=parse_star,
+        choices=list(STARS),
+        default=[1, 2],
+        help=f"Stars to run (default: 1 2); {BOTH} solves both from a single parse of the input",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--format", choices=("table", "json"), default="table", help="Output format")
+    parser.add_argument("--cache-dir", help="Cache parsed inputs in this directory (see aoc2022.cache)")
+    parser.add_argument("--memo", metavar="DIR", help="Remember answers in this directory (see aoc2022.memo)")
+    parser.add_argument(
+        "--profile", metavar="DIR", help="Profile each star into this directory (see aoc2022.profiling)"
+    )
+    parser.add_argument(
+        "--memory", action="store_true", help="Trace the memory allocated by each star and phase (slows them down)"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="Count the operations (comparisons, moves, ...) each star reports"
+    )
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help=f"Puzzle input to use instead of the fixture, or {utils.STDIN} for standard input",
+    )
+    args = parser.parse_args(argv)
+    if args.input and len(args.days) != 1:
+        parser.error("--input needs exactly one day")
+    if args.input == utils.STDIN and len(args.stars) != 1:
+        parser.error(f"standard input can only be read once, so --input - needs exactly one star (or {BOTH})")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the requested stars and streams a table row or JSON line for each one as it completes.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status; 1 if any star raised an error.
+    """
+    args = parse_args(argv)
+    # These are set through the environment so that worker processes use them too.
+    if args.cache_dir:
+        os.environ[cache.CACHE_DIR_ENV] = args.cache_dir
+    if args.memo:
+        os.environ[memo.MEMO_DIR_ENV] = args.memo
+    if args.profile:
+        os.environ[profiling.PROFILE_DIR_ENV] = args.profile
+    if args.memory:
+        os.environ[MEMORY_ENV] = "1"
+    if args.stats:
+        os.environ[STATS_ENV] = "1"
+    failed = False
+    if args.format == "table":
+        print(TABLE_HEADER)
+    for result in run(args.days or discover_days(), args.stars, args.workers, args.input):
+        failed = failed or result.error is not None
+        if args.format == "table":
+            print(result.to_row())
+            for line in result.memory["top"] if result.memory else ():
+                print(f"{'':>10}{line['size'] / 1024:>10.1f} KiB in {line['count']} blocks at {line['line']}")
+        else:
+            print(json.dumps(dataclasses.asdict(result)))
+        sys.stdout.flush()
+    return 1 if failed else 0
@@ -0,0 +1,306 @@
+"""
+A solver daemon that keeps every day imported and serves requests over a Unix domain socket, so that solving a small
+input takes about as long as the solve itself rather than an interpreter start-up and a round of imports.
+
+Requests and responses are JSON objects, one per line, and a connection can carry any number of them in turn. A request
+names the day, the star (1, 2 or "both") and optionally the absolute path of the input (the day's fixture if left out):
+
+    {"day": 1, "star": 2, "input": "/home/me/inputs/day1.txt"}
+
+and the response is the star's result as the runner reports it (see runner.StarResult), or {"error": "..."} for a
+request that cannot be run. Since the protocol is plain text, anything that can write to a Unix socket is a client:
+
+    echo '{"day": 1, "star": 1}' | nc -U "$AOC2022_SOCKET"
+
+Stars are solved one at a time, however many clients are connected. With --memory-cache, parsed inputs are also kept
+in memory between requests (see aoc2022.cache).
+
+Usage:
+    python -m aoc2022.server serve [--socket PATH] [--memory-cache BYTES]
+    python -m aoc2022.server solve [DAY ...] [--stars STAR ...] [--input FILE] [--socket PATH] [--format FORMAT]
+"""
+import argparse
+import contextlib
+import dataclasses
+import functools
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from typing import IO, Iterable, Optional
+
+from aoc2022 import cache, runner, utils
+
+SOCKET_ENV = "AOC2022_SOCKET"
+
+
+def socket_path() -> str:
+    """
+    Returns:
+        str: The path of the server's socket: $AOC2022_SOCKET, or a per-user path in the temporary directory.
+    """
+    return os.environ.get(SOCKET_ENV) or os.path.join(tempfile.gettempdir(), f"aoc2022-{os.getuid()}.sock")
+
+
+@functools.cache
+def _days() -> frozenset[int]:
+    """
+    Returns:
+        frozenset[int]: The day numbers, found once rather than on every request.
+    """
+    return frozenset(runner.discover_days())
+
+
+def _is_int(value: object) -> bool:
+    """
+    Args:
+        value (object): A decoded JSON value.
+
+    Returns:
+        bool: Whether it is a plain integer. JSON's true and false decode to True and False, and 1.0 to a float, which
+            are all equal to integers but are not days or stars.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def respond(request: dict) -> dict:
+    """
+    Runs one request.
+
+    Args:
+        request (dict): The day, star and (optionally) input path to solve.
+
+    Returns:
+        dict: The star's result (see runner.StarResult), or {"error": ...} if the request is invalid.
+    """
+    day, star, source = request.get("day"), request.get("star"), request.get("input")
+    if not _is_int(day) or day not in _days():
+        return {"error": f"No such day: {day!r}"}
+    if not (_is_int(star) or star == runner.BOTH) or star not in runner.STARS:
+        return {"error": f"No such star: {star!r}"}
+    # The server's standard input is not the client's, and relative paths would be relative to the server.
+    if source is not None and (not isinstance(source, str) or not os.path.isabs(source)):
+        return {"error": f"The input must be an absolute path: {source!r}"}
+    return dataclasses.asdict(runner.run_star(day, star, source))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """
+    Answers each request line of a connection with a response line.
+    """
+
+    @staticmethod
+    def _respond(request: object) -> dict:
+        """
+        Args:
+            request (object): A decoded request line.
+
+        Returns:
+            dict: The response (see respond()), or {"error": ...} if the request could not be answered at all.
+        """
+        if not isinstance(request, dict):
+            return {"error": "Expected a JSON object"}
+        try:
+            return respond(request)
+        # Whatever goes wrong with one request, the connection should carry on with the next.
+        except Exception as exc:  # pylint: disable=broad-except
+            return {"error": f"{type(exc).__name__}: {exc}"}
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                response = {"error": f"Invalid JSON: {exc}"}
+            else:
+                response = self._respond(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    """
+    The solver daemon. Each connection is served by a thread of its own, and every day module is imported up front.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the socket to listen on. A socket left behind by a server that is no longer running is
+                replaced.
+
+        Raises:
+            OSError: If another server is already listening on the path, or something other than a socket is there.
+        """
+        for day in _days():
+            importlib.import_module(f"aoc2022.day{day}")
+        if os.path.exists(path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(path) == 0:
+                    raise OSError(f"A server is already listening on {path}")
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise OSError(f"{path} is not a socket")
+            os.unlink(path)
+        super().__init__(path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)
+
+
+class Client:
+    """
+    A connection to the server, which can send any number of requests.
+    """
+
+    _socket: socket.socket
+    _file: IO[bytes]
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (Optional[str], optional): Path of the server's socket. Defaults to socket_path().
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.connect(path or socket_path())
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+        self._file.close()
+        self._socket.close()
+
+    def solve(self, day: int, star: runner.Star, source: Optional[str] = None) -> dict:
+        """
+        Args:
+            day (int): Day number.
+            star (runner.Star): Star number (1 or 2), or runner.BOTH.
+            source (Optional[str], optional): Path of the puzzle input. Defaults to the day's fixture.
+
+        Returns:
+            dict: The star's result (see runner.StarResult), or {"error": ...} if the server rejected the request.
+        """
+        request = {"day": day, "star": star}
+        if source is not None:
+            request["input"] = os.path.abspath(source)
+        self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self._file.flush()
+        return json.loads(self._file.readline())
+
+
+def solve(days: Iterable[int], stars: Iterable[runner.Star], source: Optional[str], path: str, output: str) -> int:
+    """
+    Asks the server for each star of each day, printing a table row or JSON line for each one.
+
+    Args:
+        days (Iterable[int]): Day numbers.
+        stars (Iterable[runner.Star]): Stars to run for each day.
+        source (Optional[str]): Path of the puzzle input, or None for each day's fixture.
+        path (str): Path of the server's socket.
+        output (str): "table" or "json".
+
+    Returns:
+        int: Exit status; 1 if any request failed.
+    """
+    failed = False
+    if output == "table":
+        print(runner.TABLE_HEADER)
+    with Client(path) as client:
+        for day in days:
+            for star in stars:
+                result = client.solve(day, star, source)
+                failed = failed or result["error"] is not None
+                if output == "json":
+                    print(json.dumps(result))
+                elif "day" in result:
+                    print(runner.StarResult(**result).to_row())
+                else:
+                    print(f"{day:>4} {star:>4}  ERROR {result['error']}")
+    return 1 if failed else 0
+
+
+def _terminate(*_):
+    """
+    Signal handler that exits the server.
+
+    Raises:
+        SystemExit: Always.
+    """
+    raise SystemExit(0)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses arguments.
+
+    Args:
+        argv (Optional[list[str]], optional): Arguments to parse. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: Argument namespace.
+    """
+    parser = argparse.ArgumentParser(prog="python -m aoc2022.server", description="Serve solutions over a socket.")
+    parser.add_argument("--socket", default=socket_path(), help=f"Path of the socket (default: ${SOCKET_ENV})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run the server")
+    serve.add_argument("--memory-cache", type=int, metavar="BYTES", help="Keep parsed inputs in memory, up to BYTES")
+    client = commands.add_parser("solve", help="Ask the server to solve stars")
+    client.add_argument("days", nargs="*", type=int, help="Day numbers to run (default: every day)")
+    client.add_argument("--stars", nargs="+", type=runner.parse_star, choices=list(runner.STARS), default=[1, 2])
+    client.add_argument("--input", metavar="FILE", help="Puzzle input to use instead of the fixture")
+    client.add_argument("--format", choices=("table", "json"), default="table", help="Output format")
+    args = parser.parse_args(argv)
+    if args.command == "solve" and args.input and len(args.days) != 1:
+        parser.error("--input needs exactly one day")
+    if args.command == "solve" and args.input == utils.STDIN:
+        parser.error("the server cannot read the client's standard input")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the server, or asks it to solve stars.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Exit status.
+    """
+    args = parse_args(argv)
+    if args.command == "solve":
+        return solve(args.days or runner.discover_days(), args.stars, args.input, args.socket, args.format)
+    if args.memory_cache:
+        os.environ[cache.CACHE_MEMORY_ENV] = str(args.memory_cache)
+    # Being terminated should close the server (and remove its socket) just like Ctrl-C does.
+    signal.signal(signal.SIGTERM, _terminate)
+    with Server(args.socket) as server:
+        print(f"Listening on {args.socket}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Shares grids and other flat buffers of numbers between processes without copying them.
+
+The process that owns the data copies it once into a block of shared memory (see multiprocessing.shared_memory) with
+share() or share_grid(), and hands the block's handle, which is small and picklable, to its workers. Each worker
+attaches to the block with attach() or attach_grid() and reads it in place, rather than unpickling a copy of its own.
+The owner removes the block when it is closed, so use it as a context manager, around the workers:
+
+    with shm.share_grid(grid) as shared, concurrent.futures.ProcessPoolExecutor() as pool:
+        results = list(pool.map(functools.partial(work, shared.handle), bands))
+
+Views of a block are only valid while it is attached, so copy anything that must outlive the with block.
+"""
+import array
+import contextlib
+import dataclasses
+from multiprocessing import shared_memory
+from typing import Iterator
+
+from aoc2022 import utils
+
+# Anything that can be shared: a contiguous buffer of numbers.
+Buffer = bytes | bytearray | memoryview | array.array
+
+
+@dataclasses.dataclass(frozen=True)
+class Handle:
+    """
+    What a worker needs to attach to a shared buffer: the name of its block of shared memory, the size of the buffer in
+    bytes (the block may be larger) and the struct format of its items, as used by memoryview.cast().
+    """
+
+    name: str
+    size: int
+    format: str = "B"
+
+
+@dataclasses.dataclass(frozen=True)
+class GridHandle(Handle):
+    """
+    A handle to a shared utils.Grid: a buffer of its cells, border included, with the grid's dimensions and padding.
+    """
+
+    width: int = 0
+    height: int = 0
+    padding: int = 0
+
+
+class Shared:
+    """
+    A block of shared memory owned by this process. Closing it removes the block: workers that are still attached keep
+    their views until they detach, but no more workers can attach.
+    """
+
+    handle: Handle
+    _memory: shared_memory.SharedMemory
+
+    def __init__(self, memory: shared_memory.SharedMemory, handle: Handle):
+        """
+        Args:
+            memory (shared_memory.SharedMemory): The block, which now belongs to this object.
+            handle (Handle): The handle workers attach with.
+        """
+        self._memory = memory
+        self.handle = handle
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Detaches from the block and removes it.
+        """
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _copy(data: memoryview) -> shared_memory.SharedMemory:
+    """
+    Args:
+        data (memoryview): A contiguous buffer.
+
+    Returns:
+        shared_memory.SharedMemory: A new block of shared memory holding a copy of the buffer.
+    """
+    # A block cannot be empty, even if the buffer is.
+    memory = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    memory.buf[: data.nbytes] = data.cast("B")
+    return memory
+
+
+def share(data: Buffer) -> Shared:
+    """
+    Copies a buffer into shared memory.
+
+    Args:
+        data (Buffer): A contiguous buffer, e.g. an array.array. Workers see items of the same type.
+
+    Returns:
+        Shared: The owner of the shared copy.
+    """
+    view = memoryview(data)
+    memory = _copy(view)
+    return Shared(memory, Handle(memory.name, view.nbytes, view.format))
+
+
+def share_grid(grid: utils.Grid) -> Shared:
+    """
+    Copies a grid's cells into shared memory.
+
+    Args:
+        grid (utils.Grid): The grid.
+
+    Returns:
+        Shared: The owner of the shared copy, whose handle is a GridHandle.
+    """
+    memory = _copy(memoryview(grid.cells))
+    return Shared(memory, GridHandle(memory.name, len(grid.cells), "B", grid.width, grid.height, grid.padding))
+
+
+@contextlib.contextmanager
+def attach(handle: Handle) -> Iterator[memoryview]:
+    """
+    Attaches to a shared buffer. Any views of it (e.g. slices) must be released before leaving the block.
+
+    Args:
+        handle (Handle): The buffer's handle (see Shared.handle).
+
+    Raises:
+        FileNotFoundError: If the block has already been removed.
+
+    Yields:
+        Iterator[memoryview]: The buffer, in place, as items of its format.
+    """
+    memory = shared_memory.SharedMemory(handle.name)
+    try:
+        with memory.buf[: handle.size] as data, data.cast(handle.format) as view:
+            yield view
+    finally:
+        memory.close()
+
+
+@contextlib.contextmanager
+def attach_grid(handle: GridHandle) -> Iterator[utils.Grid]:
+    """
+    Attaches to a shared grid (see attach()).
+
+    Args:
+        handle (GridHandle): The grid's handle (see Shared.handle).
+
+    Yields:
+        Iterator[utils.Grid]: A grid whose cells are the shared block, in place.
+    """
+    with attach(handle) as cells:
+        yield utils.Grid.from_cells(cells, handle.width, handle.height, handle.padding)
@@ -0,0 +1,181 @@
+"""
+Streaming quantile sketches, for summarising more numbers than can be kept and sorted.
+
+A QuantileSketch is a DDSketch (Masson, Rim and Lee, 2019): each number is counted in a bucket of numbers within a
+fixed relative distance of each other, so any quantile can be estimated to within that relative accuracy from the
+bucket counts alone. The number of buckets grows only with the logarithm of the range of the numbers (about 1,000 at
+1% accuracy for numbers from 1 to 10**9), and it is capped: past the cap, the lowest buckets are merged, giving up
+accuracy at the bottom of the range rather than the top.
+
+Sketches with the same accuracy can be merged exactly, so a large input can be split between workers, each summarising
+its part, and the parts' sketches merged into the sketch of the whole.
+"""
+import itertools
+import math
+from typing import Iterable, Optional, Self
+
+# How far an estimated quantile may be from the true one, relative to it.
+DEFAULT_ACCURACY = 0.01
+# The most buckets a sketch keeps.
+DEFAULT_MAX_BUCKETS = 2048
+
+
+# The exact statistics are kept alongside the buckets and the parameters that place numbers in them.
+class QuantileSketch:  # pylint: disable=too-many-instance-attributes
+    """
+    A mergeable summary of non-negative numbers, in bounded memory. Besides quantiles, it keeps the exact count, total,
+    minimum and maximum of the numbers it has seen.
+    """
+
+    relative_accuracy: float
+    max_buckets: int
+    count: int
+    total: float
+    minimum: Optional[float]
+    maximum: Optional[float]
+    _gamma: float
+    _log_gamma: float
+    _zeros: int
+    _buckets: dict[int, int]
+
+    def __init__(self, relative_accuracy: float = DEFAULT_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        """
+        Args:
+            relative_accuracy (float, optional): How far an estimated quantile may be from the true one, relative to
+                it. Defaults to DEFAULT_ACCURACY.
+            max_buckets (int, optional): The most buckets to keep. Defaults to DEFAULT_MAX_BUCKETS.
+
+        Raises:
+            ValueError: If the accuracy is not between 0 and 1, or there are no buckets.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"The relative accuracy must be between 0 and 1, not {relative_accuracy}")
+        if max_buckets < 1:
+            raise ValueError(f"A sketch needs at least one bucket, not {max_buckets}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.count = self._zeros = 0
+        self.total = 0
+        self.minimum = self.maximum = None
+        # Bucket i counts the numbers in (gamma ** (i - 1), gamma ** i]; zeros are counted separately.
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = {}
+
+    @property
+    def buckets(self) -> int:
+        """
+        Returns:
+            int: The number of buckets in use, which is what the sketch's memory grows with.
+        """
+        return len(self._buckets)
+
+    def add(self, value: float):
+        """
+        Args:
+            value (float): A number to count.
+
+        Raises:
+            ValueError: If the number is negative.
+        """
+        if value < 0:
+            raise ValueError(f"A sketch only counts non-negative numbers, not {value}")
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if not value:
+            self._zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def update(self, values: Iterable[float]):
+        """
+        Args:
+            values (Iterable[float]): Numbers to count (see add()).
+        """
+        for value in values:
+            self.add(value)
+
+    def _collapse(self):
+        """
+        Merges the lowest buckets into the lowest one that is kept, until there are no more than max_buckets.
+        """
+        keys = sorted(self._buckets)
+        excess = len(keys) - self.max_buckets
+        self._buckets[keys[excess]] += sum(self._buckets.pop(key) for key in keys[:excess])
+
+    def merge(self, other: Self) -> Self:
+        """
+        Adds the numbers counted by another sketch to this one, as if this sketch had counted them itself.
+
+        Args:
+            other (Self): A sketch with the same relative accuracy.
+
+        Raises:
+            ValueError: If the sketches have different accuracies.
+
+        Returns:
+            Self: This sketch.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge a sketch of accuracy {other.relative_accuracy} into one of {self.relative_accuracy}"
+            )
+        if not other.count:
+            return self
+        self.count += other.count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        # The other sketch is a QuantileSketch too, so this is not reaching into another class's internals.
+        self._zeros += other._zeros  # pylint: disable=protected-access
+        for key, count in other._buckets.items():  # pylint: disable=protected-access
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Args:
+            fraction (float): Which quantile, from 0 (the minimum) to 1 (the maximum); e.g. 0.9 for the 90th percentile.
+
+        Raises:
+            ValueError: If the fraction is not between 0 and 1, or the sketch is empty.
+
+        Returns:
+            float: An estimate of the quantile, within the sketch's relative accuracy of the true one unless it fell in
+                a collapsed bucket.
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError(f"A quantile must be between 0 and 1, not {fraction}")
+        if not self.count:
+            raise ValueError("An empty sketch has no quantiles")
+        # How many numbers above the zeros come before the quantile.
+        rank = fraction * (self.count - 1) - self._zeros
+        if rank < 0:
+            return 0
+        keys = sorted(self._buckets)
+        key = next(key for key, seen in zip(keys, itertools.accumulate(map(self._buckets.get, keys))) if rank < seen)
+        # The middle of the bucket, in relative terms, so no number in it is further than the accuracy away.
+        estimate = 2 * self._gamma**key / (self._gamma + 1)
+        return min(max(estimate, self.minimum), self.maximum)
+
+
+def merge_all(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    """
+    Args:
+        sketches (Iterable[QuantileSketch]): At least one sketch, all with the same relative accuracy.
+
+    Returns:
+        QuantileSketch: The first sketch, with all the others merged into it.
+    """
+    sketches = iter(sketches)
+    merged = next(sketches)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -1,8 +1,19 @@
 """
 General helper utilities
 """
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import io
+import mmap
+import os
 import pathlib
-from typing import Iterator
+import sys
+import time
+import tracemalloc
+from typing import IO, Callable, ContextManager, Iterable, Iterator, Optional, Self, TypeVar
 
 # Directional Constants
 # Assuming a 2-dimensional "array", y-coordinates are the rows (the first index), and x-coordinates are the columns.
@@ -13,14 +24,678 @@ LEFT = (0, -1)
 RIGHT = (0, 1)
 DIRS = (UP, DOWN, LEFT, RIGHT)
 
+# Packed coordinates: the point (x, y) as the single int (y << 32) + x, for hot loops where allocating a tuple per
+# point would dominate. Packing is linear, so adding the packed form of a direction moves a packed point, and packed
+# points can be compared, hashed and kept in sets as cheaply as any int. x must stay within -2**31 <= x < 2**31.
+PACK_SHIFT = 32
+_PACK_BIAS = 1 << (PACK_SHIFT - 1)
 
-def lines(path: str) -> Iterator[str]:
+
+def pack(x: int, y: int) -> int:
+    """
+    Args:
+        x (int): x-coordinate.
+        y (int): y-coordinate.
+
+    Returns:
+        int: The packed point.
+    """
+    return (y << PACK_SHIFT) + x
+
+
+def unpack(point: int) -> tuple[int, int]:
+    """
+    Args:
+        point (int): A packed point.
+
+    Returns:
+        tuple[int, int]: Its (x, y) coordinates.
+    """
+    y = (point + _PACK_BIAS) >> PACK_SHIFT
+    return point - (y << PACK_SHIFT), y
+
+
+# DIRS, packed.
+PACKED_DIRS = tuple(pack(d_x, d_y) for d_y, d_x in DIRS)
+
+
+def neighbours(point: int, directions: Iterable[int] = PACKED_DIRS) -> Iterator[int]:
+    """
+    Args:
+        point (int): A packed point.
+        directions (Iterable[int], optional): Packed directions to step in. Defaults to PACKED_DIRS.
+
+    Yields:
+        Iterator[int]: The packed point one step away in each direction.
+    """
+    for direction in directions:
+        yield point + direction
+
+
+def unpack_all(points: Iterable[int]) -> set[tuple[int, int]]:
+    """
+    Args:
+        points (Iterable[int]): Packed points.
+
+    Returns:
+        set[tuple[int, int]]: Their (x, y) coordinates.
+    """
+    return {unpack(point) for point in points}
+
+
+# Number of bytes lines() reads or maps at a time.
+CHUNK_SIZE = 1 << 20
+# Rough number of bytes map_reduce() hands a worker at a time.
+MAP_CHUNK_SIZE = 16 << 20
+
+# Where puzzle input can be read from: the path of a file, an open file (in text or binary mode), or STDIN.
+STDIN = "-"
+Source = str | os.PathLike | IO
+
+# Stack of active recordings made by recording_phases(). phase() adds its time to the innermost one.
+_RECORDINGS: list[dict[str, "PhaseTimes"]] = []
+_NOT_RECORDING = contextlib.nullcontext()
+
+# Stack of active operation counts made by counting_operations(). Solvers add to the innermost one.
+_COUNTINGS: list[collections.Counter] = []
+
+# Memory usage being measured by measuring_memory() or a phase, outermost first.
+_MEASUREMENTS: list["MemoryUsage"] = []
+
+Result = TypeVar("Result")
+Partial = TypeVar("Partial")
+
+
+def _mapped_blocks(buffer: mmap.mmap) -> Iterator[bytes]:
+    """
+    Splits a memory-mapped file into blocks of roughly CHUNK_SIZE bytes, each ending just after a newline (except
+    possibly the last). A line longer than CHUNK_SIZE gets a block to itself.
+
+    Args:
+        buffer (mmap.mmap): The mapped file.
+
+    Yields:
+        Iterator[bytes]: Blocks of whole lines.
+    """
+    start, end = 0, len(buffer)
+    while start < end:
+        stop = buffer.rfind(b"\n", start, start + CHUNK_SIZE)
+        if stop == -1:
+            stop = buffer.find(b"\n", start + CHUNK_SIZE)
+        stop = end if stop == -1 else stop + 1
+        yield buffer[start:stop]
+        start = stop
+
+
+def _streamed_blocks(file: IO) -> Iterator[bytes | str]:
+    """
+    Reads a stream that cannot be memory-mapped (such as a pipe, or a file opened in text mode) CHUNK_SIZE bytes or
+    characters at a time, and re-cuts the chunks into blocks that each end just after a newline (except possibly the
+    last). Whatever follows the last newline in a chunk is carried over to the next block.
+
+    Args:
+        file (IO): The stream to read, in either binary or text mode.
+
+    Yields:
+        Iterator[bytes | str]: Blocks of whole lines, of the same type the stream reads.
+    """
+    pending = []
+    while chunk := file.read(CHUNK_SIZE):
+        stop = chunk.rfind("\n" if isinstance(chunk, str) else b"\n") + 1
+        if not stop:
+            pending.append(chunk)
+            continue
+        # chunk[:0] is an empty str or bytes, whichever the stream reads.
+        yield chunk[:0].join(pending) + chunk[:stop]
+        pending = [chunk[stop:]]
+    if pending and (remainder := pending[0][:0].join(pending)):
+        yield remainder
+
+
+def is_path(source: Source) -> bool:
+    """
+    Args:
+        source (Source): Where to read puzzle input from.
+
+    Returns:
+        bool: Whether the source is the path of a file (rather than standard input or an open file).
     """
-    Reads a file and returns a list of its lines. Optionally accepts a callable, and if provided,
-    applies that callable to all lines.
+    return isinstance(source, (str, os.PathLike)) and source != STDIN
+
+
+def stream(source: Source) -> IO:
+    """
+    Args:
+        source (Source): Standard input or an open file.
+
+    Returns:
+        IO: The stream to read; standard input is read in binary mode if possible.
+    """
+    return getattr(sys.stdin, "buffer", sys.stdin) if source == STDIN else source
+
+
+def _blocks(source: Source) -> Iterator[bytes | str]:
+    """
+    Args:
+        source (Source): Where to read from.
+
+    Yields:
+        Iterator[bytes | str]: Blocks of whole lines: bytes, unless the source is a stream in text mode.
+    """
+    if not is_path(source):
+        yield from _streamed_blocks(stream(source))
+        return
+    with open(source, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files cannot be mapped, and neither can pipes.
+            buffer = None
+        with contextlib.nullcontext() if buffer is None else buffer:
+            yield from _streamed_blocks(file) if buffer is None else _mapped_blocks(buffer)
+
+
+def blocks(source: Source) -> Iterator[bytes]:
+    """
+    Lazily reads a file in blocks of whole lines, for parsers that handle many lines at once. Only a block of about
+    CHUNK_SIZE bytes is held in memory at a time (see lines()).
+
+    Args:
+        source (Source): Where to read from.
+
+    Yields:
+        Iterator[bytes]: Blocks that each end just after a newline (except possibly the last).
+    """
+    for block in _blocks(source):
+        yield block.encode("utf-8") if isinstance(block, str) else block
+
+
+def lines(source: Source, binary: bool = False) -> Iterator[str | bytes]:
+    """
+    Lazily reads the lines of a file, without their line endings. Only a block of about CHUNK_SIZE bytes is held in
+    memory at a time: regular files are memory-mapped, and anything that cannot be mapped (standard input, pipes, open
+    files, empty files) is read in chunks. Blocks always end on a newline, so lines are never split between them.
+
+    Args:
+        source (Source): Where to read the lines from.
+        binary (bool, optional): Yield undecoded bytes rather than UTF-8 strings. Defaults to False.
+
+    Yields:
+        Iterator[str | bytes]: The lines of the file.
+    """
+    for block in _blocks(source):
+        if isinstance(block, str):
+            yield from (line.encode("utf-8") for line in block.splitlines()) if binary else block.splitlines()
+        else:
+            yield from block.splitlines() if binary else block.decode("utf-8").splitlines()
+
+
+def read_text(source: Source) -> str:
+    """
+    Reads the whole of a source at once, for the days whose input is not made of lines.
+
+    Args:
+        source (Source): Where to read from.
+
+    Returns:
+        str: Everything in it, decoded as UTF-8 if it was read as bytes.
+    """
+    if is_path(source):
+        return pathlib.Path(source).read_text("utf-8")
+    text = stream(source).read()
+    return text if isinstance(text, str) else text.decode("utf-8")
+
+
+def split_records(
+    path: str | os.PathLike, parts: int, separator: bytes = b"\n", group: int = 1
+) -> list[tuple[int, int]]:
+    """
+    Splits a file into about <parts> byte ranges of about the same size, each ending just after a separator, so that
+    no record is split between two ranges. With <group> > 1, each range also holds a whole number of groups of that
+    many records (counting from the start of the file), for inputs where consecutive records belong together.
+
     Args:
-        path (str): Path of the file to read.
+        path (str | os.PathLike): Path of the file.
+        parts (int): Number of ranges to aim for.
+        separator (bytes, optional): What ends each record. Defaults to b"\\n" (a record per line); b"\\n\\n" ends a
+            record at each blank line.
+        group (int, optional): Number of records that must stay together. Defaults to 1.
+
+    Returns:
+        list[tuple[int, int]]: The start and end of each range; at least one, even for an empty file.
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            return [(0, 0)]
+    with buffer:
+        size, ranges, records = len(buffer), [], 0
+        start = 0
+        for part in range(1, parts + 1):
+            if start >= size:
+                break
+            # Start looking a little early, in case the middle of the range falls inside a separator.
+            stop = buffer.find(separator, max(size * part // parts - len(separator) + 1, start))
+            stop = size if stop == -1 or part == parts else stop + len(separator)
+            if group > 1 and stop < size:
+                records += buffer[start:stop].count(separator)
+                for _ in range(-records % group):
+                    found = buffer.find(separator, stop)
+                    stop = size if found == -1 else found + len(separator)
+                records += -records % group
+            ranges.append((start, stop))
+            start = stop
+    return ranges or [(0, 0)]
+
+
+def _map_range(mapper: Callable[[Source], Partial], path: str | os.PathLike, start: int, stop: int) -> Partial:
+    """
+    Runs a mapper on one range of a file. Runs in a worker process of map_reduce().
+
+    Args:
+        mapper (Callable[[Source], Partial]): Function from a source to a partial result.
+        path (str | os.PathLike): Path of the file.
+        start (int): Start of the range.
+        stop (int): End of the range.
+
+    Returns:
+        Partial: The mapper's result for the range.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        return mapper(io.BytesIO(file.read(stop - start)))
+
+
+# The last two arguments describe the records, and are passed straight on to split_records().
+def map_reduce(  # pylint: disable=too-many-arguments
+    source: Source,
+    mapper: Callable[[Source], Partial],
+    combine: Callable[[Iterable[Partial]], Result],
+    workers: int = 1,
+    *,
+    separator: bytes = b"\n",
+    group: int = 1,
+) -> Result:
+    """
+    Folds an input of independent records across a process pool. The file is split into ranges of whole records (see
+    split_records()) of about MAP_CHUNK_SIZE bytes, the mapper reduces each range (read as a binary stream) to a
+    partial result in a worker, and the partial results are combined in the order of their ranges.
+
+    With one worker, or a source that is not a file path (so cannot be split), the mapper is run on the whole source
+    in this process instead.
+
+    Args:
+        source (Source): Where to read the input from.
+        mapper (Callable[[Source], Partial]): Function from a source to a partial result. It must be picklable, e.g. a
+            module-level function or a functools.partial of one.
+        combine (Callable[[Iterable[Partial]], Result]): Function from the partial results to the final result.
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        separator (bytes, optional): What ends each record (see split_records()). Defaults to b"\\n".
+        group (int, optional): Number of records that must stay together (see split_records()). Defaults to 1.
+
+    Returns:
+        Result: The combined result.
+    """
+    if workers <= 1 or not is_path(source):
+        return combine([mapper(source)])
+    parts = max(workers, -(-os.path.getsize(source) // MAP_CHUNK_SIZE))
+    starts, stops = zip(*split_records(source, parts, separator, group))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        return combine(pool.map(functools.partial(_map_range, mapper, source), starts, stops))
+
+
+def sum_columns(rows: Iterable[tuple[int, ...]]) -> tuple[int, ...]:
+    """
+    Adds up tuples of partial results element by element, e.g. to combine both stars' partial answers.
+
+    Args:
+        rows (Iterable[tuple[int, ...]]): Tuples of the same length.
+
+    Returns:
+        tuple[int, ...]: The sum of each element.
+    """
+    return tuple(map(sum, zip(*rows)))
+
+
+class Grid:
+    """
+    A rectangular grid of small values (0-255), stored one byte per cell, row by row, in a single flat bytearray.
+
+    The grid is surrounded by a one-cell border of padding, so every cell of the grid has a neighbour in all four
+    directions and neighbours can be looked at without checking bounds. Cells are addressed by their index into
+    cells (see index()), and the neighbour in direction DIRS[n] of the cell at index i is at i + offsets[n].
+    """
+
+    __slots__ = ("width", "height", "stride", "padding", "cells", "offsets")
+
+    def __init__(self, rows: Iterable[str | bytes], table: Optional[bytes] = None, padding: int = 0):
+        """
+        Builds a grid from rows of text, one character per cell.
+
+        Args:
+            rows (Iterable[str | bytes]): The rows, which must all be the same length. Strings are encoded as UTF-8.
+            table (Optional[bytes], optional): A translation table (see bytes.maketrans()) from characters to cell
+                values. Defaults to using each character's byte value as it is.
+            padding (int, optional): Value of the cells of the border. Defaults to 0.
+
+        Raises:
+            ValueError: If there are no rows, or they are not all the same length.
+        """
+        self.width = self.height = 0
+        self.padding = padding
+        self.cells = bytearray()
+        for row in rows:
+            if isinstance(row, str):
+                row = row.encode("utf-8")
+            if not self.height:
+                self.width = len(row)
+                self.cells += bytes((padding,)) * (self.width + 2)
+            elif len(row) != self.width:
+                raise ValueError(f"Row {self.height} has {len(row)} cells; expected {self.width}")
+            self.cells.append(padding)
+            self.cells += row.translate(table)
+            self.cells.append(padding)
+            self.height += 1
+        if not self.height:
+            raise ValueError("A grid needs at least one row")
+        self.cells += bytes((padding,)) * (self.width + 2)
+        self.stride = self.width + 2
+        self.offsets = tuple(d_y * self.stride + d_x for d_y, d_x in DIRS)
+
+    @classmethod
+    def from_cells(cls, cells: bytearray | memoryview, width: int, height: int, padding: int = 0) -> Self:
+        """
+        Wraps cells that are already laid out as a grid's, border included (e.g. another grid's cells), without copying
+        them.
+
+        Args:
+            cells (bytearray | memoryview): The cells, row by row, with the border.
+            width (int): Width of the grid, not counting the border.
+            height (int): Height of the grid, not counting the border.
+            padding (int, optional): Value of the cells of the border. Defaults to 0.
+
+        Returns:
+            Self: A grid whose cells are <cells>.
+        """
+        grid = cls.__new__(cls)
+        grid.width, grid.height, grid.padding, grid.cells = width, height, padding, cells
+        grid.stride = width + 2
+        grid.offsets = tuple(d_y * grid.stride + d_x for d_y, d_x in DIRS)
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        """
+        Args:
+            x (int): Column of a cell.
+            y (int): Row of a cell.
+
+        Returns:
+            int: Index of the cell in cells.
+        """
+        return (y + 1) * self.stride + x + 1
+
+    def location(self, index: int) -> tuple[int, int]:
+        """
+        Args:
+            index (int): Index of a cell in cells.
+
+        Returns:
+            tuple[int, int]: The cell's (x, y) coordinates.
+        """
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def row(self, y: int) -> memoryview:
+        """
+        Args:
+            y (int): Row number.
+
+        Returns:
+            memoryview: The values of the row, left to right. This is a view of the grid, not a copy.
+        """
+        start = self.index(0, y)
+        return memoryview(self.cells)[start : start + self.width]
+
+    def column(self, x: int) -> memoryview:
+        """
+        Args:
+            x (int): Column number.
+
+        Returns:
+            memoryview: The values of the column, top to bottom. This is a view of the grid, not a copy.
+        """
+        return memoryview(self.cells)[self.index(x, 0) : self.index(x, self.height - 1) + 1 : self.stride]
+
+    def indices(self) -> Iterator[int]:
+        """
+        Yields:
+            Iterator[int]: Index of every cell of the grid (but not of the border), row by row.
+        """
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+
+@dataclasses.dataclass
+class MemoryUsage:
+    """
+    Memory allocated while tracemalloc is tracing, in bytes. <start> is how much was allocated when the measurement
+    began, and <peak> the most that was allocated at any one time since. <snapshot>, if requested, is a tracemalloc
+    snapshot taken at the end of whichever phase finished with the most memory allocated.
+    """
+
+    start: int
+    peak: int
+    snapshot: Optional[tracemalloc.Snapshot] = dataclasses.field(default=None, repr=False)
+    snapshot_size: int = dataclasses.field(default=-1, repr=False)
+
+    @property
+    def allocated(self) -> int:
+        """
+        Returns:
+            int: The most memory allocated at any one time, beyond what was already allocated at the start.
+        """
+        return self.peak - self.start
+
+
+def _update_peaks(snapshot: bool = False):
+    """
+    tracemalloc keeps a single peak, so measurements take turns with it: every time a measurement starts or a phase
+    ends, the peak so far is added to every open measurement and then reset.
+
+    Args:
+        snapshot (bool, optional): Also take a snapshot for the measurements that asked for one, if more memory is
+            allocated now than when they last took one. Defaults to False.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    taken = None
+    for usage in _MEASUREMENTS:
+        usage.peak = max(usage.peak, peak)
+        if snapshot and 0 <= usage.snapshot_size < current:
+            usage.snapshot, usage.snapshot_size = taken or (taken := tracemalloc.take_snapshot()), current
+
+
+def _start_measuring(snapshot: bool = False) -> MemoryUsage:
+    """
+    Args:
+        snapshot (bool, optional): Whether the measurement wants a snapshot. Defaults to False.
+
+    Returns:
+        MemoryUsage: A new open measurement.
+    """
+    _update_peaks()
+    start = tracemalloc.get_traced_memory()[0]
+    usage = MemoryUsage(start, start, snapshot_size=0 if snapshot else -1)
+    _MEASUREMENTS.append(usage)
+    return usage
+
+
+def _stop_measuring(usage: MemoryUsage):
+    """
+    Args:
+        usage (MemoryUsage): An open measurement, which is closed.
+    """
+    _update_peaks(snapshot=True)
+    _MEASUREMENTS.remove(usage)
+
+
+@contextlib.contextmanager
+def measuring_memory(snapshot: bool = False) -> Iterator[Optional[MemoryUsage]]:
+    """
+    Measures the peak memory allocated during the block, if tracemalloc is tracing.
+
+    Args:
+        snapshot (bool, optional): Keep a snapshot of the allocations at the end of the phase that finished with the
+            most memory allocated (see MemoryUsage). Defaults to False.
+
+    Yields:
+        Optional[MemoryUsage]: The measurement, filled in when the block ends; None if tracemalloc is not tracing.
+    """
+    if not tracemalloc.is_tracing():
+        yield None
+        return
+    usage = _start_measuring(snapshot)
+    try:
+        yield usage
+    finally:
+        _stop_measuring(usage)
+
+
+@dataclasses.dataclass
+class PhaseTimes:
+    """
+    Time spent in one phase of a solution. A phase entered again while it is already running (e.g. by a recursive
+    function) is only timed once, by its outermost entry. If tracemalloc is tracing, <peak> is the most memory the
+    phase had allocated at any one time, in bytes.
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+    peak: int = 0
+    depth: int = dataclasses.field(default=0, repr=False, compare=False)
+
+
+class _TimedPhase:
+    """
+    Adds the wall and CPU time spent inside a with-block to a PhaseTimes, and its peak memory if that is being traced.
+    """
+
+    __slots__ = ("times", "wall", "cpu", "memory")
+
+    def __init__(self, times: PhaseTimes):
+        self.times = times
+        self.wall = self.cpu = 0.0
+        self.memory = None
+
+    def __enter__(self):
+        self.times.depth += 1
+        if tracemalloc.is_tracing():
+            self.memory = _start_measuring()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+
+    def __exit__(self, *exc_info):
+        wall, cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        times = self.times
+        times.calls += 1
+        times.depth -= 1
+        if not times.depth:
+            times.wall += wall
+            times.cpu += cpu
+        if self.memory is not None:
+            _stop_measuring(self.memory)
+            times.peak = max(times.peak, self.memory.allocated)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Marks a phase of a solution, such as "parse", "build", "simulate" or "reduce". If phases are being recorded, the
+    wall and CPU time spent inside the with-block are added to that phase's totals; otherwise this returns a shared
+    no-op context manager, so marking a phase costs next to nothing.
+
+    Args:
+        name (str): Name of the phase.
+
+    Returns:
+        ContextManager[None]: Context manager to run the phase in.
+    """
+    if not _RECORDINGS:
+        return _NOT_RECORDING
+    recording = _RECORDINGS[-1]
+    if (times := recording.get(name)) is None:
+        times = recording[name] = PhaseTimes()
+    return _TimedPhase(times)
+
+
+def phased(name: str) -> Callable[[Callable[..., Result]], Callable[..., Result]]:
+    """
+    Decorator form of phase(), marking every call of the decorated function as the named phase.
+
+    Args:
+        name (str): Name of the phase.
+
+    Returns:
+        Callable[[Callable[..., Result]], Callable[..., Result]]: The decorator.
+    """
+
+    def decorate(func: Callable[..., Result]) -> Callable[..., Result]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Result:
+            if not _RECORDINGS:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@contextlib.contextmanager
+def recording_phases() -> Iterator[dict[str, PhaseTimes]]:
+    """
+    Records the time spent in every phase marked with phase() or phased() for the duration of the block. Recordings
+    nest; phases are only added to the innermost one.
+
+    Yields:
+        dict[str, PhaseTimes]: The times of each phase, filled in as the phases complete.
+    """
+    timings = {}
+    _RECORDINGS.append(timings)
+    try:
+        yield timings
+    finally:
+        _RECORDINGS.pop()
+
+
+def operations() -> Optional[collections.Counter]:
+    """
+    Returns the counters a solver should add its operation counts to (comparisons made, nodes expanded, ...) with
+    update(name=count), or None if operations are not being counted. Solvers should look this up once, outside their
+    hot loops, and prefer counts they can work out afterwards (such as the size of a search's visited set) to
+    counting as they go, so that counting costs at most an "is not None" check when it is off.
+
+    Returns:
+        Optional[collections.Counter]: The innermost active count, or None.
+    """
+    return _COUNTINGS[-1] if _COUNTINGS else None
+
+
+@contextlib.contextmanager
+def counting_operations() -> Iterator[collections.Counter]:
+    """
+    Counts the operations solvers report through operations() for the duration of the block. Counts nest; operations
+    are only added to the innermost one.
+
     Yields:
-        str: An iterable of those lines.
+        Iterator[collections.Counter]: The number of each operation, filled in as the solvers report them.
     """
-    yield from pathlib.Path(path).read_text("utf-8").splitlines()
+    counts = collections.Counter()
+    _COUNTINGS.append(counts)
+    try:
+        yield counts
+    finally:
+        _COUNTINGS.pop()
@@ -0,0 +1,98 @@
+"""
+Test cases for the asyncio runner
+"""
+import asyncio
+import concurrent.futures
+import io
+import os
+import pathlib
+import threading
+
+import pytest
+
+from aoc2022 import aio, runner
+
+
+def test_solve():
+    """
+    Test solving a star on its fixture, in the event loop's default executor.
+    """
+    result = asyncio.run(aio.solve(1, 1))
+    assert result.answer == 68442 and result.error is None
+
+
+def test_solve_all():
+    """
+    Test that stars solved in a process pool come back in the order they were asked for, whatever their input.
+    """
+    with open("fixtures/day6.txt", encoding="utf-8") as file, concurrent.futures.ProcessPoolExecutor(2) as pool:
+        jobs = [(1, runner.BOTH, None), (6, 1, file), (6, 2, io.BytesIO(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb\n"))]
+        results = asyncio.run(aio.solve_all(jobs, pool))
+    assert [result.answer for result in results] == [[68442, 204837], 1300, 19]
+
+
+def test_overlap(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the next star's input file is read while a star is being solved. The file is a named pipe, so reading it
+    is only finished once the writer has written it all.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to hold up the first star until the second star's input has been read.
+    """
+    path = tmp_path / "day6.txt"
+    os.mkfifo(path)
+    writer = threading.Thread(target=path.write_bytes, args=(b"mjqjpqmgbljsphdztnvjfqwrcgsmlb\n",))
+    writer.start()
+    run_star = runner.run_star
+
+    def held_up(day: int, star: runner.Star, source: io.BytesIO) -> runner.StarResult:
+        if day == 1:
+            writer.join(5)
+            assert not writer.is_alive()
+        return run_star(day, star, source)
+
+    monkeypatch.setattr(runner, "run_star", held_up)
+    with concurrent.futures.ThreadPoolExecutor(1) as pool:
+        results = asyncio.run(aio.solve_all([(1, 1, None), (6, 1, path)], pool))
+    assert [result.answer for result in results] == [68442, 7]
+
+
+def test_errors(tmp_path: pathlib.Path):
+    """
+    Test that a missing input, an unreadable stream and a star that times out are reported as errors.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    missing = asyncio.run(aio.solve(1, 1, "missing.txt"))
+    late = asyncio.run(aio.solve(1, 2, timeout=0))
+    assert missing.error.startswith("FileNotFoundError") and missing.answer is None
+    assert late.error == "TimeoutError: no answer after 0 s" and late.answer is None
+    with open(tmp_path / "output.txt", "wb") as unreadable:
+        assert asyncio.run(aio.solve(1, 1, unreadable)).error.startswith("UnsupportedOperation")
+
+
+def test_cancel(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that cancelling the caller cancels the stars that have not started.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to record the stars that are run.
+    """
+    solved = []
+    monkeypatch.setattr(runner, "run_star", lambda *args: solved.append(args))
+
+    async def cancelled():
+        with concurrent.futures.ThreadPoolExecutor(1) as pool:
+            release = threading.Event()
+            pool.submit(release.wait)
+            task = asyncio.create_task(aio.solve_all([(1, 1, None), (6, 1, None)], pool))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+
+    asyncio.run(cancelled())
+    assert not solved
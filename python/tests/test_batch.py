@@ -0,0 +1,84 @@
+"""
+Test cases for batch mode
+"""
+import json
+import pathlib
+
+import pytest
+
+from aoc2022 import batch, generators
+
+SIGNALS = {"a.txt": "bvwbjplbgvbhsrlpgdmjqwftvncz\n", "b.txt": "nppdvjthqldpwncqszvftbrmjlhg\n"}
+
+
+@pytest.fixture(name="inputs")
+def fixture_inputs(tmp_path: pathlib.Path) -> pathlib.Path:
+    """
+    Writes a couple of day 6 inputs to a directory.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+
+    Returns:
+        pathlib.Path: The directory of inputs.
+    """
+    directory = tmp_path / "inputs"
+    directory.mkdir()
+    for name, signal in SIGNALS.items():
+        (directory / name).write_text(signal, "utf-8")
+    (directory / "nested").mkdir()
+    return directory
+
+
+def test_expand_inputs(inputs: pathlib.Path):
+    """
+    Test that directories and glob patterns expand to the files in them, and that anything else is kept as it is.
+
+    Args:
+        inputs (pathlib.Path): The directory of inputs.
+    """
+    a_txt, b_txt = str(inputs / "a.txt"), str(inputs / "b.txt")
+    assert batch.expand_inputs([str(inputs)]) == [a_txt, b_txt]
+    assert batch.expand_inputs([str(inputs / "*"), "missing.txt"]) == [a_txt, b_txt, "missing.txt"]
+    assert batch.expand_inputs([b_txt, str(inputs / "a*")]) == [b_txt, a_txt]
+
+
+@pytest.mark.parametrize("workers,chunksize", [(1, 1), (2, 3)])
+def test_run(tmp_path: pathlib.Path, workers: int, chunksize: int):
+    """
+    Test that every input is solved, in the order given, with or without a process pool.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        workers (int): Number of worker processes.
+        chunksize (int): Number of inputs handed to a worker at a time.
+    """
+    paths = []
+    for seed in range(5):
+        paths.append(str(tmp_path / f"day1-{seed}.txt"))
+        generators.write(1, 50, paths[-1], seed)
+    solved = list(batch.run(1, paths, ("both",), workers, chunksize))
+    assert [item["input"] for item in solved] == paths
+    for item in solved:
+        (result,) = item["results"]
+        first, second = result["answer"]
+        assert first < second and result["error"] is None
+
+
+def test_main(inputs: pathlib.Path, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test writing JSON lines to a file and to standard output, and that a missing input is reported as an error.
+
+    Args:
+        inputs (pathlib.Path): The directory of inputs.
+        tmp_path (pathlib.Path): Temporary directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    output = tmp_path / "results.jsonl"
+    assert batch.main(["6", str(inputs), "--workers", "2", "--output", str(output)]) == 0
+    lines = [json.loads(line) for line in output.read_text("utf-8").splitlines()]
+    assert [[result["answer"] for result in line["results"]] for line in lines] == [[5, 23], [6, 23]]
+
+    assert batch.main(["6", str(tmp_path / "missing.txt"), "--stars", "1", "--workers", "1"]) == 1
+    (result,) = json.loads(capsys.readouterr().out)["results"]
+    assert result["error"].startswith("FileNotFoundError")
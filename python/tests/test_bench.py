@@ -0,0 +1,92 @@
+"""
+Test cases for the benchmark harness
+"""
+import json
+import pathlib
+
+import pytest
+
+from aoc2022 import bench
+
+
+def test_cases_cover_every_star():
+    """
+    Test that there is a case for both stars of every day, and a ladder for every day.
+    """
+    names = {case.name for case in bench.CASES}
+    assert {f"day{day}.{star}" for day in range(1, 14) for star in ("first_star", "second_star")} <= names
+    assert "day8.Forest.count_visible_trees" in names
+    assert {case.day for case in bench.CASES} == set(bench.LADDERS)
+
+
+def test_run():
+    """
+    Test that each case is measured at every (scaled) size of its ladder.
+    """
+    cases = [case for case in bench.CASES if case.name in ("day1.first_star", "day13.merge_sort")]
+    report = bench.make_report(bench.run(cases, repeat=3, scale=0.01))
+    assert sorted(report) == ["day1.first_star", "day13.merge_sort"]
+    assert sorted(report["day1.first_star"], key=int) == ["10", "100", "1000"]
+    assert sorted(report["day13.merge_sort"], key=int) == ["1", "10", "100"]
+    measurement = report["day1.first_star"]["1000"]
+    assert measurement["runs"] == 3
+    assert 0 < measurement["min"] <= measurement["median"]
+
+
+def test_save_and_load(tmp_path: pathlib.Path):
+    """
+    Test that a saved report can be loaded back, and that it records how it was measured.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    report = {"day1.first_star": {"10": {"median": 0.5, "min": 0.25, "runs": 3}}}
+    path = tmp_path / "baseline.json"
+    bench.save(report, str(path), 3)
+    assert bench.load(str(path)) == report
+    assert json.loads(path.read_text("utf-8"))["meta"]["repeat"] == 3
+
+
+def test_compare():
+    """
+    Test that only cases slower than the threshold allows are regressions, and that new cases are ignored.
+    """
+    baseline = {"a": {"10": {"median": 1.0}, "20": {"median": 2.0}}}
+    current = {"a": {"10": {"median": 1.2}, "20": {"median": 3.0}, "40": {"median": 9.0}}, "b": {"10": {"median": 1}}}
+    regressions = bench.compare(baseline, current, threshold=0.25)
+    assert [(regression.name, regression.size, regression.ratio) for regression in regressions] == [("a", "20", 1.5)]
+    assert not bench.compare(baseline, current, threshold=0.5)
+
+
+def test_main(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test running, saving, and comparing from the command line.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    baseline = tmp_path / "baseline.json"
+    args = ["run", "--days", "2", "--cases", "*.first_star", "--repeat", "1", "--scale", "0.01"]
+    assert bench.main(args + ["--output", str(baseline)]) == 0
+    assert list(bench.load(str(baseline))) == ["day2.first_star"]
+    assert bench.main(args + ["--baseline", str(baseline), "--threshold", "1000"]) == 0
+
+    slower = tmp_path / "slower.json"
+    report = bench.load(str(baseline))
+    for measurement in report["day2.first_star"].values():
+        measurement["median"] *= 10
+    bench.save(report, str(slower), 1)
+    capsys.readouterr()
+    assert bench.main(["compare", str(baseline), str(slower)]) == 1
+    assert capsys.readouterr().out.count("REGRESSION day2.first_star") == 3
+    assert bench.main(["compare", str(slower), str(baseline)]) == 0
+
+
+def test_find_path_case():
+    """
+    Test that the day 12 case walks from S to E on the generated heightmap.
+    """
+    (case,) = [case for case in bench.CASES if case.name == "day12.find_path"]
+    report = bench.make_report(bench.run([case], repeat=1, scale=0.5))
+    assert sorted(report["day12.find_path"], key=int) == ["13", "27", "54"]
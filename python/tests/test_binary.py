@@ -0,0 +1,142 @@
+"""
+Test cases for binary inputs
+"""
+import asyncio
+import importlib
+import io
+import os
+import pathlib
+import sys
+import threading
+
+import pytest
+
+from aoc2022 import aio, binary, day4, day8, day13
+
+
+@pytest.mark.parametrize("day", [4, 5, 8, 13])
+def test_convert(tmp_path: pathlib.Path, day: int):
+    """
+    Test that every star gives the same answer from a binary input as from the text it was converted from.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        day (int): Day number.
+    """
+    module = importlib.import_module(f"aoc2022.day{day}")
+    text, converted = f"fixtures/day{day}.txt", tmp_path / f"day{day}.bin"
+    binary.convert(day, text, converted)
+    assert binary.is_binary(converted) and not binary.is_binary(text)
+    for star in ("first_star", "second_star", "solve_both"):
+        assert getattr(module, star)(converted) == getattr(module, star)(text)
+
+
+def test_workers(tmp_path: pathlib.Path):
+    """
+    Test that a binary input is not split between workers.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    converted = tmp_path / "day4.bin"
+    binary.convert(4, "fixtures/day4.txt", converted)
+    assert day4.first_star(converted, workers=2) == day4.first_star(converted) == 573
+    assert day4.solve_both(converted, workers=2) == (573, 867)
+
+
+@pytest.mark.parametrize("day", [4, 5, 8, 13])
+def test_streams(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, day: int):
+    """
+    Test that binary inputs are recognised in open files, in-memory streams and standard input, and in the asyncio
+    runner.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to stand in for standard input.
+        day (int): Day number.
+    """
+    module = importlib.import_module(f"aoc2022.day{day}")
+    converted = tmp_path / f"day{day}.bin"
+    binary.convert(day, f"fixtures/day{day}.txt", converted)
+    expected = module.solve_both(f"fixtures/day{day}.txt")
+    with open(converted, "rb") as file:
+        assert binary.is_binary(file) and module.solve_both(file) == expected
+    assert module.solve_both(io.BytesIO(converted.read_bytes())) == expected
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BufferedReader(io.BytesIO(converted.read_bytes()))))
+    assert module.solve_both("-") == expected
+    with open(converted, "rb") as file:
+        jobs = [(day, "both", converted), (day, "both", file)]
+        assert [result.answer for result in asyncio.run(aio.solve_all(jobs))] == [list(expected)] * 2
+
+
+def test_text_streams(tmp_path: pathlib.Path):
+    """
+    Test that a binary input in a text stream is refused, and that a stream that cannot be looked ahead in is text.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    converted = tmp_path / "day8.bin"
+    binary.convert(8, "fixtures/day8.txt", converted)
+    with open(converted, encoding="utf-8") as file, pytest.raises(ValueError, match="must be given as a path"):
+        day8.first_star(file)
+    with pytest.raises(ValueError, match="must be given as a path"):
+        binary.is_binary(io.StringIO(converted.read_bytes().decode("latin-1")))
+    with pytest.raises(ValueError, match="must be given as a path"):
+        with binary.payload(io.StringIO("AOC2022"), 8):
+            pass
+    assert not binary.is_binary(io.StringIO("30373\n"))
+
+    reader, writer = os.pipe()
+    thread = threading.Thread(target=lambda: os.write(writer, b"2-4,6-8\n2-8,3-7\n") and os.close(writer))
+    thread.start()
+    with open(reader, "rb", buffering=0) as pipe:
+        assert not binary.is_binary(pipe) and day4.solve_both(pipe) == (1, 1)
+    thread.join()
+
+
+def test_large_integers(tmp_path: pathlib.Path):
+    """
+    Test that integers too large for a single token survive the conversion.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    text, converted = tmp_path / "day13.txt", tmp_path / "day13.bin"
+    text.write_text("[300,[1000000],[]]\n[1]\n\n[[251]]\n[252,7]\n", "utf-8")
+    binary.convert(13, text, converted)
+    assert day13.read_packets(converted) == [[[300, [1000000], []], [1]], [[[251]], [252, 7]]]
+
+
+def test_wrong_input(tmp_path: pathlib.Path):
+    """
+    Test that a binary input cannot be read as another day's, and that a text file is not a binary input.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    converted = tmp_path / "day4.bin"
+    binary.convert(4, "fixtures/day4.txt", converted)
+    with pytest.raises(ValueError, match="binary input for day 4, not day 5"):
+        with binary.payload(converted, 5):
+            pass
+    with pytest.raises(ValueError, match="is not a binary input"):
+        with binary.payload("fixtures/day4.txt", 4):
+            pass
+    with pytest.raises(ValueError, match="The stream is not a binary input"):
+        with binary.payload(io.BytesIO(bytes(binary.HEADER.size)), 4):
+            pass
+
+
+def test_main(tmp_path: pathlib.Path):
+    """
+    Test converting an input from the command line, and that only the days with a binary form can be converted.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    assert binary.convertible_days() == [4, 5, 8, 13]
+    binary.main(["8", "fixtures/day8.txt", str(tmp_path / "day8.bin")])
+    assert binary.is_binary(tmp_path / "day8.bin")
+    with pytest.raises(SystemExit):
+        binary.parse_args(["1", "fixtures/day1.txt", str(tmp_path / "day1.bin")])
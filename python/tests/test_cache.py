@@ -0,0 +1,266 @@
+"""
+Test cases for the parsed input cache
+"""
+import os
+import pathlib
+import zlib
+
+import pytest
+
+from aoc2022 import cache, runner, utils
+
+
+@pytest.fixture(name="cache_dir")
+def fixture_cache_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """
+    Turns on the cache, in a temporary directory.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the environment variable.
+
+    Returns:
+        pathlib.Path: The cache directory.
+    """
+    directory = tmp_path / "cache"
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(directory))
+    return directory
+
+
+def _counting_parser(version: int = 1) -> tuple[list[str], callable]:
+    """
+    Helper function to make a cached parser that records every time it actually parses.
+
+    Args:
+        version (int, optional): Version of the parser. Defaults to 1.
+
+    Returns:
+        tuple[list[str], callable]: The list of parsed paths, and the parser.
+    """
+    parsed = []
+
+    @cache.parser(version=version)
+    def parse(path: str) -> list[str]:
+        parsed.append(path)
+        return pathlib.Path(path).read_text("utf-8").split()
+
+    return parsed, parse
+
+
+def test_disabled_by_default(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that nothing is cached unless a cache directory is configured.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to clear the environment variable.
+    """
+    monkeypatch.delenv(cache.CACHE_DIR_ENV, raising=False)
+    path = tmp_path / "input.txt"
+    path.write_text("a b", "utf-8")
+    parsed, parse = _counting_parser()
+    assert parse(str(path)) == parse(str(path)) == ["a", "b"]
+    assert len(parsed) == 2
+
+
+def test_hit_and_miss(tmp_path: pathlib.Path, cache_dir: pathlib.Path):
+    """
+    Test that the same contents hit the cache (even at another path), and changed contents or versions miss it.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+    """
+    path, copy = tmp_path / "input.txt", tmp_path / "copy.txt"
+    path.write_text("a b", "utf-8")
+    copy.write_text("a b", "utf-8")
+    parsed, parse = _counting_parser()
+    assert parse(str(path)) == parse(str(path)) == parse(str(copy)) == ["a", "b"]
+    assert parsed == [str(path)]
+
+    path.write_text("a b c", "utf-8")
+    assert parse(str(path)) == ["a", "b", "c"]
+    reparsed, reparse = _counting_parser(version=2)
+    assert reparse(str(copy)) == ["a", "b"]
+    assert (len(parsed), len(reparsed)) == (2, 1)
+    assert len(list(cache_dir.glob(f"*{cache.SUFFIX}"))) == 3
+
+
+def test_extra_arguments_bypass_cache(tmp_path: pathlib.Path, cache_dir: pathlib.Path):
+    """
+    Test that calls with more than the path are not cached, since the key only covers the file.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+    """
+
+    @cache.parser(version=1)
+    def parse(path: str, separator: str = " ") -> list[str]:
+        return pathlib.Path(path).read_text("utf-8").split(separator)
+
+    path = tmp_path / "input.txt"
+    path.write_text("a,b", "utf-8")
+    assert parse(str(path), ",") == ["a", "b"]
+    assert not cache_dir.exists()
+
+
+def test_streams_bypass_cache(tmp_path: pathlib.Path, cache_dir: pathlib.Path):
+    """
+    Test that input read from an open file is parsed every time, since it cannot be hashed up front.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+    """
+    path = tmp_path / "input.txt"
+    path.write_text("a b", "utf-8")
+    parsed = []
+
+    @cache.parser(version=1)
+    def parse(source: utils.Source) -> list[str]:
+        parsed.append(source)
+        return list(utils.lines(source))
+
+    for _ in range(2):
+        with open(path, encoding="utf-8") as file:
+            assert parse(file) == ["a b"]
+    assert len(parsed) == 2 and not cache_dir.exists()
+
+
+def test_corrupt_and_unpicklable_entries(tmp_path: pathlib.Path, cache_dir: pathlib.Path):
+    """
+    Test that a corrupt or truncated entry is parsed again, and that a result which cannot be pickled is returned but
+    not stored.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+    """
+    path = tmp_path / "input.txt"
+    path.write_text("a b", "utf-8")
+    parsed, parse = _counting_parser()
+    parse(str(path))
+    (entry,) = cache_dir.glob(f"*{cache.SUFFIX}")
+    entry.write_bytes(b"not a cache entry")
+    assert parse(str(path)) == ["a", "b"]
+    entry.write_bytes(zlib.compress(b"\x80"))
+    assert parse(str(path)) == ["a", "b"]
+    assert len(parsed) == 3
+
+    @cache.parser(version=1)
+    def unpicklable(_path: str):
+        return lambda: None
+
+    assert callable(unpicklable(str(path)))
+    assert len(list(cache_dir.glob(f"*{cache.SUFFIX}"))) == 1
+
+
+def test_memory(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test keeping entries in memory without a cache directory: each hit is a fresh copy, and the least recently used
+    entries are forgotten first.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the environment variables.
+    """
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, "")
+    monkeypatch.setenv(cache.CACHE_MEMORY_ENV, "100")
+    cache.clear_memory()
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    first.write_text("a b", "utf-8")
+    second.write_text("c " * 40, "utf-8")
+    parsed, parse = _counting_parser()
+    parse(str(first)).append("changed")
+    assert parse(str(first)) == ["a", "b"]
+    assert len(parsed) == 1 and not list(tmp_path.glob(f"*{cache.SUFFIX}"))
+
+    parse(str(second))
+    parse(str(first))
+    assert len(parsed) == 3
+    cache.clear_memory()
+
+
+def test_memory_and_directory(tmp_path: pathlib.Path, cache_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that entries read from the cache directory are kept in memory too.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the environment variable.
+    """
+    path = tmp_path / "input.txt"
+    path.write_text("a b", "utf-8")
+    parsed, parse = _counting_parser()
+    parse(str(path))
+    monkeypatch.setenv(cache.CACHE_MEMORY_ENV, "1000")
+    cache.clear_memory()
+    parse(str(path))
+    for entry in cache_dir.iterdir():
+        entry.unlink()
+    assert parse(str(path)) == ["a", "b"]
+    assert len(parsed) == 1
+    cache.clear_memory()
+
+
+def test_evict(tmp_path: pathlib.Path):
+    """
+    Test that the least recently used entries are evicted first.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    for age, name in enumerate(("newest", "middle", "oldest")):
+        entry = tmp_path / f"{name}{cache.SUFFIX}"
+        entry.write_bytes(b"x" * 100)
+        os.utime(entry, (1_000_000 - age, 1_000_000 - age))
+    cache.evict(tmp_path, 250)
+    assert sorted(entry.stem for entry in tmp_path.iterdir()) == ["middle", "newest"]
+
+
+def test_size_limit(tmp_path: pathlib.Path, cache_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the cache stays within its configured size.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        cache_dir (pathlib.Path): The cache directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the size limit.
+    """
+    monkeypatch.setenv(cache.CACHE_SIZE_ENV, "1")
+    path = tmp_path / "input.txt"
+    path.write_text("a b", "utf-8")
+    _, parse = _counting_parser()
+    assert parse(str(path)) == ["a", "b"]
+    assert not list(cache_dir.glob(f"*{cache.SUFFIX}"))
+
+
+@pytest.mark.usefixtures("cache_dir")
+@pytest.mark.parametrize("day", [1, 5, 7, 8, 11, 13])
+def test_cached_days(day: int):
+    """
+    Test that the days with cached parsers give the same answers when their parsed input comes from the cache.
+
+    Args:
+        day (int): Day number.
+    """
+    for star in runner.STARS:
+        first, second = runner.run_star(day, star), runner.run_star(day, star)
+        assert first.error is None and first.answer == second.answer
+
+
+def test_runner_option(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test that the runner's --cache-dir option turns the cache on.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to restore the environment afterwards.
+        tmp_path (pathlib.Path): Temporary directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, "")
+    assert runner.main(["13", "--cache-dir", str(tmp_path)]) == 0
+    capsys.readouterr()
+    assert len(list(tmp_path.glob(f"*{cache.SUFFIX}"))) == 2
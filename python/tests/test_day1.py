@@ -1,7 +1,12 @@
 """
 Test cases for Day 1
 """
-from aoc2022 import day1
+import io
+import pathlib
+
+import pytest
+
+from aoc2022 import day1, generators, utils
 
 
 def test_sum_calories():
@@ -20,6 +25,49 @@ def test_top_three_elf_calories():
     assert sum(sorted(calories, reverse=True)[:3]) == 45000
 
 
+@pytest.mark.parametrize(
+    "k,expected", [(0, []), (1, [24000]), (3, [24000, 11000, 10000]), (9, [24000, 11000, 10000, 6000, 4000])]
+)
+def test_top_k_calories(k: int, expected: list[int]):
+    """
+    Test that the k largest totals are found, largest first, even when there are fewer than k Elves.
+
+    Args:
+        k (int): Number of Elves.
+        expected (list[int]): The expected totals.
+    """
+    assert day1.top_k_calories("tests/fixtures/day1.txt", k) == expected
+    assert list(day1.elf_calories(io.StringIO("1\n2\n\n3\n\n"))) == [3, 3, 0]
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("\n\n1\n2\n\n\n\n3\n", [0, 0, 3, 0, 0, 3]),
+        ("1\r\n\r\n2\r\n3\r\n\r\n", [1, 5, 0]),
+        ("4\n5\n\n", [9, 0]),
+        ("6", [6]),
+        ("1000\n23\n\n456\n", [1023, 456]),
+    ],
+)
+def test_elf_calories(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, text: str, expected: list[int]):
+    """
+    Test that scanning a file a byte at a time finds the same totals as reading a stream line by line, including Elves
+    with no calories at all, Windows line endings and numbers split between blocks.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to do without NumPy, and to scan in small blocks.
+        text (str): Calorie data.
+        expected (list[int]): Each Elf's total calories.
+    """
+    monkeypatch.setattr(day1, "numpy", None)
+    monkeypatch.setattr(utils, "CHUNK_SIZE", 3)
+    path = tmp_path / "day1.txt"
+    path.write_bytes(text.encode("utf-8"))
+    assert list(day1.elf_calories(path)) == list(day1.elf_calories(io.StringIO(text))) == expected
+
+
 def test_first_star():
     """
     Determine the Elf that is carrying the most calories. Return the number of calories.
@@ -32,3 +80,99 @@ def test_second_star():
     Determine the top three Elves by calorie-carrying capacity. Return the total number of calories among them.
     """
     assert day1.second_star() == 204837
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day1.solve_both() == (68442, 204837)
+
+
+def test_numpy(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the NumPy backend gives the same totals as plain Python, whichever blocks the input is read in.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to read in small blocks, and to do without NumPy.
+    """
+    monkeypatch.setattr(utils, "CHUNK_SIZE", 64)
+    path = tmp_path / "day1.txt"
+    generators.write(1, 200, str(path))
+    path.write_bytes(path.read_bytes().replace(b"\n", b"\r\n", 100) + b"\n\n123")
+    found = list(day1.elf_calories(path)), day1.top_k_calories(path, 3), day1.top_k_calories(io.BytesIO(b"7"), 2)
+    monkeypatch.setattr(day1, "numpy", None)
+    assert found == (list(day1.elf_calories(path)), day1.top_k_calories(path, 3), [7])
+
+
+def test_leaderboard(tmp_path: pathlib.Path):
+    """
+    Test that a leaderboard reads only the whole lines appended since its last poll, and starts again if the log
+    shrinks.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "day1.txt"
+    path.write_bytes(b"1000\n2000\n\n500")
+    leaderboard, nobody = day1.Leaderboard(path), day1.Leaderboard(path, 0)
+    assert leaderboard.poll() == nobody.poll() == 11
+    assert leaderboard.leaders() == [3000, 0] and nobody.leaders() == []
+    with path.open("ab") as log:
+        log.write(b"0\r\n\r\n7000\n\n4000\n\n6000\n")
+    assert leaderboard.poll() == 25 and leaderboard.poll() == 0
+    assert leaderboard.leaders() == day1.top_k_calories(path, 3) == [7000, 6000, 5000]
+    path.write_bytes(b"1\n")
+    assert leaderboard.poll() == 2 and leaderboard.leaders() == [1]
+
+
+def test_follow(tmp_path: pathlib.Path):
+    """
+    Test that following a log yields the leaders whenever lines are appended.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "day1.txt"
+    path.write_bytes(b"1000\n\n")
+    leaders = day1.follow(path, 2, interval=0.01)
+    assert next(leaders) == [1000, 0]
+    with path.open("ab") as log:
+        log.write(b"3000\n")
+    assert next(leaders) == [3000, 1000]
+
+
+def test_calorie_distribution(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the distribution counts every Elf, including those carrying no calories, and that merging the
+    distributions of the parts of a split input gives the same distribution as a single process.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to split the input into many small parts.
+    """
+    distribution = day1.calorie_distribution("tests/fixtures/day1.txt")
+    assert (distribution.count, distribution.quantile(0.5), distribution.quantile(1)) == (
+        5,
+        pytest.approx(10000, rel=0.01),
+        24000,
+    )
+
+    distribution = day1.calorie_distribution(io.StringIO("1\n\n\n2\n3\n"))
+    assert (distribution.count, distribution.minimum, distribution.maximum) == (3, 0, 5)
+
+    monkeypatch.setattr(utils, "MAP_CHUNK_SIZE", 1000)
+    path = str(tmp_path / "day1.txt")
+    generators.write(1, 600, path)
+    single, split = day1.calorie_distribution(path), day1.calorie_distribution(path, 2)
+    assert (split.count, split.total) == (single.count, single.total) == (600, sum(day1.sum_calories(path)))
+    # Elves carrying no calories, some of them on either side of where the input is split.
+    monkeypatch.setattr(utils, "MAP_CHUNK_SIZE", 50)
+    (tmp_path / "zeros.txt").write_text("".join("\n" if number % 4 else f"{number}\n\n" for number in range(200)))
+    zeros = str(tmp_path / "zeros.txt")
+    single, split = day1.calorie_distribution(zeros), day1.calorie_distribution(zeros, 2)
+    assert (split.count, split.minimum) == (single.count, single.minimum) == (len(day1.sum_calories(zeros)), 0)
+    assert [split.quantile(fraction) for fraction in (0.5, 0.9, 0.99)] == [
+        single.quantile(fraction) for fraction in (0.5, 0.9, 0.99)
+    ]
@@ -70,3 +70,12 @@ def test_second_star():
     for index, expected in enumerate(PART_2_EXPECTED_OUTPUT.splitlines()):
         actual = "".join(crt.screen[index])
         assert actual == expected
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single run of the program.
+    """
+    signal_strength, crt = day10.solve_both()
+    assert signal_strength == 12520
+    assert str(crt) == PART_2_EXPECTED_OUTPUT
@@ -6,7 +6,7 @@ from operator import mul
 
 import pytest
 
-from aoc2022 import day11
+from aoc2022 import day11, utils
 
 
 def test_monkey_business_first_star():
@@ -52,3 +52,19 @@ def test_second_star():
     Test second star solution.
     """
     assert day11.second_star() == 30599555965
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day11.solve_both() == (113220, 30599555965)
+
+
+def test_operation_counts():
+    """
+    Test that every item the monkeys inspect is counted.
+    """
+    with utils.counting_operations() as counts:
+        day11.first_star("tests/fixtures/day11.txt")
+    assert counts == {"items_inspected": 308}
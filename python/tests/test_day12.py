@@ -3,13 +3,18 @@ Test cases for Day 12
 """
 import re
 
-from aoc2022 import day12
+from aoc2022 import day12, utils
 
-HILL = """Sabqponm
+HILL = utils.Grid(
+    """Sabqponm
 abcryxxl
 accszExk
 acctuvwj
-abdefghi""".splitlines()
+abdefghi""".splitlines(),
+    day12.TABLE,
+    day12.WALL,
+)
+START, END = HILL.index(0, 0), HILL.index(5, 2)
 
 
 def test_find_path():
@@ -17,18 +22,37 @@ def test_find_path():
     Test that the shortest path above from S to E has 31 steps. The list will contain 32 elements including the start
     as the first "step", so subtract 1.
     """
-    end_node = day12.find_path(HILL, (0, 0), (5, 2))
+    end_node = day12.find_path(HILL, START, END)
     assert len(end_node.path) - 1 == 31
+    assert end_node.path[0] == (5, 2) and end_node.path[-1] == (0, 0)
 
 
 def test_find_path_second_star():
     """
     Test that the among all 'a' starting points to E has 29 steps.
     """
-    end_node = day12.find_path(HILL, (0, 4), (5, 2))
+    end_node = day12.find_path(HILL, HILL.index(0, 4), END)
     assert len(end_node.path) - 1 == 29
 
 
+def test_find_path_blocked():
+    """
+    Test that there is no path when E is walled off by cells too high to climb.
+    """
+    grid = utils.Grid(["SaczE"], day12.TABLE, day12.WALL)
+    assert day12.find_path(grid, *day12.find_start_and_end(grid)) is None
+
+
+def test_distances_to():
+    """
+    Test that searching backwards from E finds the shortest path from S (31 steps) and from the best 'a' (29 steps).
+    """
+    distances = day12.distances_to(HILL, END)
+    assert distances[START] == 31
+    assert min(distances[point] for point in day12.find_starting_points(HILL, START)) == 29
+    assert day12.find_start_and_end(HILL) == (START, END)
+
+
 def test_node_repr():
     """
     Test the __repr__ method of Node.
@@ -58,3 +82,27 @@ def test_second_star():
     Test second star solution.
     """
     assert day12.second_star() == 388
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day12.solve_both() == (394, 388)
+
+
+def test_operation_counts():
+    """
+    Test that the searches report how many cells they enqueued and expanded, where a search that finds the end early
+    leaves cells enqueued but not expanded.
+    """
+    with utils.counting_operations() as counts:
+        day12.find_path(HILL, START, END)
+    assert counts == {"nodes_enqueued": 40, "nodes_expanded": 40}
+    with utils.counting_operations() as counts:
+        day12.find_path(HILL, END - 1, END)
+    assert counts == {"nodes_enqueued": 12, "nodes_expanded": 5}
+    grid = utils.Grid(["SaczE"], day12.TABLE, day12.WALL)
+    with utils.counting_operations() as counts:
+        day12.distances_to(grid, day12.find_start_and_end(grid)[1])
+    assert counts == {"nodes_enqueued": 2, "nodes_expanded": 2}
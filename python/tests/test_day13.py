@@ -5,7 +5,7 @@ from typing import List, Tuple
 
 import pytest
 
-from aoc2022 import day13
+from aoc2022 import day13, utils
 
 MERGESORT_EXPECTED = [
     [],
@@ -89,3 +89,22 @@ def test_second_star():
     Test second star solution.
     """
     assert day13.second_star() == 25038
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day13.solve_both() == (5013, 25038)
+
+
+def test_operation_counts():
+    """
+    Test that both the pairs and the merge sort count their packet comparisons.
+    """
+    with utils.counting_operations() as counts:
+        day13.first_star("tests/fixtures/day13.txt")
+    assert counts == {"comparisons": 8}
+    with utils.counting_operations() as counts:
+        day13.solve_both("tests/fixtures/day13.txt")
+    assert counts == {"comparisons": 56}
@@ -30,3 +30,10 @@ def test_second_star():
     Test second star solution.
     """
     assert day2.second_star() == 14204
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day2.solve_both() == (13526, 14204)
@@ -40,3 +40,10 @@ def test_second_star():
     Test second star solution.
     """
     assert day3.second_star() == 2703
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day3.solve_both() == (7795, 2703)
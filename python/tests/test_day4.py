@@ -30,3 +30,10 @@ def test_second_star():
     Test second star solution.
     """
     assert day4.second_star() == 867
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day4.solve_both() == (573, 867)
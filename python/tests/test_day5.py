@@ -1,7 +1,7 @@
 """
 Test cases for Day 5
 """
-from aoc2022 import day5
+from aoc2022 import day5, utils
 
 
 def test_crate_mover_9000():
@@ -32,3 +32,19 @@ def test_second_star():
     Test second star solution.
     """
     assert day5.second_star() == "STHGRZZFR"
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day5.solve_both() == ("RTGWZTHLD", "STHGRZZFR")
+
+
+def test_operation_counts():
+    """
+    Test that the CrateMover 9001 reports every crate it moves, even when it moves several at once.
+    """
+    with utils.counting_operations() as counts:
+        day5.second_star("tests/fixtures/day5.txt")
+    assert counts == {"crates_moved": 7}
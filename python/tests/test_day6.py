@@ -58,3 +58,10 @@ def test_second_star():
     Test second star solution.
     """
     assert day6.second_star() == 3986
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day6.solve_both() == (1300, 3986)
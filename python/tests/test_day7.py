@@ -1,7 +1,7 @@
 """
 Test cases for Day 7
 """
-from aoc2022 import day7
+from aoc2022 import day7, utils
 
 
 def test_filesystem():
@@ -39,3 +39,19 @@ def test_second_star():
     for the update.
     """
     assert day7.second_star() == 4443914
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day7.solve_both() == (1243729, 4443914)
+
+
+def test_operation_counts():
+    """
+    Test that the size report counts the directories it visits.
+    """
+    with utils.counting_operations() as counts:
+        day7.first_star("tests/fixtures/day7.txt")
+    assert counts == {"directories_visited": 4}
@@ -1,9 +1,12 @@
 """
 Test cases for Day 8
 """
+import concurrent.futures
+import pathlib
+
 import pytest
 
-from aoc2022 import day8
+from aoc2022 import day8, generators
 
 SCENIC_SCORE_TEST_CASES = ((2, 1, 4), (2, 3, 8))
 
@@ -42,3 +45,27 @@ def test_second_star():
     Test second star solution.
     """
     assert day8.second_star() == 535680
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day8.solve_both() == (1690, 535680)
+
+
+def test_workers(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that sharing the forest between worker processes gives the same answers as a single process. The example is
+    then solved in threads, so the coverage of the workers is measured.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to run the workers in threads.
+    """
+    path = str(tmp_path / "day8.txt")
+    generators.write(8, 60, path)
+    expected = day8.second_star(path), day8.solve_both(path)
+    assert (day8.second_star(path, 2), day8.solve_both(path, 3)) == expected
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor)
+    assert day8.second_star("tests/fixtures/day8.txt", 2) == 8
@@ -1,7 +1,7 @@
 """
 Test cases for Day 9
 """
-from aoc2022 import day9
+from aoc2022 import day9, utils
 
 
 def test_movement_with_one_tail():
@@ -59,3 +59,19 @@ def test_second_star():
     Test second star solution.
     """
     assert day9.second_star() == 2419
+
+
+def test_solve_both():
+    """
+    Test solving both stars from a single parse of the input.
+    """
+    assert day9.solve_both() == (6011, 2419)
+
+
+def test_operation_counts():
+    """
+    Test that only the moves a tail actually makes are counted.
+    """
+    with utils.counting_operations() as counts:
+        day9.first_star("tests/fixtures/day9.txt")
+    assert counts == {"knot_moves": 13}
@@ -0,0 +1,204 @@
+"""
+Test cases for the input generators
+"""
+import pathlib
+
+import pytest
+
+from aoc2022 import day1, day3, day5, day6, day7, day8, day9, day10, day11, day12, day13, generators
+
+
+def _generate(tmp_path: pathlib.Path, day: int, size: int) -> str:
+    """
+    Helper function to write a generated input to a temporary file.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        day (int): Day number.
+        size (int): Size of the input.
+
+    Returns:
+        str: Path of the generated file.
+    """
+    path = str(tmp_path / f"day{day}.txt")
+    generators.write(day, size, path, seed=day)
+    return path
+
+
+@pytest.mark.parametrize("day", sorted(generators.GENERATORS))
+def test_reproducible(day: int):
+    """
+    Test that the same seed produces the same input, and that a different seed produces a different one.
+
+    Args:
+        day (int): Day number.
+    """
+    first = list(generators.generate(day, 30, seed=1))
+    assert first == list(generators.generate(day, 30, seed=1))
+    assert first != list(generators.generate(day, 30, seed=2))
+
+
+def test_elves(tmp_path: pathlib.Path):
+    """
+    Test that the requested number of Elves is generated.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    assert len(day1.sum_calories(_generate(tmp_path, 1, 500))) == 500
+
+
+def test_rucksacks(tmp_path: pathlib.Path):
+    """
+    Test that each rucksack has exactly one item type in both compartments, and each group of three exactly one badge.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    sacks = list(generators.generate(3, 100))
+    assert len(sacks) == 102
+    for sack in sacks:
+        cutoff = len(sack) // 2
+        assert len(set(sack[:cutoff]) & set(sack[cutoff:])) == 1
+    for index in range(0, len(sacks), 3):
+        assert len(set(sacks[index]) & set(sacks[index + 1]) & set(sacks[index + 2])) == 1
+    assert day3.priority_groups_of_three(_generate(tmp_path, 3, 99)) > 0
+
+
+def test_crate_stacks(tmp_path: pathlib.Path):
+    """
+    Test that every move is valid for both cranes, and no stack is left empty.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = _generate(tmp_path, 5, 2000)
+    assert len(day5.CrateMover9000(path).get_top_crates()) == 9
+    assert len(day5.CrateMover9001(path).get_top_crates()) == 9
+
+
+def test_datastream(tmp_path: pathlib.Path):
+    """
+    Test that both markers appear only at the end of the datastream.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    signal = pathlib.Path(_generate(tmp_path, 6, 1000)).read_text("utf-8").strip()
+    assert day6.find_start_marker(signal, 4) == 1004
+    assert day6.find_start_marker(signal, 14) == 1014
+
+
+def test_terminal_output(tmp_path: pathlib.Path):
+    """
+    Test that every generated directory is found, and that nesting is capped at the maximum depth.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    report = day7.create_filesystem(_generate(tmp_path, 7, 300)).total_size_report()
+    assert len(report) == 300
+    shallow = generators.terminal_output(300, generators.random.Random(0), max_depth=3)
+    cd_depth, deepest = 0, 0
+    for line in shallow:
+        if line.startswith("$ cd "):
+            cd_depth = 0 if line == "$ cd /" else cd_depth - 1 if line == "$ cd .." else cd_depth + 1
+            deepest = max(deepest, cd_depth)
+    assert deepest == 3
+
+
+def test_forest(tmp_path: pathlib.Path):
+    """
+    Test that the forest is square.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    forest = day8.Forest(_generate(tmp_path, 8, 40))
+    assert forest.count_visible_trees() >= 4 * 39
+
+
+def test_rope_motions(tmp_path: pathlib.Path):
+    """
+    Test that the generated motions can be followed by a rope.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    assert len(day9.RopeGrid(_generate(tmp_path, 9, 200), 9).get_tail_visitations(8)) > 1
+
+
+def test_cpu_program(tmp_path: pathlib.Path):
+    """
+    Test that programs longer than the CRT's 240 cycles can be run by both interfaces.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = _generate(tmp_path, 10, 1000)
+    assert len(list(day10.SnapshotCycler(path, [20, 60, 100, 140, 180, 220]).run())) == 6
+    crt = day10.CRT(path)
+    crt.run()
+    assert len(str(crt).splitlines()) == 6
+
+
+def test_monkey_notes(tmp_path: pathlib.Path):
+    """
+    Test that the requested number of monkeys is generated, and that they can play.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    monkeys = day11.make_monkeys(_generate(tmp_path, 11, 12))
+    assert len(monkeys) == 12
+    for _ in range(20):
+        day11.play_round(monkeys, False)
+    assert day11.calculate_monkey_business(monkeys) > 0
+
+
+def test_heightmap(tmp_path: pathlib.Path):
+    """
+    Test that there is always a path from S to E, even with many pits.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    for size in (27, 60, 101):
+        grid = day12.read_heightmap(_generate(tmp_path, 12, size))
+        assert (grid.height, grid.width) == (size, size)
+        assert len(day12.find_path(grid, *day12.find_start_and_end(grid)).path) - 1 >= size - 1
+
+
+def test_heightmap_minimum_width():
+    """
+    Test that the heightmap is at least 27 columns wide, so the ramp from "a" to "z" never climbs more than one level.
+    """
+    grid = list(generators.heightmap(5, generators.random.Random(0), height=3))
+    assert [len(line) for line in grid] == [27, 27, 27]
+
+
+def test_packet_pairs(tmp_path: pathlib.Path):
+    """
+    Test that the requested number of packet pairs is generated.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    pairs = day13.read_packets(_generate(tmp_path, 13, 250))
+    assert len(pairs) == 250
+    assert all(len(pair) == 2 for pair in pairs)
+
+
+def test_main(tmp_path: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test the command line, both to a file and to standard output.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    output = tmp_path / "day2.txt"
+    generators.main(["2", "10", "--seed", "3", "--output", str(output)])
+    generators.main(["2", "10", "--seed", "3"])
+    assert capsys.readouterr().out == output.read_text("utf-8")
+    assert len(output.read_text("utf-8").splitlines()) == 10
@@ -0,0 +1,205 @@
+"""
+Test cases for remembered answers
+"""
+import importlib.util
+import pathlib
+import sys
+import types
+
+import pytest
+
+from aoc2022 import day1, memo, runner
+
+
+@pytest.fixture(name="memo_dir")
+def fixture_memo_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """
+    Turns on remembering answers, in a temporary directory.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the environment variable.
+
+    Returns:
+        pathlib.Path: The memo directory.
+    """
+    directory = tmp_path / "memo"
+    monkeypatch.setenv(memo.MEMO_DIR_ENV, str(directory))
+    return directory
+
+
+def _load_module(name: str, path: pathlib.Path) -> types.ModuleType:
+    """
+    Helper function to import a module from a file under a name of our choosing.
+
+    Args:
+        name (str): Name of the module.
+        path (pathlib.Path): Path of its source.
+
+    Returns:
+        types.ModuleType: The module.
+    """
+    module = importlib.util.module_from_spec(importlib.util.spec_from_file_location(name, path))
+    sys.modules[name] = module
+    module.__spec__.loader.exec_module(module)
+    return module
+
+
+def test_source_digest(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the source hash covers the module itself and the aoc2022 modules it takes anything from, directly or
+    through another of them.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to unregister the fake modules afterwards.
+    """
+    base, helper, day = tmp_path / "base.py", tmp_path / "helper.py", tmp_path / "dayfake.py"
+    base.write_text("def one():\n    return 1\n", "utf-8")
+    helper.write_text("from aoc2022.base import one\n\n\ndef helper():\n    return one()\n", "utf-8")
+    day.write_text("from aoc2022.helper import helper\n", "utf-8")
+    monkeypatch.setattr(sys, "modules", dict(sys.modules))
+    _load_module("aoc2022.base", base)
+    _load_module("aoc2022.helper", helper)
+    module = _load_module("aoc2022.dayfake", day)
+
+    before = memo.source_digest(module)
+    assert memo.source_digest(module) == before != memo.source_digest(day1)
+    helper.write_text("from aoc2022.base import one\n\n\ndef helper():\n    return one() + 1\n", "utf-8")
+    after = memo.source_digest(module)
+    assert after != before
+    base.write_text("def one():\n    return 2\n", "utf-8")
+    assert memo.source_digest(module) != after
+
+
+def test_record_and_lookup(tmp_path: pathlib.Path, memo_dir: pathlib.Path):
+    """
+    Test that an answer is remembered only for the same star, source and input contents, as they were when the key
+    was made.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        memo_dir (pathlib.Path): The memo directory.
+    """
+    path = tmp_path / "input.txt"
+    path.write_text("1\n", "utf-8")
+    memo.record(memo.Key.for_input(1, 1, "source", str(path)), 42, 0.5)
+    assert memo.lookup(memo.Key.for_input(1, 1, "source", str(path)))["answer"] == 42
+    assert memo.lookup(memo.Key.for_input(1, 2, "source", str(path))) is None
+    assert memo.lookup(memo.Key.for_input(1, 1, "changed", str(path))) is None
+    path.write_text("2\n", "utf-8")
+    assert memo.lookup(memo.Key.for_input(1, 1, "source", str(path))) is None
+
+    (entry,) = memo_dir.glob(f"*{memo.SUFFIX}")
+    entry.write_text("{", "utf-8")
+    path.write_text("1\n", "utf-8")
+    assert memo.lookup(memo.Key.for_input(1, 1, "source", str(path))) is None
+
+    # The input is only hashed when the key is made, so an answer is filed under the input it was found for.
+    key = memo.Key.for_input(1, 2, "source", str(path))
+    path.write_text("3\n", "utf-8")
+    memo.record(key, 7, 0.5)
+    assert memo.lookup(memo.Key.for_input(1, 2, "source", str(path))) is None
+    path.write_text("1\n", "utf-8")
+    assert memo.lookup(memo.Key.for_input(1, 2, "source", str(path)))["answer"] == 7
+
+
+def test_disabled(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that nothing is remembered unless a memo directory is configured.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to clear the environment variable.
+    """
+    monkeypatch.setenv(memo.MEMO_DIR_ENV, "")
+    path = tmp_path / "input.txt"
+    path.write_text("1\n", "utf-8")
+    memo.record(memo.Key.for_input(1, 1, "source", str(path)), 42, 0.5)
+    assert memo.lookup(memo.Key.for_input(1, 1, "source", str(path))) is None
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_size_limit(tmp_path: pathlib.Path, memo_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the memo stays within its configured size.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        memo_dir (pathlib.Path): The memo directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the size limit.
+    """
+    monkeypatch.setenv(memo.MEMO_SIZE_ENV, "1")
+    path = tmp_path / "input.txt"
+    path.write_text("1\n", "utf-8")
+    memo.record(memo.Key.for_input(1, 1, "source", str(path)), 42, 0.5)
+    assert not list(memo_dir.glob(f"*{memo.SUFFIX}"))
+
+
+def test_runner(memo_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the runner returns remembered answers, and does not remember errors.
+
+    Args:
+        memo_dir (pathlib.Path): The memo directory.
+        monkeypatch (pytest.MonkeyPatch): Used to break day 1.
+    """
+    first, second = runner.run_star(10, 2), runner.run_star(10, 2)
+    assert (first.memoized, second.memoized) == (False, True)
+    assert first.answer == second.answer
+    assert second.to_row().endswith("<6-line output> (memoized)")
+
+    monkeypatch.setattr(day1, "first_star", lambda _path: 1 / 0)
+    assert runner.run_star(1, 1).error == runner.run_star(1, 1).error == "ZeroDivisionError: division by zero"
+    assert not list(memo_dir.glob("day1.*"))
+
+
+def test_missing_input(memo_dir: pathlib.Path):
+    """
+    Test that a missing input is reported as the star's error, rather than crashing the runner while it is hashed.
+
+    Args:
+        memo_dir (pathlib.Path): The memo directory.
+    """
+    result = runner.run_star(1, 1, str(memo_dir / "missing.txt"))
+    assert result.answer is None and result.error.startswith("FileNotFoundError")
+    assert not list(memo_dir.glob(f"*{memo.SUFFIX}"))
+
+
+def test_main(memo_dir: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test listing and clearing remembered answers from the command line, and the runner's --memo option.
+
+    Args:
+        memo_dir (pathlib.Path): The memo directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    memo.main(["list"])
+    assert len(capsys.readouterr().out.splitlines()) == 1
+    memo.main(["clear"])
+    assert capsys.readouterr().out == "Deleted 0 entries\n"
+
+    assert runner.main(["10", "2", "--memo", str(memo_dir)]) == 0
+    capsys.readouterr()
+    (memo_dir / f"day1.star1.corrupt{memo.SUFFIX}").write_text("{", "utf-8")
+    memo.main(["--dir", str(memo_dir), "list"])
+    rows = capsys.readouterr().out.splitlines()[1:]
+    assert [row.split()[:2] for row in rows] == [["2", "1"], ["2", "2"], ["10", "1"], ["10", "2"]]
+    assert rows[-1].split()[-1].startswith("####.#..#.###..####.###....##..##..#....\\n#....")
+
+    memo.main(["clear", "--days", "10"])
+    assert capsys.readouterr().out == "Deleted 2 entries\n"
+    memo.main(["clear"])
+    assert capsys.readouterr().out == "Deleted 3 entries\n"
+
+
+def test_main_without_directory(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the command line refuses to run without a memo directory.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to clear the environment variable.
+    """
+    monkeypatch.setenv(memo.MEMO_DIR_ENV, "")
+    with pytest.raises(SystemExit):
+        memo.main(["list"])
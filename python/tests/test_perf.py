@@ -0,0 +1,117 @@
+"""
+Complexity-scaling performance tests. These are deselected by default; run them with "make perf".
+
+Each case is timed on generated inputs of size N and ratio * N, and the empirical growth exponent
+log(t2 / t1) / log(ratio) must stay under a bound for that case. The bounds leave some headroom above the expected
+complexity (e.g. 1.3 for linear, 2.3 for quadratic) to absorb timing noise, but not enough to hide a whole extra factor
+of N.
+"""
+import math
+import pathlib
+
+import pytest
+
+from aoc2022 import bench, generators
+
+pytestmark = pytest.mark.perf
+
+LINEAR = 1.3
+QUADRATIC = 2.3
+
+SCALING_CASES = [
+    # (case name, N, ratio, maximum growth exponent)
+    ("day1.first_star", 50_000, 4, LINEAR),
+    ("day1.second_star", 50_000, 4, LINEAR),
+    ("day1.solve_both", 50_000, 4, LINEAR),
+    ("day2.first_star", 50_000, 4, LINEAR),
+    ("day2.second_star", 50_000, 4, LINEAR),
+    ("day2.solve_both", 50_000, 4, LINEAR),
+    ("day3.first_star", 50_000, 4, LINEAR),
+    ("day3.second_star", 50_000, 4, LINEAR),
+    ("day3.solve_both", 50_000, 4, LINEAR),
+    ("day4.first_star", 50_000, 4, LINEAR),
+    ("day4.second_star", 50_000, 4, LINEAR),
+    ("day4.solve_both", 50_000, 4, LINEAR),
+    ("day5.first_star", 20_000, 4, LINEAR),
+    ("day5.second_star", 20_000, 4, LINEAR),
+    ("day5.solve_both", 20_000, 4, LINEAR),
+    ("day6.first_star", 50_000, 4, LINEAR),
+    ("day6.second_star", 50_000, 4, LINEAR),
+    ("day6.solve_both", 50_000, 4, LINEAR),
+    # Generated filesystems get deeper as they grow (up to 32 levels), and each directory's size is summed once per
+    # ancestor, so allow a little more than linear.
+    ("day7.first_star", 3_000, 4, 1.5),
+    ("day7.second_star", 3_000, 4, 1.5),
+    ("day7.solve_both", 3_000, 4, 1.5),
+    ("day7.Directory.total_size_report", 3_000, 4, 1.5),
+    # Day 8 sizes are the side length of the forest, so a linear pass over the trees is quadratic.
+    ("day8.first_star", 100, 4, QUADRATIC),
+    ("day8.second_star", 100, 4, QUADRATIC),
+    ("day8.solve_both", 100, 4, QUADRATIC),
+    ("day8.Forest.find_highest_scenic_score", 100, 4, QUADRATIC),
+    ("day8.Forest.count_visible_trees", 100, 4, QUADRATIC),
+    ("day9.first_star", 1_000, 4, LINEAR),
+    ("day9.second_star", 1_000, 4, LINEAR),
+    ("day9.solve_both", 1_000, 4, LINEAR),
+    ("day10.first_star", 50_000, 4, LINEAR),
+    ("day10.second_star", 50_000, 4, LINEAR),
+    ("day10.solve_both", 50_000, 4, LINEAR),
+    ("day11.first_star", 16, 4, LINEAR),
+    ("day11.second_star", 4, 4, LINEAR),
+    ("day11.solve_both", 4, 4, LINEAR),
+    # Day 12 sizes are the side length of the heightmap, so linear in cells is quadratic.
+    ("day12.first_star", 50, 4, QUADRATIC),
+    ("day12.find_path", 50, 4, QUADRATIC),
+    ("day12.second_star", 50, 4, QUADRATIC),
+    ("day12.solve_both", 50, 4, QUADRATIC),
+    ("day13.first_star", 2_000, 4, LINEAR),
+    # Sorting is O(N log N); at these sizes that grows by an exponent of about 1.15.
+    ("day13.second_star", 1_000, 4, LINEAR),
+    ("day13.solve_both", 1_000, 4, LINEAR),
+    ("day13.merge_sort", 1_000, 4, LINEAR),
+]
+
+
+def _best_time(name: str, size: int, tmp_path: pathlib.Path) -> float:
+    """
+    Helper function to time a benchmark case on a generated input.
+
+    Args:
+        name (str): Name of the benchmark case.
+        size (int): Size of the generated input.
+        tmp_path (pathlib.Path): Temporary directory to write the input to.
+
+    Returns:
+        float: Fastest of five runs, in seconds. The fastest run is the one least disturbed by anything else
+            happening on the machine.
+    """
+    (case,) = [case for case in bench.CASES if case.name == name]
+    path = str(tmp_path / f"day{case.day}-{size}.txt")
+    generators.write(case.day, size, path)
+    return bench.measure(case, path, 5)["min"]
+
+
+@pytest.mark.parametrize("name,size,ratio,max_exponent", SCALING_CASES)
+def test_growth_exponent(name: str, size: int, ratio: int, max_exponent: float, tmp_path: pathlib.Path):
+    """
+    Test that the case's running time grows no faster than its bound allows.
+
+    Args:
+        name (str): Name of the benchmark case.
+        size (int): Size N of the smaller input.
+        ratio (int): How many times larger the larger input is.
+        max_exponent (float): Largest acceptable growth exponent.
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    small = _best_time(name, size, tmp_path)
+    large = _best_time(name, size * ratio, tmp_path)
+    exponent = math.log(large / small) / math.log(ratio)
+    assert exponent <= max_exponent, f"{name} grew as N^{exponent:.2f} ({small * 1000:.1f} ms -> {large * 1000:.1f} ms)"
+
+
+def test_every_star_is_covered():
+    """
+    Test that no star is missing from the scaling cases.
+    """
+    names = {param.values[0] if hasattr(param, "values") else param[0] for param in SCALING_CASES}
+    assert {case.name for case in bench.CASES} == names
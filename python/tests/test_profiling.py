@@ -0,0 +1,134 @@
+"""
+Test cases for profiling
+"""
+import json
+import pathlib
+import pstats
+
+import pytest
+
+from aoc2022 import profiling, runner
+
+
+@pytest.fixture(name="profile_dir")
+def fixture_profile_dir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """
+    Turns on profiling, into a temporary directory.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to set the environment variable.
+
+    Returns:
+        pathlib.Path: The profile directory.
+    """
+    directory = tmp_path / "profiles"
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(directory))
+    return directory
+
+
+def work(size: int) -> int:
+    """
+    Helper function that takes time in proportion to <size>.
+
+    Args:
+        size (int): How much work to do.
+
+    Returns:
+        int: Something computed from it.
+    """
+    return sum(number * number for number in range(size))
+
+
+def much_work() -> int:
+    """
+    Returns:
+        int: The result of a lot of work.
+    """
+    return work(200_000)
+
+
+def little_work() -> int:
+    """
+    Returns:
+        int: The result of a little work.
+    """
+    return work(2_000)
+
+
+def recurse(depth: int) -> int:
+    """
+    Args:
+        depth (int): How many more times to recurse.
+
+    Returns:
+        int: The result of some work at the bottom.
+    """
+    return recurse(depth - 1) if depth else little_work()
+
+
+def test_disabled(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that nothing is profiled unless a profile directory is configured.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to clear the environment variable.
+    """
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, "")
+    with profiling.profiled("nothing"):
+        little_work()
+    assert not list(tmp_path.iterdir())
+
+
+def test_profiled(profile_dir: pathlib.Path):
+    """
+    Test that a profiled block writes a profile and its collapsed stacks, with callee time split between its callers.
+
+    Args:
+        profile_dir (pathlib.Path): The profile directory.
+    """
+    with profiling.profiled("work"):
+        much_work()
+        little_work()
+        recurse(3)
+    assert "much_work" in str(pstats.Stats(str(profile_dir / "work.prof")).stats)
+
+    stacks = {}
+    for line in (profile_dir / "work.collapsed").read_text("utf-8").splitlines():
+        stack, microseconds = line.rsplit(" ", 1)
+        stacks[tuple(frame.split(" (")[0] for frame in stack.split(";"))] = int(microseconds)
+    summing = ("work", "<built-in method builtins.sum>", "<genexpr>")
+    assert stacks[("much_work", *summing)] > 10 * stacks[("little_work", *summing)]
+    assert ("recurse", "little_work", *summing) in stacks
+    assert all(frames.count("recurse") <= 1 for frames in stacks)
+
+
+def test_frame_label():
+    """
+    Test labelling Python functions and builtins.
+    """
+    assert profiling.frame_label(("/a/b/day11.py", 120, "play_round")) == "play_round (day11.py:120)"
+    assert profiling.frame_label(("~", 0, "<built-in method builtins.max>")) == "<built-in method builtins.max>"
+    assert profiling.frame_label(("x.py", 1, "a;b")) == "a,b (x.py:1)"
+
+
+def test_runner(profile_dir: pathlib.Path, capsys: pytest.CaptureFixture):
+    """
+    Test that the runner's --profile option profiles each star, and that phase times are part of the JSON output.
+
+    Args:
+        profile_dir (pathlib.Path): The profile directory.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    assert runner.main(["11", "--format", "json", "--profile", str(profile_dir)]) == 0
+    first, second = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(first["phases"]) == sorted(second["phases"]) == ["parse", "reduce", "simulate"]
+    assert second["phases"]["simulate"]["wall"] > second["phases"]["reduce"]["wall"]
+    assert sorted(path.name for path in profile_dir.iterdir()) == [
+        "day11.star1.collapsed",
+        "day11.star1.prof",
+        "day11.star2.collapsed",
+        "day11.star2.prof",
+    ]
+    assert "play_round (day11.py:" in (profile_dir / "day11.star2.collapsed").read_text("utf-8")
@@ -0,0 +1,217 @@
+"""
+Test cases for the runner
+"""
+import concurrent.futures
+import io
+import json
+import pathlib
+import runpy
+import time
+import tracemalloc
+
+import pytest
+
+from aoc2022 import day1, runner
+
+
+def test_discover_days():
+    """
+    Test that every day module is discovered, in numerical (not alphabetical) order.
+    """
+    assert runner.discover_days() == list(range(1, 14))
+
+
+def test_run_star():
+    """
+    Test that running a star records its answer, and that the parse and solve times add up to the wall time.
+    """
+    result = runner.run_star(1, 1)
+    assert (result.answer, result.error) == (68442, None)
+    assert result.parse > 0
+    assert result.parse + result.solve == pytest.approx(result.wall)
+
+
+def test_run_star_with_rendered_answer(capsys: pytest.CaptureFixture):
+    """
+    Test that day 10's CRT is reported as its rendered screen, and that the screen is not printed while running.
+
+    Args:
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    result = runner.run_star(10, 2)
+    assert result.answer.startswith("####.#..#.###..####.###....##..##..#....\n")
+    assert capsys.readouterr().out == ""
+    assert result.to_row().endswith("<6-line output>")
+    assert runner.run_star(10, runner.BOTH).to_row().endswith("12520, <6-line output>")
+
+
+def test_run_star_error(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that a star raising an exception is reported rather than propagated.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to break day 1.
+    """
+
+    def _broken(_path: str):
+        raise ValueError("broken")
+
+    monkeypatch.setattr(day1, "first_star", _broken)
+    result = runner.run_star(1, 1)
+    assert (result.answer, result.error) == (None, "ValueError: broken")
+    assert result.to_row().endswith("ERROR ValueError: broken")
+
+
+def test_run_star_in_threads(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that stars run from different threads of a process are solved one at a time.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to record how many stars are being solved at once.
+    """
+    solving, most = [], []
+
+    def _slow(_path: str) -> int:
+        solving.append(None)
+        most.append(len(solving))
+        time.sleep(0.01)
+        solving.pop()
+        return 1
+
+    monkeypatch.setattr(day1, "first_star", _slow)
+    with concurrent.futures.ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: runner.run_star(1, 1), range(8)))
+    assert [result.answer for result in results] == [1] * 8 and max(most) == 1
+
+
+def test_run_with_workers():
+    """
+    Test that the process pool runs every requested star.
+    """
+    results = runner.run([1, 2], [1, 2], workers=2)
+    answers = {(result.day, result.star): result.answer for result in results}
+    assert answers == {(1, 1): 68442, (1, 2): 204837, (2, 1): 13526, (2, 2): 14204}
+
+
+def test_main_table(capsys: pytest.CaptureFixture):
+    """
+    Test the table output.
+
+    Args:
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    assert runner.main(["1", "--stars", "2"]) == 0
+    header, row = capsys.readouterr().out.splitlines()
+    assert header == runner.TABLE_HEADER
+    assert row.startswith("   1    2 ") and row.endswith("  204837")
+
+
+def test_main_json(capsys: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test the JSON output, and that a failing star produces a non-zero exit status.
+
+    Args:
+        capsys (pytest.CaptureFixture): Captures output.
+        monkeypatch (pytest.MonkeyPatch): Used to break day 1.
+    """
+    monkeypatch.setattr(day1, "second_star", lambda _path: 1 / 0)
+    assert runner.main(["1", "--format", "json"]) == 1
+    first, second = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert (first["star"], first["answer"]) == (1, 68442)
+    assert (second["star"], second["error"]) == (2, "ZeroDivisionError: division by zero")
+
+
+def test_module_entry_point(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that "python -m aoc2022" runs the runner and exits with its status.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to set the command line arguments.
+    """
+    monkeypatch.setattr("sys.argv", ["aoc2022", "6", "--format", "json"])
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("aoc2022", run_name="__main__")
+    assert exit_info.value.code == 0
+
+
+def test_memory(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """
+    Test that the --memory option reports the peak memory of each star and phase, and where it was allocated.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to restore the environment afterwards.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    monkeypatch.setenv(runner.MEMORY_ENV, "")
+    assert runner.run_star(7, 1).memory is None
+    assert runner.main(["7", "--stars", "1", "--memory"]) == 0
+    _, row, *top = capsys.readouterr().out.splitlines()
+    assert " [peak " in row and " MiB, max RSS " in row
+    assert len(top) == runner.TOP_LINES and "blocks at day7.py:" in top[0]
+
+    result = runner.run_star(7, 1)
+    assert 0 < result.phases["parse"]["peak"] <= result.memory["peak"]
+    assert result.memory["max_rss"] > result.memory["peak"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_stats(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """
+    Test that the --stats option reports the operations each star counts, alongside its timings.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to restore the environment afterwards.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    monkeypatch.setenv(runner.STATS_ENV, "")
+    assert runner.run_star(12, 1).stats is None
+    assert runner.main(["12", "--stars", "1", "--stats"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1].endswith(" 394 {nodes_enqueued=3117, nodes_expanded=3109}")
+    assert runner.run_star(1, 1).stats == {}
+    assert runner.main(["5", "--stars", "both", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["stats"] == {"crates_moved": 4810}
+
+
+@pytest.mark.parametrize("day", range(1, 14))
+def test_sources(day: int):
+    """
+    Test that every star gives the same answer whether its input is a path, or a file opened in binary or text mode,
+    and that solving both stars at once gives the same answers as solving them separately.
+
+    Args:
+        day (int): Day number.
+    """
+    path = runner.INPUT.format(day=day)
+    answers = {}
+    for star in runner.STARS:
+        answers[star] = runner.run_star(day, star).answer
+        with open(path, "rb") as binary, open(path, encoding="utf-8") as text:
+            assert runner.run_star(day, star, binary).answer == runner.run_star(day, star, text).answer == answers[star]
+    assert answers[runner.BOTH] == [answers[1], answers[2]]
+
+
+def test_main_input(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """
+    Test the --input option, reading from a path and from standard input.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to replace standard input.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    path = tmp_path / "day6.txt"
+    path.write_text("bvwbjplbgvbhsrlpgdmjqwftvncz\n", "utf-8")
+    assert runner.main(["6", "--input", str(path), "--workers", "2", "--format", "json"]) == 0
+    assert sorted(json.loads(line)["answer"] for line in capsys.readouterr().out.splitlines()) == [5, 23]
+
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"bvwbjplbgvbhsrlpgdmjqwftvncz\n")))
+    assert runner.main(["6", "--stars", "1", "--input", "-", "--workers", "2", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["answer"] == 5
+
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"bvwbjplbgvbhsrlpgdmjqwftvncz\n")))
+    assert runner.main(["6", "--stars", "both", "--input", "-", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["answer"] == [5, 23]
+
+    for args in (["--input", "-"], ["1", "2", "--input", "x"], ["6", "--input", "-"]):
+        with pytest.raises(SystemExit):
+            runner.parse_args(args)
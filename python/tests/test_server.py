@@ -0,0 +1,150 @@
+"""
+Test cases for the solver daemon
+"""
+import json
+import os
+import pathlib
+import signal
+import socket
+import threading
+from typing import Iterator
+
+import pytest
+
+from aoc2022 import cache, runner, server
+
+
+@pytest.fixture(name="socket_path")
+def fixture_socket_path(tmp_path: pathlib.Path) -> Iterator[str]:
+    """
+    Runs a server in a background thread for the duration of a test.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory, for the socket.
+
+    Yields:
+        Iterator[str]: Path of the server's socket.
+    """
+    path = str(tmp_path / "aoc.sock")
+    with server.Server(path) as daemon:
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        yield path
+        daemon.shutdown()
+        thread.join()
+    assert not os.path.exists(path)
+
+
+def test_client(socket_path: str):
+    """
+    Test solving stars through a client connection, on the fixture and on another input.
+
+    Args:
+        socket_path (str): Path of the server's socket.
+    """
+    with server.Client(socket_path) as client:
+        assert client.solve(1, 1)["answer"] == 68442
+        assert client.solve(1, "both", "fixtures/day1.txt")["answer"] == [68442, 204837]
+        assert client.solve(1, 2, "missing.txt")["error"].startswith("FileNotFoundError")
+        assert client.solve(99, 1) == {"error": "No such day: 99"}
+        assert client.solve(1, 3) == {"error": "No such star: 3"}
+        assert client.solve(True, 1) == {"error": "No such day: True"}
+        assert client.solve(1, True) == {"error": "No such star: True"}
+        assert client.solve(1.0, 1) == {"error": "No such day: 1.0"}
+
+
+def test_invalid_requests(socket_path: str, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that malformed requests, and requests that fail unexpectedly, are answered with an error rather than
+    dropping the connection.
+
+    Args:
+        socket_path (str): Path of the server's socket.
+        monkeypatch (pytest.MonkeyPatch): Used to break the runner.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(b'{"day": 1\n[1, 1]\n{"day": 1, "star": 1, "input": "fixtures/day1.txt"}\n')
+        with connection.makefile("rb") as responses:
+            errors = [json.loads(responses.readline())["error"] for _ in range(3)]
+    assert errors[0].startswith("Invalid JSON")
+    assert errors[1] == "Expected a JSON object"
+    assert errors[2].startswith("The input must be an absolute path")
+
+    monkeypatch.setattr(runner, "run_star", lambda *_: 1 / 0)
+    with server.Client(socket_path) as client:
+        assert client.solve(1, 1) == {"error": "ZeroDivisionError: division by zero"}
+        monkeypatch.undo()
+        assert client.solve(1, 1)["answer"] == 68442
+
+
+def test_already_running(socket_path: str, tmp_path: pathlib.Path):
+    """
+    Test that a second server refuses to take over a live socket, but replaces one left behind, and that a file that
+    is not a socket is left alone.
+
+    Args:
+        socket_path (str): Path of the server's socket.
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    with pytest.raises(OSError):
+        server.Server(socket_path)
+
+    stale = str(tmp_path / "stale.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as abandoned:
+        abandoned.bind(stale)
+    with server.Server(stale):
+        assert os.path.exists(stale)
+    with pytest.raises(OSError):
+        server.Client(stale)
+
+    mistaken = tmp_path / "notes.txt"
+    mistaken.write_text("keep me\n", "utf-8")
+    with pytest.raises(OSError, match="is not a socket"):
+        server.Server(str(mistaken))
+    assert mistaken.read_text("utf-8") == "keep me\n"
+
+
+def test_main_solve(socket_path: str, capsys: pytest.CaptureFixture):
+    """
+    Test the client command line, in both output formats.
+
+    Args:
+        socket_path (str): Path of the server's socket.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    assert server.main(["--socket", socket_path, "solve", "6", "--stars", "both"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1].endswith("1300, 3986")
+    assert server.main(["--socket", socket_path, "solve", "6", "--stars", "1", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out)["answer"] == 1300
+    assert server.main(["--socket", socket_path, "solve", "99", "--stars", "1"]) == 1
+    assert capsys.readouterr().out.splitlines()[-1] == "  99    1  ERROR No such day: 99"
+
+    for args in (["solve", "--input", "x"], ["solve", "1", "--input", "-"]):
+        with pytest.raises(SystemExit):
+            server.parse_args(args)
+
+
+def test_main_serve(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """
+    Test that the serve command turns on the in-memory cache, and removes its socket when interrupted or terminated.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to stand in for serving and signal handling.
+        capsys (pytest.CaptureFixture): Captures output.
+    """
+    handlers = {}
+    monkeypatch.setattr(signal, "signal", handlers.__setitem__)
+    monkeypatch.setenv(cache.CACHE_MEMORY_ENV, "")
+
+    def interrupted(_self):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(server.Server, "serve_forever", interrupted)
+    path = tmp_path / "aoc.sock"
+    assert server.main(["--socket", str(path), "serve", "--memory-cache", "1000"]) == 0
+    assert capsys.readouterr().out == f"Listening on {path}\n"
+    assert os.environ[cache.CACHE_MEMORY_ENV] == "1000" and not path.exists()
+    with pytest.raises(SystemExit):
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
@@ -0,0 +1,55 @@
+"""
+Test cases for shared memory
+"""
+import array
+import concurrent.futures
+
+import pytest
+
+from aoc2022 import shm, utils
+
+
+def total(handle: shm.Handle) -> int:
+    """
+    Adds up a shared buffer. Runs in a worker process.
+
+    Args:
+        handle (shm.Handle): The buffer's handle.
+
+    Returns:
+        int: The sum of its items.
+    """
+    with shm.attach(handle) as numbers:
+        return sum(numbers)
+
+
+def test_share():
+    """
+    Test that workers see a shared buffer's items with their own type, and that the buffer is removed when closed.
+    """
+    numbers = array.array("I", [1, 2, 3, 2**32 - 1])
+    with shm.share(numbers) as shared:
+        assert shared.handle.size == 16 and shared.handle.format == "I"
+        with concurrent.futures.ProcessPoolExecutor(2) as pool:
+            assert list(pool.map(total, [shared.handle] * 2)) == [sum(numbers)] * 2
+    with pytest.raises(FileNotFoundError):
+        with shm.attach(shared.handle):
+            pass
+    with shm.share(b"") as shared, shm.attach(shared.handle) as empty:
+        assert len(empty) == 0
+
+
+def test_share_grid():
+    """
+    Test that an attached grid is the shared grid, in place.
+    """
+    grid = utils.Grid(["abc", "def"], padding=1)
+    with shm.share_grid(grid) as shared:
+        with shm.attach_grid(shared.handle) as attached:
+            assert (attached.width, attached.height, attached.stride) == (3, 2, 5)
+            assert bytes(attached.row(1)) == b"def" and bytes(attached.column(2)) == b"cf"
+            assert attached.cells[attached.index(-1, -1)] == 1
+            attached.cells[attached.index(0, 0)] = ord("z")
+        with shm.attach_grid(shared.handle) as attached:
+            assert bytes(attached.row(0)) == b"zbc"
+    assert bytes(grid.row(0)) == b"abc"
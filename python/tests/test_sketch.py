@@ -0,0 +1,92 @@
+"""
+Test cases for quantile sketches
+"""
+from typing import Callable
+
+import pytest
+
+from aoc2022 import sketch
+
+VALUES = [value**2 % 100_003 + 1 for value in range(10_000)]
+
+
+@pytest.mark.parametrize("fraction", [0, 0.01, 0.5, 0.9, 0.99, 1])
+def test_quantile(fraction: float):
+    """
+    Test that quantiles are estimated within the relative accuracy, and that the exact statistics are exact.
+
+    Args:
+        fraction (float): Which quantile.
+    """
+    summary = sketch.QuantileSketch()
+    summary.update(VALUES)
+    exact = sorted(VALUES)[int(fraction * (len(VALUES) - 1))]
+    assert summary.quantile(fraction) == pytest.approx(exact, rel=sketch.DEFAULT_ACCURACY)
+    assert (summary.count, summary.total, summary.minimum, summary.maximum) == (
+        len(VALUES),
+        sum(VALUES),
+        min(VALUES),
+        max(VALUES),
+    )
+
+
+def test_zeros():
+    """
+    Test that zeros are counted apart from the buckets.
+    """
+    summary = sketch.QuantileSketch(0.05)
+    summary.update([0, 0, 0, 10])
+    assert (summary.quantile(0.5), summary.quantile(1), summary.buckets) == (0, 10, 1)
+
+
+def test_merge():
+    """
+    Test that merging the sketches of the parts of some numbers gives the sketch of all of them.
+    """
+    whole, parts = sketch.QuantileSketch(), [sketch.QuantileSketch() for _ in range(3)]
+    whole.update(VALUES)
+    for start, part in enumerate(parts):
+        part.update(VALUES[start::3])
+    merged = sketch.merge_all([sketch.QuantileSketch(), *parts]).merge(sketch.QuantileSketch())
+    assert [merged.quantile(fraction) for fraction in (0, 0.25, 0.5, 0.75, 1)] == [
+        whole.quantile(fraction) for fraction in (0, 0.25, 0.5, 0.75, 1)
+    ]
+    assert (merged.count, merged.total, merged.buckets) == (whole.count, whole.total, whole.buckets)
+    with pytest.raises(ValueError, match="Cannot merge"):
+        merged.merge(sketch.QuantileSketch(0.02))
+
+
+def test_max_buckets():
+    """
+    Test that the lowest buckets are merged to keep within the limit, leaving the high quantiles accurate.
+    """
+    limited, merged = sketch.QuantileSketch(max_buckets=50), sketch.QuantileSketch(max_buckets=50)
+    limited.update(VALUES)
+    for value in VALUES:
+        part = sketch.QuantileSketch()
+        part.add(value)
+        merged.merge(part)
+    assert limited.buckets == merged.buckets == 50
+    assert limited.quantile(0.99) == merged.quantile(0.99) == pytest.approx(sorted(VALUES)[9899], rel=0.01)
+
+
+@pytest.mark.parametrize(
+    "action,message",
+    [
+        (lambda: sketch.QuantileSketch(1), "relative accuracy"),
+        (lambda: sketch.QuantileSketch(max_buckets=0), "at least one bucket"),
+        (lambda: sketch.QuantileSketch().add(-1), "non-negative"),
+        (lambda: sketch.QuantileSketch().quantile(0.5), "empty sketch"),
+        (lambda: sketch.QuantileSketch().quantile(1.5), "between 0 and 1"),
+    ],
+)
+def test_errors(action: Callable[[], object], message: str):
+    """
+    Test that invalid sketches, numbers and quantiles are refused.
+
+    Args:
+        action (Callable[[], object]): Something invalid to do.
+        message (str): What the error should say.
+    """
+    with pytest.raises(ValueError, match=message):
+        action()
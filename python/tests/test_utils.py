@@ -0,0 +1,346 @@
+"""
+Test cases for the general helper utilities
+"""
+import concurrent.futures
+import importlib
+import io
+import os
+import pathlib
+import threading
+import tracemalloc
+from typing import IO, Callable
+
+import pytest
+
+from aoc2022 import generators, utils
+
+TEXT = "first\r\nsecond\n\nfourth – with a multi-byte dash\nlast, without a newline"
+
+
+@pytest.fixture(name="small_chunks")
+def fixture_small_chunks(monkeypatch: pytest.MonkeyPatch):
+    """
+    Shrinks the chunk size so that lines span chunk boundaries.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to change the chunk size.
+    """
+    monkeypatch.setattr(utils, "CHUNK_SIZE", 4)
+
+
+@pytest.mark.parametrize("chunk_size", [4, 7, 1 << 20])
+def test_lines(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, chunk_size: int):
+    """
+    Test that lines() splits a memory-mapped file exactly like str.splitlines(), whatever the chunk size.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to change the chunk size.
+        chunk_size (int): Chunk size to read with.
+    """
+    monkeypatch.setattr(utils, "CHUNK_SIZE", chunk_size)
+    path = tmp_path / "text.txt"
+    path.write_bytes(TEXT.encode("utf-8"))
+    assert list(utils.lines(str(path))) == TEXT.splitlines()
+    assert list(utils.lines(str(path), binary=True)) == TEXT.encode("utf-8").splitlines()
+
+
+@pytest.mark.usefixtures("small_chunks")
+def test_blocks(tmp_path: pathlib.Path):
+    """
+    Test that blocks() cuts files and streams into blocks of whole lines, as bytes.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "text.txt"
+    path.write_bytes(TEXT.encode("utf-8"))
+    for source in (path, io.StringIO(TEXT)):
+        blocks = list(utils.blocks(source))
+        assert b"".join(blocks) == TEXT.encode("utf-8") and all(block.endswith(b"\n") for block in blocks[:-1])
+
+
+def test_lines_empty_file(tmp_path: pathlib.Path):
+    """
+    Test that an empty file (which cannot be memory-mapped) has no lines.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "empty.txt"
+    path.touch()
+    assert not list(utils.lines(str(path)))
+
+
+@pytest.mark.usefixtures("small_chunks")
+@pytest.mark.parametrize("text", [TEXT, TEXT + "\n", "one long line without any newline at all"])
+def test_lines_from_pipe(tmp_path: pathlib.Path, text: str):
+    """
+    Test that a named pipe (which cannot be memory-mapped) is read in chunks, including lines that span several chunks
+    and a final line without a newline.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        text (str): Text to send through the pipe.
+    """
+    path = tmp_path / "pipe"
+    os.mkfifo(path)
+    writer = threading.Thread(target=path.write_bytes, args=(text.encode("utf-8"),))
+    writer.start()
+    assert list(utils.lines(str(path))) == text.splitlines()
+    writer.join()
+
+
+@pytest.mark.usefixtures("small_chunks")
+def test_lines_long_line(tmp_path: pathlib.Path):
+    """
+    Test that a memory-mapped line longer than a chunk is kept whole.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "long.txt"
+    path.write_text("a\nbcdefghijkl\nm\n", "utf-8")
+    assert list(utils.lines(str(path))) == ["a", "bcdefghijkl", "m"]
+
+
+@pytest.mark.usefixtures("small_chunks")
+@pytest.mark.parametrize("make_stream", [io.StringIO, lambda text: io.BytesIO(text.encode("utf-8"))])
+@pytest.mark.parametrize("text", [TEXT, TEXT + "\n", "", "one long line without any newline at all"])
+def test_lines_from_stream(make_stream: Callable[[str], IO], text: str):
+    """
+    Test that open files are read in chunks, whether they were opened in text or binary mode.
+
+    Args:
+        make_stream (Callable[[str], IO]): Makes an open file with the given contents.
+        text (str): The contents.
+    """
+    assert list(utils.lines(make_stream(text))) == text.splitlines()
+    assert list(utils.lines(make_stream(text), binary=True)) == text.encode("utf-8").splitlines()
+
+
+@pytest.mark.parametrize(
+    "stdin", [lambda: io.TextIOWrapper(io.BytesIO(TEXT.encode("utf-8"))), lambda: io.StringIO(TEXT)]
+)
+def test_stdin(monkeypatch: pytest.MonkeyPatch, stdin: Callable[[], IO]):
+    """
+    Test reading from standard input, whether or not it has an underlying binary buffer.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Used to replace standard input.
+        stdin (Callable[[], IO]): Makes the replacement.
+    """
+    monkeypatch.setattr("sys.stdin", stdin())
+    assert list(utils.lines(utils.STDIN)) == TEXT.splitlines()
+    monkeypatch.setattr("sys.stdin", stdin())
+    assert utils.read_text(utils.STDIN) == TEXT
+
+
+def test_read_text(tmp_path: pathlib.Path):
+    """
+    Test reading a whole source from a path or an open file.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+    """
+    path = tmp_path / "text.txt"
+    path.write_bytes("first\nsecond – with a multi-byte dash\n".encode("utf-8"))
+    with open(path, "rb") as binary, open(path, encoding="utf-8") as text:
+        assert utils.read_text(path) == utils.read_text(str(path)) == utils.read_text(binary) == utils.read_text(text)
+    assert utils.read_text(path) == "first\nsecond – with a multi-byte dash\n"
+    assert utils.is_path(path) and utils.is_path("-.txt")
+    assert not utils.is_path(utils.STDIN) and not utils.is_path(io.StringIO())
+
+
+@pytest.mark.parametrize(
+    "text,split,expected",
+    [
+        ("a\nbb\nccc\ndddd\n", (2, b"\n", 1), ["a\nbb\nccc\n", "dddd\n"]),
+        ("a\nbb\nccc\ndddd", (3, b"\n", 1), ["a\nbb\n", "ccc\n", "dddd"]),
+        ("1\n2\n\n3\n\n4\n5\n", (4, b"\n\n", 1), ["1\n2\n\n", "3\n\n", "4\n5\n"]),
+        ("a\nb\nc\nd\ne\nf\ng\n", (4, b"\n", 3), ["a\nb\nc\n", "d\ne\nf\n", "g\n"]),
+        ("a\nb\nc\nd\n", (2, b"\n", 3), ["a\nb\nc\n", "d\n"]),
+        ("a\nb\n", (8, b"\n", 3), ["a\nb\n"]),
+        ("one long line", (4, b"\n", 1), ["one long line"]),
+        ("", (4, b"\n", 1), [""]),
+    ],
+)
+def test_split_records(tmp_path: pathlib.Path, text: str, split: tuple[int, bytes, int], expected: list[str]):
+    """
+    Test that files are split after separators, keeping groups of records together.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        text (str): Contents of the file.
+        split (tuple[int, bytes, int]): The number of ranges to aim for, what ends each record, and the number of
+            records that must stay together.
+        expected (list[str]): The text of each range.
+    """
+    path = tmp_path / "records.txt"
+    path.write_text(text, "utf-8")
+    assert [text[start:stop] for start, stop in utils.split_records(path, *split)] == expected
+
+
+def test_map_reduce(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the partial results of every part are combined in order. The parts are mapped in threads here, so the
+    coverage of the mapping is measured; the day tests run them in processes.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to split the input into many small parts, and to map them in threads.
+    """
+    monkeypatch.setattr(utils, "MAP_CHUNK_SIZE", 20)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor)
+    path = tmp_path / "numbers.txt"
+    path.write_text("".join(f"{number}\n" for number in range(100)), "utf-8")
+    parts = utils.map_reduce(path, list, list, 3)
+    assert len(parts) > 3 and sum(parts, []) == [f"{number}\n".encode("utf-8") for number in range(100)]
+    assert utils.map_reduce(io.BytesIO(b"1\n2\n"), list, list, 3) == [[b"1\n", b"2\n"]]
+    assert utils.sum_columns([(1, 2), (3, 4), (5, 6)]) == (9, 12)
+
+
+@pytest.mark.parametrize("day", [1, 2, 3, 4])
+def test_map_reduce_days(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, day: int):
+    """
+    Test that splitting a day's input between worker processes gives the same answers as a single process.
+
+    Args:
+        tmp_path (pathlib.Path): Temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Used to split the input into many small parts.
+        day (int): Day number.
+    """
+    monkeypatch.setattr(utils, "MAP_CHUNK_SIZE", 1000)
+    module = importlib.import_module(f"aoc2022.day{day}")
+    path = str(tmp_path / f"day{day}.txt")
+    generators.write(day, 600, path)
+    expected = module.first_star(path), module.second_star(path), module.solve_both(path)
+    assert (module.first_star(path, 2), module.second_star(path, 2), module.solve_both(path, 2)) == expected
+
+
+@pytest.mark.parametrize("x,y", [(0, 0), (3, -4), (-3, 4), (1 - 2**31, 2**40), (2**31 - 1, -(2**40))])
+def test_pack(x: int, y: int):
+    """
+    Test that packed points unpack to the same coordinates, and that adding packed directions moves them.
+
+    Args:
+        x (int): x-coordinate.
+        y (int): y-coordinate.
+    """
+    assert utils.unpack(utils.pack(x, y)) == (x, y)
+    assert utils.unpack(utils.pack(x, y) + utils.pack(-1, 1)) == (x - 1, y + 1)
+
+
+def test_neighbours():
+    """
+    Test stepping a packed point in each direction.
+    """
+    expected = {(2, 6), (2, 8), (1, 7), (3, 7)}
+    assert utils.unpack_all(utils.neighbours(utils.pack(2, 7))) == expected
+    assert utils.unpack_all(utils.neighbours(0, [utils.pack(1, 1)])) == {(1, 1)}
+
+
+def test_grid():
+    """
+    Test building a grid through a translation table, and that rows, columns and neighbours line up.
+    """
+    grid = utils.Grid(["123", b"456"], bytes.maketrans(b"123456", bytes(range(1, 7))), padding=9)
+    assert (grid.width, grid.height, len(grid.cells)) == (3, 2, 5 * 4)
+    assert list(grid.row(1)) == [4, 5, 6] and list(grid.column(2)) == [3, 6] and list(grid.column(0)[::-1]) == [4, 1]
+    assert [grid.cells[index] for index in grid.indices()] == [1, 2, 3, 4, 5, 6]
+
+    middle = grid.index(1, 0)
+    assert grid.location(middle) == (1, 0)
+    neighbours = {direction: grid.cells[middle + offset] for direction, offset in zip(utils.DIRS, grid.offsets)}
+    assert neighbours == {utils.UP: 9, utils.DOWN: 5, utils.LEFT: 1, utils.RIGHT: 3}
+
+    grid.cells[middle] = 0
+    assert list(grid.row(0)) == [1, 0, 3]
+
+
+def test_grid_errors():
+    """
+    Test that a grid must have rows, all of the same length.
+    """
+    with pytest.raises(ValueError):
+        utils.Grid([])
+    with pytest.raises(ValueError):
+        utils.Grid(["ab", "c"])
+
+
+def test_phase():
+    """
+    Test that phases are only timed while recording, and that repeated phases accumulate.
+    """
+    assert utils.phase("parse") is utils.phase("solve")
+    with utils.phase("parse"):
+        pass
+    with utils.recording_phases() as timings:
+        with utils.phase("parse"):
+            sum(range(10_000))
+        first = timings["parse"].wall
+        with utils.phase("parse"):
+            pass
+        with utils.recording_phases() as inner:
+            with utils.phase("solve"):
+                pass
+    assert sorted(timings) == ["parse"] and timings["parse"].wall > first
+    assert timings["parse"].calls == 2 and timings["parse"].cpu > 0
+    assert sorted(inner) == ["solve"]
+
+
+def test_counting_operations():
+    """
+    Test that operations are only counted while counting, and only by the innermost count.
+    """
+    assert utils.operations() is None
+    with utils.counting_operations() as counts:
+        utils.operations().update(moves=2)
+        with utils.counting_operations() as inner:
+            utils.operations().update(comparisons=1)
+        utils.operations().update(moves=1)
+    assert counts == {"moves": 3} and inner == {"comparisons": 1}
+    assert utils.operations() is None
+
+
+def test_phased():
+    """
+    Test the decorator form, and that a phase re-entered by recursion is only timed by its outermost call.
+    """
+
+    @utils.phased("count")
+    def count_down(number: int) -> int:
+        return count_down(number - 1) if number else 0
+
+    assert count_down(3) == 0
+    with utils.recording_phases() as timings:
+        with utils.phase("everything"):
+            count_down(3)
+    assert timings["count"].calls == 4
+    assert 0 < timings["count"].wall <= timings["everything"].wall
+
+
+def test_measuring_memory():
+    """
+    Test that peak memory is measured for the block and each phase in it, even when the phases are nested or
+    measured in turns, and that the snapshot is taken when the most memory is allocated.
+    """
+    with utils.measuring_memory() as usage:
+        assert usage is None
+    tracemalloc.start()
+    try:
+        with utils.recording_phases() as phases, utils.measuring_memory(snapshot=True) as usage:
+            with utils.phase("outer"):
+                with utils.phase("big"):
+                    big = bytearray(4 << 20)
+                del big
+                with utils.phase("small"):
+                    small = bytearray(1 << 20)
+            del small
+    finally:
+        tracemalloc.stop()
+    assert 4 << 20 <= phases["big"].peak < 5 << 20
+    assert 1 << 20 <= phases["small"].peak < 2 << 20
+    assert 4 << 20 <= phases["outer"].peak <= usage.allocated < 5 << 20
+    (biggest, *_) = usage.snapshot.statistics("lineno")
+    assert biggest.size >= 4 << 20 and biggest.traceback[0].filename == __file__